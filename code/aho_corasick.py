@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Aho-Corasick Multi-Pattern Matcher
+Finds every occurrence of many literal patterns in one pass over the text,
+so reference scans cost the same for 5 component names as for 500
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class AhoCorasick:
+    """Automaton over literal patterns, compiled to a full transition table.
+
+    With ignore_case=True patterns and text are compared lowercased; reported
+    patterns are the original strings passed in.
+    """
+
+    def __init__(self, patterns: Iterable[str], ignore_case: bool = False):
+        self.ignore_case = ignore_case
+        self.patterns: List[str] = []
+        self._keys: Dict[str, List[int]] = {}
+        for pattern in patterns:
+            if not pattern:
+                continue
+            key = pattern.lower() if ignore_case else pattern
+            if key not in self._keys:
+                self._keys[key] = []
+            self._keys[key].append(len(self.patterns))
+            self.patterns.append(pattern)
+        self._build()
+
+    def _build(self):
+        # Trie of the pattern keys; outputs[state] lists the keys ending at that state
+        children: List[Dict[str, int]] = [{}]
+        outputs: List[List[str]] = [[]]
+        for key in self._keys:
+            state = 0
+            for char in key:
+                next_state = children[state].get(char)
+                if next_state is None:
+                    next_state = len(children)
+                    children[state][char] = next_state
+                    children.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(key)
+
+        # Breadth-first failure links, folded into the transition table so a scan
+        # takes exactly one dict lookup per character. Characters that appear in
+        # no pattern are left out and fall back to the root state
+        alphabet = {char for key in self._keys for char in key}
+        delta = [dict(edges) for edges in children]
+        fail = [0] * len(children)
+        queue = deque(children[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for char in alphabet:
+                child = children[state].get(char)
+                if child is not None:
+                    fail[child] = delta[fail[state]].get(char, 0) if state else 0
+                    queue.append(child)
+                else:
+                    target = delta[fail[state]].get(char, 0)
+                    if target:
+                        delta[state][char] = target
+
+        self._delta = delta
+        self._outputs = [[(key, len(key)) for key in keys] for keys in outputs]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Yield (start, end, pattern) for every occurrence, overlapping ones included"""
+        if self.ignore_case:
+            lowered = text.lower()
+            if len(lowered) != len(text):
+                # A few characters (e.g. 'İ') lowercase to two; keep offsets aligned
+                lowered = ''.join(char if len(char.lower()) != 1 else char.lower() for char in text)
+            text = lowered
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        for index, char in enumerate(text):
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                end = index + 1
+                for key, length in outputs[state]:
+                    for pattern_index in self._keys[key]:
+                        yield end - length, end, self.patterns[pattern_index]
+
+    def find_all(self, text: str) -> Dict[str, List[int]]:
+        """Start offsets of every occurrence, grouped by pattern"""
+        found: Dict[str, List[int]] = {}
+        for start, _, pattern in self.iter_matches(text):
+            found.setdefault(pattern, []).append(start)
+        return found
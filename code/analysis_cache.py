@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Persistent Per-File Analysis Cache
+Stores each analyzer's per-file results keyed by content hash and analyzer version,
+so reruns only re-parse changed files and the code/ analyzers reuse each other's work
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+DEFAULT_CACHE_PATH = os.environ.get("ANALYSIS_CACHE_DB", "/workspace/.analysis_cache.sqlite")
+MAX_ENTRY_AGE_DAYS = 30
+SQLITE_MAX_VARIABLES = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_analysis (
+    content_hash TEXT NOT NULL,
+    analyzer TEXT NOT NULL,
+    version TEXT NOT NULL,
+    data TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (content_hash, analyzer, version)
+)
+"""
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+class AnalysisCache:
+    def __init__(self, db_path: str = DEFAULT_CACHE_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        conn = self._connect()
+        try:
+            conn.execute(SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def get_many(self, analyzer: str, version: str, hashes: Iterable[str]) -> Dict[str, object]:
+        hashes = list(set(hashes))
+        found = {}
+        conn = self._connect()
+        try:
+            for start in range(0, len(hashes), SQLITE_MAX_VARIABLES):
+                chunk = hashes[start:start + SQLITE_MAX_VARIABLES]
+                rows = conn.execute(
+                    f"SELECT content_hash, data FROM file_analysis WHERE analyzer = ? AND version = ? "
+                    f"AND content_hash IN ({', '.join('?' * len(chunk))})", [analyzer, version] + chunk).fetchall()
+                found.update((row_hash, json.loads(data)) for row_hash, data in rows)
+            if found:
+                conn.execute("BEGIN")
+                now = time.time()
+                conn.executemany(
+                    "UPDATE file_analysis SET last_used = ? WHERE content_hash = ? AND analyzer = ? AND version = ?",
+                    [(now, row_hash, analyzer, version) for row_hash in found])
+                conn.execute("COMMIT")
+        finally:
+            conn.close()
+        return found
+
+    def put_many(self, analyzer: str, version: str, entries: Dict[str, object]):
+        if not entries:
+            return
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT OR REPLACE INTO file_analysis VALUES (?, ?, ?, ?, ?)",
+                [(row_hash, analyzer, version, json.dumps(data), now) for row_hash, data in entries.items()])
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def map(self, analyzer: str, version: str, contents: Dict[str, str],
+            compute: Callable[[str], object]) -> Dict[str, object]:
+        """Results of `compute(content)` for every hash -> content, computing only cache misses.
+
+        `compute` must return JSON-serializable data that depends on the content alone.
+        """
+        results = self.get_many(analyzer, version, contents)
+        missing = {row_hash: compute(content) for row_hash, content in contents.items() if row_hash not in results}
+        self.put_many(analyzer, version, missing)
+        self.hits += len(results)
+        self.misses += len(missing)
+        results.update(missing)
+        return results
+
+    def prune(self, max_age_days: int = MAX_ENTRY_AGE_DAYS) -> int:
+        """Drop entries no analyzer has read recently (old versions, deleted files)"""
+        conn = self._connect()
+        try:
+            cursor = conn.execute("DELETE FROM file_analysis WHERE last_used < ?",
+                                  (time.time() - max_age_days * 86400,))
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT analyzer, version, COUNT(*), SUM(LENGTH(data)) FROM file_analysis "
+                                "GROUP BY analyzer, version").fetchall()
+        finally:
+            conn.close()
+        return {f"{analyzer}@{version}": {'entries': count, 'bytes': size} for analyzer, version, count, size in rows}
+
+
+def open_cache(db_path: Optional[str] = DEFAULT_CACHE_PATH) -> Optional[AnalysisCache]:
+    """Cache for the analyzers, or None when ANALYSIS_CACHE_DB is set to 'off'"""
+    if not db_path or db_path == 'off':
+        return None
+    return AnalysisCache(db_path)
+
+
+def main():
+    cache = AnalysisCache(sys.argv[1] if len(sys.argv) > 1 and not sys.argv[1].startswith('--') else DEFAULT_CACHE_PATH)
+    if '--prune' in sys.argv:
+        print(f"🧹 Pruned {cache.prune()} stale entries")
+    print(f"🗄️ Analysis cache {cache.db_path}")
+    for name, entry in sorted(cache.stats().items()):
+        print(f"  {name}: {entry['entries']} files, {entry['bytes'] / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Asset Reference Index
+Tokenizes src/, index.html, stylesheets and public/ manifests once into a set of
+referenced asset paths, so checking whether a static asset is used is a set lookup
+"""
+
+import os
+import re
+import sys
+import fnmatch
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from analysis_cache import AnalysisCache, content_hash, open_cache
+from file_inventory import open_inventory
+from source_index import SKIP_DIRS, SourceIndex
+
+# Bump whenever the tokenizer below changes so cached token lists are not reused
+ASSET_REFERENCES_VERSION = '1'
+ASSET_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico', '.pdf', '.webp', '.avif',
+                    '.woff', '.woff2', '.ttf', '.otf', '.eot', '.mp4', '.webm', '.mp3'}
+STYLE_EXTENSIONS = ('.css', '.scss', '.sass', '.less')
+MANIFEST_NAMES = ('manifest.json', 'browserconfig.xml', 'robots.txt')
+MANIFEST_EXTENSIONS = ('.webmanifest', '.html')
+
+STRING_PATTERN = re.compile(r"""'([^'\n]*)'|"([^"\n]*)"|`([^`]*)`""")
+CSS_URL_PATTERN = re.compile(r"""url\(\s*['"]?([^'")]+?)['"]?\s*\)""")
+TEMPLATE_EXPRESSION_PATTERN = re.compile(r'\$\{[^}]*\}')
+# '/icons/' + name + '.svg' and '/images/' + file: literal parts around an expression
+CONCATENATION_PATTERN = re.compile(
+    r"""(['"])([^'"\n]*/[^'"\n]*)\1\s*\+\s*[\w$.\[\]()]+(?:\s*\+\s*(['"])([^'"\n]*)\3)?""")
+PATH_TOKEN_SEPARATORS = re.compile(r'[\s,]+')
+PATH_LIKE_PATTERN = re.compile(r'^[\w@./*-]+$')
+
+
+def _normalize(reference: str) -> str:
+    """Project-relative form of a reference: no query, hash, leading ./, / or public/"""
+    reference = reference.split('?')[0].split('#')[0].strip()
+    while reference.startswith(('./', '../')):
+        reference = reference.split('/', 1)[1]
+    reference = reference.lstrip('/')
+    if reference.startswith('public/'):
+        reference = reference[len('public/'):]
+    return reference
+
+
+def _is_asset_pattern(pattern: str) -> bool:
+    """Dynamic paths worth matching: a literal directory prefix or an asset extension"""
+    if not PATH_LIKE_PATTERN.match(pattern):
+        return False
+    prefix, suffix = pattern.split('*', 1)[0], pattern.rsplit('*', 1)[-1]
+    return (os.path.splitext(suffix)[1].lower() in ASSET_EXTENSIONS
+            or ('/' in prefix and re.search(r'[A-Za-z0-9]', prefix) is not None))
+
+
+def extract_asset_references(content: str) -> Dict[str, List[str]]:
+    """Literal asset references and glob patterns for dynamically built paths in one file"""
+    tokens = set()
+    patterns = set()
+
+    for single, double, template in STRING_PATTERN.findall(content):
+        literal = single or double or template
+        if template and '${' in template:
+            patterns.add(_normalize(TEMPLATE_EXPRESSION_PATTERN.sub('*', template)))
+            continue
+        # srcset="a.png 1x, b.png 2x" and similar lists
+        for token in PATH_TOKEN_SEPARATORS.split(literal):
+            if '.' in token or '/' in token:
+                tokens.add(_normalize(token))
+
+    for url in CSS_URL_PATTERN.findall(content):
+        tokens.add(_normalize(url))
+
+    for _, prefix, _, suffix in CONCATENATION_PATTERN.findall(content):
+        patterns.add(_normalize(prefix) + '*' + suffix)
+
+    tokens.discard('')
+    return {'tokens': sorted(tokens), 'patterns': sorted(pattern for pattern in patterns if _is_asset_pattern(pattern))}
+
+
+class AssetReferenceIndex:
+    """Every asset reference in the project, gathered in one pass over the referencing files.
+
+    A path counts as referenced when its project-relative path (with or
+    without a leading public/) or its bare file name appears as a literal
+    token, or when it matches a dynamic path such as `/images/${name}.png`.
+    """
+
+    def __init__(self, project_root: str, index: Optional[SourceIndex] = None,
+                 cache: Optional[AnalysisCache] = None):
+        self.project_root = Path(project_root)
+        self.cache = cache
+        self.index = index or SourceIndex(self.project_root / "src", cache=cache)
+        self.paths: Set[str] = set()
+        self.names: Set[str] = set()
+        self.patterns: List[str] = []
+        self._pattern_regex = None
+        self.files_scanned = 0
+        self.build()
+
+    def _extra_files(self) -> List[Path]:
+        """Stylesheets under src/, index.html and the manifests in public/"""
+        files = []
+        for html in self.project_root.glob("*.html"):
+            files.append(html)
+        inventory = open_inventory()
+        for directory in (self.project_root / "src", self.project_root / "public"):
+            for path in inventory.files(directory, skip_dirs=SKIP_DIRS):
+                name = path.name
+                if name.endswith(STYLE_EXTENSIONS) or (
+                        directory.name == 'public' and (name in MANIFEST_NAMES or name.endswith(MANIFEST_EXTENSIONS))):
+                    files.append(path)
+        return files
+
+    def build(self):
+        contents = {source_file.content_hash: source_file.content for source_file in self.index}
+        for path in self._extra_files():
+            try:
+                data = path.read_bytes()
+            except OSError as e:
+                print(f"Error reading {path}: {e}")
+                continue
+            contents[content_hash(data)] = data.decode('utf-8', errors='ignore')
+        self.files_scanned = len(contents)
+
+        if self.cache:
+            extracted = self.cache.map('asset_references', ASSET_REFERENCES_VERSION, contents,
+                                       extract_asset_references)
+        else:
+            extracted = {digest: extract_asset_references(content) for digest, content in contents.items()}
+
+        patterns = set()
+        for references in extracted.values():
+            for token in references['tokens']:
+                self.paths.add(token)
+                self.names.add(token.rsplit('/', 1)[-1])
+            patterns.update(references['patterns'])
+        self.patterns = sorted(patterns)
+        if self.patterns:
+            self._pattern_regex = re.compile('|'.join(f'(?:{fnmatch.translate(pattern)})' for pattern in self.patterns))
+
+    def is_referenced(self, asset: Path) -> bool:
+        try:
+            relative = asset.relative_to(self.project_root).as_posix()
+        except ValueError:
+            relative = asset.as_posix()
+        served = relative[len('public/'):] if relative.startswith('public/') else relative
+        if asset.name in self.names or relative in self.paths or served in self.paths:
+            return True
+        if self._pattern_regex is None:
+            return False
+        # Dynamic patterns are written relative to wherever the code runs from, so
+        # compare them against every suffix of the served path
+        parts = served.split('/')
+        return any(self._pattern_regex.match('/'.join(parts[i:])) for i in range(len(parts)))
+
+    def find_assets(self) -> List[Path]:
+        """Static assets under public/ and src/"""
+        assets = []
+        inventory = open_inventory()
+        for directory in (self.project_root / "public", self.project_root / "src"):
+            assets.extend(path for path in inventory.files(directory, skip_dirs=SKIP_DIRS)
+                          if path.suffix.lower() in ASSET_EXTENSIONS)
+        return sorted(assets)
+
+    def unused_assets(self) -> List[Path]:
+        return [asset for asset in self.find_assets() if not self.is_referenced(asset)]
+
+
+def main():
+    project_root = sys.argv[1] if len(sys.argv) > 1 else "/workspace/claimguru"
+    references = AssetReferenceIndex(project_root, cache=open_cache())
+    assets = references.find_assets()
+    unused = references.unused_assets()
+    print(f"🖼️ {len(assets)} assets, {len(references.paths)} referenced paths and "
+          f"{len(references.patterns)} dynamic patterns from {references.files_scanned} files")
+    print(f"🗑️ Unused assets: {len(unused)}")
+    for asset in unused:
+        print(f"   - {asset.relative_to(project_root)}")
+
+
+if __name__ == "__main__":
+    main()
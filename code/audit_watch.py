@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Live Audit Watch Mode
+Watches src/ with inotify, updates the import graph and component usage for each changed
+file, and serves the current audit report over a local Unix socket
+"""
+
+import os
+import sys
+import json
+import time
+import errno
+import socket
+import struct
+import ctypes
+import ctypes.util
+import selectors
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+from analysis_cache import DEFAULT_CACHE_PATH
+from comprehensive_system_audit import ClaimGuruAuditor
+from file_inventory import FileInventory
+from import_graph import ImportGraph
+from source_index import SKIP_DIRS
+
+DEFAULT_SOCKET_PATH = os.environ.get("AUDIT_WATCH_SOCKET", "/workspace/.audit_watch.sock")
+# Editors save in bursts (write, rename, chmod); changes are applied once the burst goes quiet
+DEBOUNCE_SECONDS = 0.03
+POLL_INTERVAL_SECONDS = 0.5
+CLIENT_TIMEOUT_SECONDS = 2
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct('iIII')
+
+try:
+    _libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    _libc.inotify_init1
+except (OSError, AttributeError):
+    _libc = None
+
+
+class InotifyWatcher:
+    """Recursive inotify watch: one watch descriptor per directory, added as directories appear"""
+
+    def __init__(self, root: Path):
+        if _libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self.root = root
+        self.fd = _libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._directories: Dict[int, Path] = {}
+        self.add_tree(root)
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def _add(self, directory: Path):
+        wd = _libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd >= 0:
+            self._directories[wd] = directory
+
+    def add_tree(self, directory: Path):
+        for root, dirs, _ in os.walk(directory):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            self._add(Path(root))
+
+    def read(self) -> Optional[Set[Path]]:
+        """Paths touched since the last read; None when the kernel queue overflowed"""
+        changed = set()
+        while True:
+            try:
+                buffer = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(buffer, offset)
+                name = buffer[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b'\0')
+                offset += EVENT_HEADER.size + length
+                if mask & IN_Q_OVERFLOW:
+                    return None
+                directory = self._directories.get(wd)
+                if directory is None:
+                    continue
+                if mask & IN_IGNORED:
+                    del self._directories[wd]
+                    continue
+                if mask & IN_DELETE_SELF:
+                    changed.add(directory)
+                    continue
+                path = directory / os.fsdecode(name)
+                if mask & IN_ISDIR:
+                    if path.name in SKIP_DIRS:
+                        continue
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        self.add_tree(path)
+                changed.add(path)
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Fallback for platforms without inotify: diffs size and mtime via the file inventory"""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.inventory = FileInventory(db_path='off', skip_dirs=SKIP_DIRS)
+        self._state = self._scan()
+
+    def _scan(self) -> Dict[Path, tuple]:
+        self.inventory.refresh(self.root)
+        return {entry.path: (entry.size, entry.mtime_ns) for entry in self.inventory.entries(self.root)}
+
+    def fileno(self) -> Optional[int]:
+        return None
+
+    def read(self) -> Set[Path]:
+        state = self._scan()
+        changed = {path for path in state.keys() | self._state.keys() if state.get(path) != self._state.get(path)}
+        self._state = state
+        return changed
+
+    def close(self):
+        pass
+
+
+class LiveAudit:
+    """Import graph, component usage and unused-component sets kept current file by file"""
+
+    def __init__(self, project_root: str, cache_path: Optional[str] = DEFAULT_CACHE_PATH):
+        self.project_root = Path(project_root).resolve()
+        self.auditor = ClaimGuruAuditor(str(self.project_root), cache_path=cache_path, verbose=False)
+        self.graph = ImportGraph(str(self.project_root), index=self.auditor.index, cache=self.auditor.cache)
+        self.revision = 0
+        self.last_change: Dict = {}
+        self.report: Dict = {}
+        self._recompute()
+
+    def _recompute(self):
+        self.auditor.component_usage.clear()
+        self.auditor.wizard_components.clear()
+        self.auditor.analyze_component_usage()
+        self.auditor.analyze_wizard_components()
+        graph_report = self.graph.analyze()
+        unused = self.auditor.identify_unused_components()
+        src_root = self.graph.src_root
+        self.revision += 1
+        self.report = {
+            'revision': self.revision,
+            'updated_at': time.time(),
+            'last_change': self.last_change,
+            'modules': graph_report['modules'],
+            'edges': graph_report['edges'],
+            'reachable': graph_report['reachable'],
+            'unreachable_modules': [str(Path(module).relative_to(src_root))
+                                    for module in graph_report['unreachable_modules']],
+            'unresolved_imports': {str(Path(module).relative_to(src_root)): specifiers
+                                   for module, specifiers in graph_report['unresolved_imports'].items()},
+            'component_usage': dict(self.auditor.component_usage),
+            'definitely_unused': sorted(unused['definitely_unused']),
+            'potentially_unused': unused['potentially_unused'],
+            'wizard_step_usage': self.auditor.analyze_wizard_step_components(),
+        }
+
+    def _expand(self, paths: Set[Path]) -> Set[Path]:
+        """Changed files, with new directories walked and vanished ones replaced by what they held"""
+        files = set()
+        for path in paths:
+            path = path.resolve() if path.exists() else Path(os.path.abspath(path))
+            if path.is_dir():
+                for root, dirs, names in os.walk(path):
+                    dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+                    files.update(Path(root) / name for name in names)
+            elif path.exists() or path in self.graph._existing_files:
+                files.add(path)
+            else:
+                files.update(module for module in self.graph._existing_files if module.is_relative_to(path))
+        return files
+
+    def apply(self, paths: Set[Path]) -> Dict:
+        start = time.perf_counter()
+        files = self._expand(paths)
+        relinked = self.graph.update(sorted(files)) if files else set()
+        self.last_change = {
+            'files': sorted(str(path.relative_to(self.graph.src_root)) for path in files
+                            if path.is_relative_to(self.graph.src_root)),
+            'relinked_modules': len(relinked),
+        }
+        self._recompute()
+        self.last_change['milliseconds'] = round((time.perf_counter() - start) * 1000, 1)
+        return self.last_change
+
+    def respond(self, command: str) -> Dict:
+        if command in ('', 'report'):
+            return self.report
+        if command == 'summary':
+            return {key: self.report[key] for key in ('revision', 'updated_at', 'last_change', 'modules',
+                                                      'reachable', 'definitely_unused')} | {
+                'unreachable_modules': len(self.report['unreachable_modules']),
+                'unresolved_imports': len(self.report['unresolved_imports']),
+                'potentially_unused': len(self.report['potentially_unused']),
+            }
+        if command == 'unused':
+            return {'definitely_unused': self.report['definitely_unused'],
+                    'potentially_unused': self.report['potentially_unused'],
+                    'unreachable_modules': self.report['unreachable_modules']}
+        return {'error': f"unknown command {command!r}", 'commands': ['report', 'summary', 'unused']}
+
+
+def _serve_client(connection: socket.socket, live: LiveAudit):
+    with connection:
+        connection.settimeout(CLIENT_TIMEOUT_SECONDS)
+        try:
+            request = b''
+            while not request.endswith(b'\n'):
+                chunk = connection.recv(1024)
+                if not chunk:
+                    break
+                request += chunk
+            connection.sendall(json.dumps(live.respond(request.decode('utf-8').strip())).encode('utf-8'))
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"⚠️ Client error: {e}")
+
+
+def serve(project_root: str, socket_path: str = DEFAULT_SOCKET_PATH, cache_path: Optional[str] = DEFAULT_CACHE_PATH):
+    start = time.perf_counter()
+    live = LiveAudit(project_root, cache_path)
+    src_root = live.graph.src_root
+    try:
+        watcher = InotifyWatcher(src_root)
+        mode = 'inotify'
+    except OSError as e:
+        print(f"⚠️ {e}; polling every {POLL_INTERVAL_SECONDS}s instead")
+        watcher = PollingWatcher(src_root)
+        mode = 'polling'
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen()
+    selector = selectors.DefaultSelector()
+    selector.register(server, selectors.EVENT_READ, 'client')
+    if watcher.fileno() is not None:
+        selector.register(watcher.fileno(), selectors.EVENT_READ, 'watch')
+    print(f"👀 Watching {src_root} ({mode}), {live.report['modules']} modules indexed in "
+          f"{time.perf_counter() - start:.2f}s; serving {socket_path}")
+
+    pending: Set[Path] = set()
+    rescan = False
+    deadline = None
+    next_poll = time.monotonic() + POLL_INTERVAL_SECONDS
+    try:
+        while True:
+            now = time.monotonic()
+            timeouts = [deadline - now] if deadline else []
+            if watcher.fileno() is None:
+                timeouts.append(next_poll - now)
+            for key, _ in selector.select(max(min(timeouts), 0) if timeouts else None):
+                if key.data == 'client':
+                    _serve_client(server.accept()[0], live)
+                    continue
+                changed = watcher.read()
+                if changed is None:
+                    rescan = True
+                else:
+                    pending |= changed
+                deadline = time.monotonic() + DEBOUNCE_SECONDS
+
+            now = time.monotonic()
+            if watcher.fileno() is None and now >= next_poll:
+                changed = watcher.read()
+                if changed:
+                    pending |= changed
+                    deadline = now
+                next_poll = now + POLL_INTERVAL_SECONDS
+            if deadline is None or now < deadline:
+                continue
+
+            deadline = None
+            if rescan:
+                # Events were lost; rebuilding is the only way to be sure the report is right
+                rescan, pending = False, set()
+                live = LiveAudit(project_root, cache_path)
+                print(f"🔄 Event queue overflowed, rebuilt (revision {live.revision})")
+            elif pending:
+                change = live.apply(pending)
+                pending = set()
+                if change['files']:
+                    print(f"⚡ r{live.revision}: {len(change['files'])} files, {change['relinked_modules']} "
+                          f"modules relinked in {change['milliseconds']}ms; "
+                          f"{len(live.report['definitely_unused'])} unused components, "
+                          f"{len(live.report['unreachable_modules'])} unreachable modules")
+    except KeyboardInterrupt:
+        print("\n👋 Stopping watch")
+    finally:
+        selector.close()
+        server.close()
+        watcher.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def query(command: str = 'summary', socket_path: str = DEFAULT_SOCKET_PATH) -> Dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall(f"{command}\n".encode('utf-8'))
+        chunks = []
+        while True:
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return json.loads(b''.join(chunks))
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    options = dict(arg[2:].split('=', 1) if '=' in arg else (arg[2:], '') for arg in sys.argv[1:] if arg.startswith('--'))
+    socket_path = options.get('socket') or DEFAULT_SOCKET_PATH
+    if 'query' in options:
+        try:
+            print(json.dumps(query(options['query'] or 'summary', socket_path), indent=2))
+        except (FileNotFoundError, ConnectionRefusedError):
+            print(f"❌ No watch daemon on {socket_path}; start one with: python audit_watch.py [project_root]")
+            sys.exit(1)
+        return
+    serve(args[0] if args else "/workspace/claimguru", socket_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,11 @@ import subprocess
 import json
 import re
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from bundle_composition import BundleCompositionAnalyzer, BundleHistory, diff_reports, print_diff
+from file_inventory import open_inventory
+from route_chunk_planner import RouteChunkPlanner, write_config
 
 class BuildStabilizationOptimizer:
     def __init__(self, project_root: str):
@@ -17,6 +21,7 @@ class BuildStabilizationOptimizer:
         self.src_root = self.project_root / "src"
         self.fixes_applied = []
         self.bundle_baseline = None
+        self.composition_baseline = None
         
     def test_build(self) -> Tuple[bool, str]:
         """Test if the project builds successfully"""
@@ -40,14 +45,29 @@ class BuildStabilizationOptimizer:
         if not dist_dir.exists():
             return {}
             
+        inventory = open_inventory()
+        inventory.refresh(dist_dir)
         sizes = {}
-        for file_path in dist_dir.rglob("*"):
-            if file_path.is_file():
-                size_mb = file_path.stat().st_size / (1024 * 1024)
-                sizes[str(file_path.relative_to(dist_dir))] = size_mb
+        for entry in inventory.entries(dist_dir):
+            sizes[str(entry.path.relative_to(dist_dir.absolute()))] = entry.size / (1024 * 1024)
                 
         return sizes
         
+    def analyze_composition(self, label: str) -> Optional[Dict]:
+        """Rebuild with sourcemaps and record which packages and modules the chunks are made of.
+
+        The project's vite config turns sourcemaps off, so the `pnpm build`
+        output can't be attributed; sizes above still come from that build.
+        """
+        analyzer = BundleCompositionAnalyzer(str(self.project_root))
+        success, output = analyzer.build()
+        if not success:
+            print(f"⚠️ Sourcemap build failed, skipping bundle composition\n{output[-500:]}")
+            return None
+        composition = analyzer.analyze(label)
+        BundleHistory().record(composition)
+        return composition
+
     def fix_typescript_errors(self):
         """Phase 1: Fix TypeScript compilation errors"""
         print("\n🔧 PHASE 1: FIXING TYPESCRIPT COMPILATION ERRORS")
@@ -182,6 +202,13 @@ class BuildStabilizationOptimizer:
             print("\n📄 Largest bundle files:")
             for file_name, size in largest_files:
                 print(f"  - {file_name}: {size:.2f} MB")
+
+            # Which packages and modules those files are made of
+            self.composition_baseline = self.analyze_composition('before-optimization')
+            if self.composition_baseline:
+                print("\n🏷️ Largest packages:")
+                for name, sizes in list(self.composition_baseline['packages'].items())[:10]:
+                    print(f"  - {name}: {sizes['raw'] / 1024:.1f} KB ({sizes['gzip'] / 1024:.1f} KB gzip)")
                 
         else:
             print("❌ Build still failing after fixes")
@@ -193,7 +220,7 @@ class BuildStabilizationOptimizer:
         print("🚑 Applying emergency fixes...")
         
         # Remove any remaining problematic consolidated service imports
-        ts_files = list(self.src_root.rglob("*.ts")) + list(self.src_root.rglob("*.tsx"))
+        ts_files = open_inventory().files(self.src_root, ('.ts', '.tsx'))
         
         problematic_imports = [
             'ConsolidatedAIService',
@@ -239,6 +266,18 @@ class BuildStabilizationOptimizer:
         print("\n✂️ PHASE 3: IMPLEMENTING CODE SPLITTING")
         print("=" * 45)
         
+        # Chunk groups come from the routes in App.tsx and the import graph
+        plan = RouteChunkPlanner(str(self.project_root)).plan()
+        generated = write_config(str(self.project_root), plan)
+        initial = [projection for projection in plan['routes'].values() if plan['initial_route'] in projection['paths']]
+        print(f"🧭 Planned {len(plan['chunks'])} chunks for {len(plan['routes'])} routes ({generated.name})")
+        if initial:
+            print(f"⭐ Projected {plan['initial_route']} load: {initial[0]['bytes'] / 1024:.1f} KB "
+                  f"(sizes from {plan['size_source']})")
+        if plan['convert_to_lazy']:
+            print(f"💤 {len(plan['convert_to_lazy'])} route pages are imported eagerly in App.tsx and load up front")
+        self.fixes_applied.append(f"Generated route-based manualChunks for {len(plan['routes'])} routes")
+
         # Update Vite config for better code splitting
         vite_config = self.project_root / "vite.config.ts"
         
@@ -246,6 +285,7 @@ class BuildStabilizationOptimizer:
 import { defineConfig } from 'vite'
 import react from '@vitejs/plugin-react'
 import path from 'path'
+import { manualChunks } from './vite.chunks.generated'
 
 export default defineConfig({
   plugins: [react()],
@@ -258,18 +298,8 @@ export default defineConfig({
     // Optimize bundle splitting
     rollupOptions: {
       output: {
-        manualChunks: {
-          // Vendor chunks
-          react: ['react', 'react-dom'],
-          router: ['react-router-dom'],
-          ui: ['@radix-ui/react-dialog', '@radix-ui/react-tabs', '@radix-ui/react-select'],
-          utils: ['date-fns', 'clsx', 'tailwind-merge'],
-          
-          // Feature chunks
-          wizard: ['src/components/claims/wizard-steps'],
-          forms: ['src/components/forms'],
-          services: ['src/services']
-        }
+        // Route-based chunk groups, see code/route_chunk_planner.py
+        manualChunks
       }
     },
     
@@ -447,6 +477,11 @@ export default defineConfig({
                     print(f"⚠️ Target not quite met: {percentage:.1f}% reduction (<25% target)")
             else:
                 print(f"📁 Final bundle size: {new_total:.2f} MB")
+
+            if self.composition_baseline:
+                composition = self.analyze_composition('after-optimization')
+                if composition:
+                    print_diff(diff_reports(self.composition_baseline, composition))
                 
         else:
             print("❌ Optimized build failed")
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Parallel Sandboxed Build Trials
+Runs removal and optimization trials side by side in hardlinked copies (or git
+worktrees) of the project, verifying each with incremental tsc plus esbuild
+instead of a full Vite production build
+"""
+
+import os
+import re
+import sys
+import time
+import shutil
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from import_graph import SCRIPT_SRC_PATTERN
+
+DEFAULT_TRIALS_DIR = os.environ.get("BUILD_TRIALS_DIR", "/workspace/.build_trials")
+DEFAULT_TSCONFIG = "tsconfig.app.json"
+TRIAL_TIMEOUT_SECONDS = 300
+SANDBOX_SKIP = ('node_modules', 'dist', '.git', '.vite', 'coverage', 'temp_deploy', '*.zip', '*.tsbuildinfo')
+ASSET_LOADERS = ('.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico', '.webp', '.avif', '.woff', '.woff2', '.ttf', '.pdf')
+# src/App.tsx(12,5): error TS2307: Cannot find module './Foo' ...
+TSC_ERROR_PATTERN = re.compile(r'^(.+?)\(\d+,\d+\): error (TS\d+): (.*)$', re.MULTILINE)
+
+
+def _link_or_copy(source: str, destination: str):
+    try:
+        os.link(source, destination)
+    except OSError:
+        # Different filesystem or no hardlink support
+        shutil.copy2(source, destination)
+
+
+class Sandbox:
+    """Isolated copy of the project that one trial may mutate freely.
+
+    Hardlinked files share storage with the real tree, so every write goes
+    through write_text/remove, which replace the link instead of editing the
+    shared inode.
+    """
+
+    def __init__(self, project_root: Path, path: Path, mode: str = 'hardlink'):
+        self.source_root = project_root
+        self.mode = mode
+        self.base = path
+        self.root = path
+        if mode == 'worktree':
+            toplevel = Path(subprocess.run(['git', 'rev-parse', '--show-toplevel'], cwd=project_root,
+                                           capture_output=True, text=True, check=True).stdout.strip())
+            subprocess.run(['git', 'worktree', 'add', '--detach', str(path), 'HEAD'], cwd=project_root,
+                           capture_output=True, text=True, check=True)
+            self.root = path / project_root.resolve().relative_to(toplevel)
+            self._copy_uncommitted(toplevel, project_root.resolve().relative_to(toplevel))
+        else:
+            shutil.copytree(project_root, path, symlinks=True, copy_function=_link_or_copy,
+                            ignore=shutil.ignore_patterns(*SANDBOX_SKIP))
+        # Dependencies are shared read-only
+        node_modules = project_root / "node_modules"
+        if node_modules.exists() and not (self.root / "node_modules").exists():
+            (self.root / "node_modules").symlink_to(node_modules.resolve(), target_is_directory=True)
+        self.work_dir = self.root / ".trial"
+        self.work_dir.mkdir(exist_ok=True)
+
+    def _copy_uncommitted(self, toplevel: Path, project: Path):
+        """Bring uncommitted edits, deletions and untracked files into the worktree checkout of HEAD"""
+        def git_paths(*args: str) -> List[str]:
+            output = subprocess.run(['git', *args, '-z', '--', str(project)], cwd=toplevel,
+                                    capture_output=True, text=True, check=True).stdout
+            return [name for name in output.split('\0') if name]
+
+        changed = git_paths('diff', '--name-only', '--no-renames', 'HEAD')
+        untracked = git_paths('ls-files', '--others', '--exclude-standard')
+        for name in changed + untracked:
+            source, target = toplevel / name, self.base / name
+            if source.is_file() or source.is_symlink():
+                target.parent.mkdir(parents=True, exist_ok=True)
+                if target.exists() or target.is_symlink():
+                    target.unlink()
+                shutil.copy2(source, target, follow_symlinks=False)
+            elif target.exists():
+                target.unlink()
+
+    def path(self, relative_path) -> Path:
+        return self.root / relative_path
+
+    def read_text(self, relative_path) -> str:
+        return self.path(relative_path).read_text(encoding='utf-8')
+
+    def write_text(self, relative_path, content: str):
+        target = self.path(relative_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temporary = target.with_name(target.name + '.trial-tmp')
+        temporary.write_text(content, encoding='utf-8')
+        os.replace(temporary, target)
+
+    def remove(self, relative_path):
+        target = self.path(relative_path)
+        if target.exists():
+            target.unlink()
+
+    def destroy(self):
+        if self.mode == 'worktree':
+            subprocess.run(['git', 'worktree', 'remove', '--force', str(self.base)], cwd=self.source_root,
+                           capture_output=True, text=True)
+        shutil.rmtree(self.base, ignore_errors=True)
+
+
+class Trial:
+    """A named set of mutations: files to remove, files to overwrite, or any callable"""
+
+    def __init__(self, name: str, remove: Iterable[str] = (), write: Optional[Dict[str, str]] = None,
+                 apply: Optional[Callable[[Sandbox], None]] = None):
+        self.name = name
+        self.remove = list(remove)
+        self.write = dict(write or {})
+        self.apply = apply
+
+    def mutate(self, sandbox: Sandbox):
+        for relative_path in self.remove:
+            sandbox.remove(relative_path)
+        for relative_path, content in self.write.items():
+            sandbox.write_text(relative_path, content)
+        if self.apply:
+            self.apply(sandbox)
+
+
+class TrialRunner:
+    """Verifies trials in parallel sandboxes against a baseline of the untouched tree.
+
+    A trial passes when `tsc --noEmit --incremental` reports no errors the
+    baseline does not already have and esbuild can still bundle the entry
+    points. Each sandbox starts from the baseline's .tsbuildinfo, so tsc only
+    rechecks what the trial changed.
+    """
+
+    def __init__(self, project_root: str, workers: Optional[int] = None, mode: str = 'hardlink',
+                 trials_dir: str = DEFAULT_TRIALS_DIR, tsconfig: str = DEFAULT_TSCONFIG):
+        self.project_root = Path(project_root).resolve()
+        self.workers = workers or os.cpu_count() or 1
+        self.mode = mode
+        self.trials_dir = Path(trials_dir)
+        self.tsconfig = tsconfig
+        self.baseline: Optional[Dict] = None
+        self._baseline_errors: Set[Tuple[str, str, str]] = set()
+        self._baseline_buildinfo = self.trials_dir / "baseline.tsbuildinfo"
+
+    def _tool(self, name: str) -> Optional[str]:
+        local = self.project_root / "node_modules" / ".bin" / name
+        if local.exists():
+            return str(local)
+        return shutil.which(name)
+
+    def _entries(self, sandbox: Sandbox) -> List[str]:
+        index_html = sandbox.path("index.html")
+        if index_html.exists():
+            entries = [src.lstrip('/') for src in SCRIPT_SRC_PATTERN.findall(index_html.read_text(encoding='utf-8'))]
+            if entries:
+                return entries
+        return ["src/main.tsx"]
+
+    def _run(self, command: List[str], sandbox: Sandbox) -> Tuple[int, str]:
+        try:
+            result = subprocess.run(command, cwd=sandbox.root, capture_output=True, text=True,
+                                    timeout=TRIAL_TIMEOUT_SECONDS)
+            return result.returncode, result.stdout + result.stderr
+        except subprocess.TimeoutExpired:
+            return 1, "Trial timeout"
+        except OSError as e:
+            return 1, str(e)
+
+    def _typecheck(self, sandbox: Sandbox) -> Tuple[Set[Tuple[str, str, str]], str]:
+        """tsc errors as (file, code, message), positions dropped so edits elsewhere do not shift them"""
+        tsc = self._tool('tsc')
+        if tsc is None:
+            return {('tsc', 'missing', 'typescript is not installed')}, "tsc not found"
+        # Same depth as node_modules/.tmp so the relative paths inside the buildinfo stay valid
+        buildinfo = sandbox.work_dir / "tmp" / "tsconfig.app.tsbuildinfo"
+        buildinfo.parent.mkdir(parents=True, exist_ok=True)
+        if self._baseline_buildinfo.exists() and not buildinfo.exists():
+            shutil.copy2(self._baseline_buildinfo, buildinfo)
+        _, output = self._run([tsc, '-p', self.tsconfig, '--noEmit', '--incremental',
+                               '--tsBuildInfoFile', str(buildinfo), '--pretty', 'false'], sandbox)
+        return set(TSC_ERROR_PATTERN.findall(output)), output
+
+    def _bundle(self, sandbox: Sandbox) -> Tuple[bool, str]:
+        esbuild = self._tool('esbuild')
+        if esbuild is None:
+            return False, "esbuild not found"
+        command = [esbuild, *self._entries(sandbox), '--bundle', f'--outdir={sandbox.work_dir / "out"}',
+                   '--format=esm', '--jsx=automatic', '--log-level=error', f'--tsconfig={self.tsconfig}',
+                   '--external:/*', '--external:https://*']
+        command += [f'--loader:{extension}=file' for extension in ASSET_LOADERS]
+        returncode, output = self._run(command, sandbox)
+        return returncode == 0, output
+
+    def run_baseline(self) -> Dict:
+        """Verify the untouched tree once; its errors are tolerated and its buildinfo seeds every trial"""
+        if self.baseline is not None:
+            return self.baseline
+        self.trials_dir.mkdir(parents=True, exist_ok=True)
+        start = time.perf_counter()
+        sandbox = Sandbox(self.project_root, self.trials_dir / "baseline", self.mode)
+        try:
+            self._baseline_errors, _ = self._typecheck(sandbox)
+            bundled, output = self._bundle(sandbox)
+            buildinfo = sandbox.work_dir / "tmp" / "tsconfig.app.tsbuildinfo"
+            if buildinfo.exists():
+                shutil.copy2(buildinfo, self._baseline_buildinfo)
+        finally:
+            sandbox.destroy()
+        self.baseline = {'tsc_errors': len(self._baseline_errors), 'bundles': bundled,
+                         'output': output[-2000:], 'seconds': round(time.perf_counter() - start, 2)}
+        print(f"📏 Baseline: {len(self._baseline_errors)} existing tsc errors, "
+              f"esbuild {'ok' if bundled else 'failing'} ({self.baseline['seconds']}s)")
+        return self.baseline
+
+    def run_trial(self, trial: Trial, slot: int) -> Dict:
+        start = time.perf_counter()
+        sandbox = Sandbox(self.project_root, self.trials_dir / f"trial-{slot}-{os.getpid()}", self.mode)
+        try:
+            trial.mutate(sandbox)
+            errors, output = self._typecheck(sandbox)
+            new_errors = sorted(errors - self._baseline_errors)
+            if new_errors:
+                stage, success = 'tsc', False
+            else:
+                bundled, output = self._bundle(sandbox)
+                # A baseline that cannot bundle cannot judge the bundle step either
+                stage, success = 'esbuild', bundled or not self.baseline['bundles']
+        except Exception as e:
+            new_errors, stage, success, output = [], 'sandbox', False, str(e)
+        finally:
+            sandbox.destroy()
+        return {
+            'name': trial.name,
+            'success': success,
+            'stage': stage,
+            'new_errors': [f"{file}: {code} {message}" for file, code, message in new_errors],
+            'output': '' if success else output[-1000:],
+            'seconds': round(time.perf_counter() - start, 2),
+        }
+
+    def run(self, trials: List[Trial]) -> List[Dict]:
+        """Results in trial order; trials run `workers` at a time, each in its own sandbox"""
+        self.run_baseline()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            results = list(pool.map(self.run_trial, trials, range(len(trials))))
+        elapsed = time.perf_counter() - start
+        serial = sum(result['seconds'] for result in results)
+        print(f"🧪 {len(trials)} trials in {elapsed:.1f}s on {self.workers} workers "
+              f"({serial:.1f}s of trial time, {serial / max(elapsed, 0.001):.1f}x)")
+        return results
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    project_root = args[0] if args else "/workspace/claimguru"
+    mode = 'worktree' if '--worktree' in sys.argv else 'hardlink'
+    runner = TrialRunner(project_root, mode=mode)
+    # Each remaining argument is a project-relative file to try removing on its own
+    trials = [Trial(f"remove {path}", remove=[path]) for path in args[1:]]
+    if not trials:
+        runner.run_baseline()
+        return
+    for result in runner.run(trials):
+        status = "✅" if result['success'] else f"❌ ({result['stage']})"
+        print(f"   {status} {result['name']} [{result['seconds']}s]")
+        for error in result['new_errors'][:5]:
+            print(f"      {error}")
+
+
+if __name__ == "__main__":
+    main()
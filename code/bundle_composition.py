@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Bundle Composition Analyzer
+Attributes every byte of the dist/ chunks to its source module and npm package through
+the emitted sourcemaps, with raw, gzip and brotli sizes, per-commit history and build diffs
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import zlib
+import sqlite3
+import subprocess
+from pathlib import Path
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from file_inventory import open_inventory
+from import_graph import package_name
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_HISTORY_PATH = os.environ.get("BUNDLE_HISTORY_DB", "/workspace/.bundle_history.sqlite")
+CHUNK_EXTENSIONS = ('.js', '.mjs', '.css')
+APP_PACKAGE = '(app)'
+UNMAPPED = '(unmapped)'
+NO_SOURCEMAP = '(no sourcemap)'
+# Changes smaller than this are build noise (hashes, chunk names)
+MIN_DIFF_BYTES = 512
+
+BASE64_VALUES = {character: value for value, character in
+                 enumerate('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/')}
+
+HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bundle_builds (
+    commit_id TEXT PRIMARY KEY,
+    recorded_at REAL NOT NULL,
+    data TEXT NOT NULL
+)
+"""
+
+
+def decode_vlq(segment: str) -> List[int]:
+    values = []
+    value = shift = 0
+    for character in segment:
+        digit = BASE64_VALUES[character]
+        value += (digit & 31) << shift
+        if digit & 32:
+            shift += 5
+        else:
+            values.append(-(value >> 1) if value & 1 else value >> 1)
+            value = shift = 0
+    return values
+
+
+def decode_mappings(mappings: str) -> List[List[Tuple[int, Optional[int]]]]:
+    """Per generated line, the (column, source index) of each segment; None for unmapped segments"""
+    lines = []
+    source = 0
+    for line in mappings.split(';'):
+        column = 0
+        segments = []
+        for segment in line.split(','):
+            if not segment:
+                continue
+            values = decode_vlq(segment)
+            column += values[0]
+            if len(values) >= 4:
+                # Source, original line and column (and name) are relative across the whole map
+                source += values[1]
+                segments.append((column, source))
+            else:
+                segments.append((column, None))
+        lines.append(segments)
+    return lines
+
+
+def compressed_sizes(data: bytes) -> Dict[str, Optional[int]]:
+    return {
+        'gzip': len(zlib.compress(data, 9)),
+        'brotli': len(brotli.compress(data)) if brotli else None,
+    }
+
+
+def attribute_chunk(code: str, sourcemap: Optional[Dict]) -> Dict[int, List[str]]:
+    """Generated text of one chunk grouped by source index (-1 when unmapped)"""
+    pieces: Dict[int, List[str]] = defaultdict(list)
+    if not sourcemap or 'mappings' not in sourcemap:
+        pieces[-1].append(code)
+        return pieces
+    lines = code.split('\n')
+    segments_by_line = decode_mappings(sourcemap['mappings'])
+    for number, line in enumerate(lines):
+        segments = segments_by_line[number] if number < len(segments_by_line) else []
+        if not segments:
+            pieces[-1].append(line)
+        else:
+            if segments[0][0] > 0:
+                pieces[-1].append(line[:segments[0][0]])
+            for position, (column, source) in enumerate(segments):
+                end = segments[position + 1][0] if position + 1 < len(segments) else len(line)
+                pieces[-1 if source is None else source].append(line[column:end])
+        # The newline belongs to whoever produced the end of the line
+        if number < len(lines) - 1:
+            owner = segments[-1][1] if segments and segments[-1][1] is not None else -1
+            pieces[owner].append('\n')
+    return pieces
+
+
+class BundleCompositionAnalyzer:
+    """What each chunk in dist/ is made of, by source module and npm package.
+
+    Raw sizes are exact byte counts of the generated code each source maps to.
+    Compressed sizes are the chunk's real gzip/brotli size, split between the
+    sources in proportion to how well each one compresses on its own.
+    """
+
+    def __init__(self, project_root: str, dist_dir: Optional[str] = None):
+        self.project_root = Path(project_root).resolve()
+        self.dist_dir = Path(dist_dir) if dist_dir else self.project_root / "dist"
+
+    def build(self) -> Tuple[bool, str]:
+        """Production build with sourcemaps written next to each chunk"""
+        try:
+            result = subprocess.run(['pnpm', 'exec', 'vite', 'build', '--sourcemap'], cwd=self.project_root,
+                                    capture_output=True, text=True, timeout=300)
+            return result.returncode == 0, result.stderr + result.stdout
+        except subprocess.TimeoutExpired:
+            return False, "Build timeout"
+        except Exception as e:
+            return False, str(e)
+
+    def _owner(self, source: str, map_dir: Path, source_root: str) -> Tuple[str, str, Optional[str]]:
+        """(module, package, install directory) for one sourcemap source path"""
+        resolved = os.path.normpath(os.path.join(map_dir, source_root, source))
+        virtual = re.sub(r'^(\.\./)+', '', os.path.normpath(source.lstrip('\0')))
+        if source.startswith('\0') or (virtual.startswith('vite/') and not os.path.exists(resolved)):
+            # Bundler runtime helpers such as \0vite/preload-helper have no file
+            # behind them, so they must not resolve into the project as app code
+            return virtual, virtual.split('/')[0], None
+        if 'node_modules/' in resolved:
+            installed_under, within = resolved.rsplit('node_modules/', 1)
+            package = package_name(within)
+            # Which copy of the package this is: node_modules/.pnpm/pkg@1.2.3/node_modules/pkg, node_modules/a/node_modules/pkg
+            install = f"{installed_under}node_modules/{package}"
+            try:
+                install = str(Path(install).relative_to(self.project_root))
+            except ValueError:
+                pass
+            return within, package, install
+        try:
+            return str(Path(resolved).relative_to(self.project_root)), APP_PACKAGE, None
+        except ValueError:
+            return source, UNMAPPED, None
+
+    def analyze_chunk(self, path: Path) -> Dict:
+        code = path.read_text(encoding='utf-8', errors='replace')
+        raw_bytes = path.read_bytes()
+        map_path = path.with_name(path.name + '.map')
+        sourcemap = None
+        if map_path.exists():
+            try:
+                sourcemap = json.loads(map_path.read_text(encoding='utf-8'))
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"⚠️ Unreadable sourcemap {map_path.name}: {e}")
+
+        sources = sourcemap.get('sources', []) if sourcemap else []
+        source_root = (sourcemap or {}).get('sourceRoot') or ''
+        owners = {}
+        for owner, texts in attribute_chunk(code, sourcemap).items():
+            if owner == -1 or owner >= len(sources):
+                module, package = (UNMAPPED, UNMAPPED) if sourcemap else (NO_SOURCEMAP, NO_SOURCEMAP)
+                install = None
+            else:
+                module, package, install = self._owner(sources[owner], map_path.parent, source_root)
+            data = ''.join(texts).encode('utf-8')
+            entry = owners.setdefault(module, {'package': package, 'raw': 0, 'weight': 0, 'parts': [], 'installs': {}})
+            entry['raw'] += len(data)
+            entry['parts'].append(data)
+            if install:
+                entry['installs'][install] = entry['installs'].get(install, 0) + len(data)
+
+        totals = {'raw': len(raw_bytes), **compressed_sizes(raw_bytes)}
+        for entry in owners.values():
+            entry['weight'] = len(zlib.compress(b''.join(entry.pop('parts')), 9))
+        total_weight = sum(entry['weight'] for entry in owners.values()) or 1
+        modules = {}
+        for module, entry in owners.items():
+            share = entry['weight'] / total_weight
+            modules[module] = {
+                'package': entry['package'],
+                'raw': entry['raw'],
+                'gzip': round(totals['gzip'] * share),
+                'brotli': round(totals['brotli'] * share) if totals['brotli'] is not None else None,
+            }
+            if entry['installs']:
+                modules[module]['installs'] = entry['installs']
+        return {'totals': totals, 'mapped': sourcemap is not None, 'modules': modules}
+
+    def analyze(self, label: Optional[str] = None) -> Dict:
+        """Composition of dist/, keyed by commit plus `label` when one run records several builds"""
+        chunks = {}
+        modules: Dict[str, Dict] = {}
+        packages: Dict[str, Dict] = defaultdict(lambda: {'raw': 0, 'gzip': 0, 'brotli': 0 if brotli else None})
+        # dist/ was just rebuilt, so re-walk it rather than trust this run's earlier view
+        inventory = open_inventory()
+        inventory.refresh(self.dist_dir)
+        for path in sorted(inventory.files(self.dist_dir, CHUNK_EXTENSIONS)):
+            chunk_name = str(path.relative_to(self.dist_dir))
+            chunk = self.analyze_chunk(path)
+            chunks[chunk_name] = {**chunk['totals'], 'mapped': chunk['mapped']}
+            for module, sizes in chunk['modules'].items():
+                entry = modules.setdefault(module, {'package': sizes['package'], 'raw': 0, 'gzip': 0,
+                                                    'brotli': 0 if brotli else None, 'chunks': []})
+                entry['chunks'].append(chunk_name)
+                for install, size in sizes.get('installs', {}).items():
+                    installs = entry.setdefault('installs', {})
+                    installs[install] = installs.get(install, 0) + size
+                for metric in ('raw', 'gzip', 'brotli'):
+                    if sizes[metric] is not None:
+                        entry[metric] += sizes[metric]
+                        packages[sizes['package']][metric] += sizes[metric]
+
+        totals = {metric: sum(chunk[metric] or 0 for chunk in chunks.values()) for metric in ('raw', 'gzip')}
+        totals['brotli'] = sum(chunk['brotli'] for chunk in chunks.values()) if brotli else None
+        unmapped = [name for name, chunk in chunks.items() if not chunk['mapped']]
+        if unmapped:
+            print(f"⚠️ {len(unmapped)} chunk(s) have no sourcemap; build with `vite build --sourcemap` to attribute them")
+        return {
+            'commit': f"{self.commit_id()}+{label}" if label else self.commit_id(),
+            'recorded_at': time.time(),
+            'totals': totals,
+            'chunks': chunks,
+            'packages': dict(sorted(packages.items(), key=lambda item: -item[1]['raw'])),
+            'modules': dict(sorted(modules.items(), key=lambda item: -item[1]['raw'])),
+        }
+
+    def commit_id(self) -> str:
+        """HEAD of the project, marked -dirty when the working tree has changes"""
+        try:
+            head = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=self.project_root,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+            dirty = subprocess.run(['git', 'status', '--porcelain', '--', '.'], cwd=self.project_root,
+                                   capture_output=True, text=True).stdout.strip()
+        except (subprocess.CalledProcessError, OSError):
+            return 'unknown'
+        return f"{head}-dirty" if dirty else head
+
+
+class BundleHistory:
+    """Composition reports by commit, so any two builds can be compared"""
+
+    def __init__(self, db_path: str = DEFAULT_HISTORY_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute(HISTORY_SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def record(self, report: Dict):
+        conn = self._connect()
+        try:
+            conn.execute("INSERT OR REPLACE INTO bundle_builds VALUES (?, ?, ?)",
+                         (report['commit'], report['recorded_at'], json.dumps(report)))
+        finally:
+            conn.close()
+
+    def get(self, commit_id: str) -> Optional[Dict]:
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT data FROM bundle_builds WHERE commit_id = ? OR commit_id LIKE ? "
+                               "ORDER BY recorded_at DESC LIMIT 1", (commit_id, commit_id + '%')).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row[0]) if row else None
+
+    def previous(self, commit_id: str) -> Optional[Dict]:
+        """The most recent build recorded before `commit_id` was"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT data FROM bundle_builds WHERE commit_id != ? AND recorded_at < "
+                               "COALESCE((SELECT recorded_at FROM bundle_builds WHERE commit_id = ?), 1e18) "
+                               "ORDER BY recorded_at DESC LIMIT 1", (commit_id, commit_id)).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row[0]) if row else None
+
+    def builds(self, limit: int = 20) -> List[Dict]:
+        """Commit, time and totals of the latest builds, newest first"""
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT data FROM bundle_builds ORDER BY recorded_at DESC LIMIT ?", (limit,)).fetchall()
+        finally:
+            conn.close()
+        builds = []
+        for (data,) in rows:
+            report = json.loads(data)
+            builds.append({'commit': report['commit'], 'recorded_at': report['recorded_at'], 'totals': report['totals']})
+        return builds
+
+
+def _size_changes(old: Dict[str, Dict], new: Dict[str, Dict], min_bytes: int) -> List[Dict]:
+    changes = []
+    for name in set(old) | set(new):
+        before = old.get(name, {})
+        after = new.get(name, {})
+        delta = after.get('raw', 0) - before.get('raw', 0)
+        if abs(delta) < min_bytes:
+            continue
+        changes.append({
+            'name': name,
+            'status': 'added' if not before else 'removed' if not after else 'changed',
+            'raw': [before.get('raw', 0), after.get('raw', 0)],
+            'gzip': [before.get('gzip', 0), after.get('gzip', 0)],
+            'raw_delta': delta,
+            'gzip_delta': (after.get('gzip') or 0) - (before.get('gzip') or 0),
+        })
+    changes.sort(key=lambda change: -abs(change['raw_delta']))
+    return changes
+
+
+def diff_reports(old: Dict, new: Dict, min_bytes: int = MIN_DIFF_BYTES) -> Dict:
+    """Package, module and chunk size changes between two composition reports"""
+    return {
+        'from': old['commit'],
+        'to': new['commit'],
+        'totals': {metric: (new['totals'][metric] or 0) - (old['totals'][metric] or 0) for metric in ('raw', 'gzip', 'brotli')},
+        'packages': _size_changes(old['packages'], new['packages'], min_bytes),
+        'modules': _size_changes(old['modules'], new['modules'], min_bytes),
+    }
+
+
+def _kb(size: Optional[int]) -> str:
+    return f"{size / 1024:.1f} KB" if size is not None else "n/a"
+
+
+def print_diff(diff: Dict, limit: int = 15):
+    print(f"📊 Bundle diff {diff['from']} → {diff['to']}: raw {diff['totals']['raw'] / 1024:+.1f} KB, "
+          f"gzip {diff['totals']['gzip'] / 1024:+.1f} KB")
+    for section in ('packages', 'modules'):
+        if diff[section]:
+            print(f"   {section.capitalize()}:")
+        for change in diff[section][:limit]:
+            print(f"   {change['raw_delta'] / 1024:+9.1f} KB ({change['gzip_delta'] / 1024:+.1f} KB gzip) "
+                  f"{change['name']} [{change['status']}]")
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    project_root = args[0] if args else "/workspace/claimguru"
+    analyzer = BundleCompositionAnalyzer(project_root)
+    history = BundleHistory()
+
+    if '--history' in sys.argv:
+        for build in history.builds():
+            print(f"   {build['commit']:<16} {time.strftime('%Y-%m-%d %H:%M', time.localtime(build['recorded_at']))}  "
+                  f"raw {_kb(build['totals']['raw'])}, gzip {_kb(build['totals']['gzip'])}, "
+                  f"brotli {_kb(build['totals']['brotli'])}")
+        return
+    if '--diff' in sys.argv and len(args) >= 3:
+        old, new = history.get(args[1]), history.get(args[2])
+        if not old or not new:
+            print(f"❌ No recorded build for {args[1] if not old else args[2]}")
+            return
+        print_diff(diff_reports(old, new))
+        return
+
+    if '--build' in sys.argv:
+        print("🏗️ Building with sourcemaps...")
+        success, output = analyzer.build()
+        if not success:
+            print(f"❌ Build failed\n{output[-1000:]}")
+            return
+    report = analyzer.analyze()
+    if not report['chunks']:
+        print(f"❌ No chunks found in {analyzer.dist_dir}")
+        return
+    history.record(report)
+
+    totals = report['totals']
+    print(f"📦 {len(report['chunks'])} chunks at {report['commit']}: raw {_kb(totals['raw'])}, "
+          f"gzip {_kb(totals['gzip'])}, brotli {_kb(totals['brotli'])}")
+    print("🏷️ Largest packages:")
+    for name, sizes in list(report['packages'].items())[:15]:
+        print(f"   {_kb(sizes['raw']):>12} raw  {_kb(sizes['gzip']):>12} gzip  {name}")
+    print("📄 Largest application modules:")
+    app_modules = [(name, sizes) for name, sizes in report['modules'].items() if sizes['package'] == APP_PACKAGE]
+    for name, sizes in app_modules[:15]:
+        print(f"   {_kb(sizes['raw']):>12} raw  {_kb(sizes['gzip']):>12} gzip  {name}")
+
+    previous = history.previous(report['commit'])
+    if previous:
+        print_diff(diff_reports(previous, report))
+
+
+if __name__ == "__main__":
+    main()
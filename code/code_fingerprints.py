@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Winnowing Code Fingerprints
+MOSS-style near-duplicate detection: token-normalized k-gram hashes, winnowed to a
+small fingerprint set per file and indexed so copied regions are found in near-linear time
+"""
+
+import re
+import sys
+import zlib
+from collections import defaultdict, deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from analysis_cache import AnalysisCache, open_cache
+from source_index import SourceIndex
+
+# Matches shorter than K tokens are noise; any copy of at least K + W - 1 tokens
+# is guaranteed to share a fingerprint
+K_GRAM_TOKENS = 20
+WINDOW_SIZE = 10
+# Bump whenever the tokenizer or the parameters change so cached fingerprints are not reused
+FINGERPRINT_VERSION = f'1-k{K_GRAM_TOKENS}-w{WINDOW_SIZE}'
+# Fingerprints shared by more files than this are boilerplate (imports, hooks), not copies
+MAX_FILES_PER_FINGERPRINT = 8
+MIN_SHARED_FINGERPRINTS = 5
+MIN_SIMILARITY = 0.25
+REGION_LINE_GAP = 3
+
+HASH_BASE = 1_000_003
+HASH_MODULUS = (1 << 61) - 1
+
+TOKEN_PATTERN = re.compile(r"""
+    (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<string>'(?:\\.|[^'\\\n])*'|"(?:\\.|[^"\\\n])*"|`(?:\\.|[^`\\])*`)
+  | (?P<number>\d[\w.]*)
+  | (?P<name>[A-Za-z_$][\w$]*)
+  | (?P<newline>\n)
+  | (?P<punct>[^\s\w])
+""", re.DOTALL | re.VERBOSE)
+
+KEYWORDS = {
+    'async', 'await', 'break', 'case', 'catch', 'class', 'const', 'continue', 'default', 'delete', 'do', 'else',
+    'enum', 'export', 'extends', 'false', 'finally', 'for', 'from', 'function', 'if', 'implements', 'import', 'in',
+    'instanceof', 'interface', 'let', 'new', 'null', 'of', 'return', 'static', 'super', 'switch', 'this', 'throw',
+    'true', 'try', 'type', 'typeof', 'undefined', 'var', 'void', 'while', 'yield',
+}
+
+
+def normalized_tokens(content: str) -> List[Tuple[str, int]]:
+    """(token, line) pairs with identifiers, strings and numbers collapsed so renames still match"""
+    tokens = []
+    line = 1
+    for match in TOKEN_PATTERN.finditer(content):
+        kind = match.lastgroup
+        text = match.group()
+        if kind == 'newline':
+            line += 1
+            continue
+        if kind == 'comment':
+            line += text.count('\n')
+            continue
+        if kind == 'string':
+            tokens.append(('S', line))
+            line += text.count('\n')
+        elif kind == 'number':
+            tokens.append(('N', line))
+        elif kind == 'name':
+            tokens.append((text if text in KEYWORDS else 'V', line))
+        else:
+            tokens.append((text, line))
+    return tokens
+
+
+_TOKEN_VALUES: Dict[str, int] = {}
+
+
+def _token_value(token: str) -> int:
+    # crc32 rather than hash(): fingerprints are cached across processes
+    value = _TOKEN_VALUES.get(token)
+    if value is None:
+        value = _TOKEN_VALUES[token] = zlib.crc32(token.encode('utf-8')) + 1
+    return value
+
+
+def winnow(hashes: List[Tuple[int, int, int]], window: int = WINDOW_SIZE) -> List[Tuple[int, int, int]]:
+    """Robust winnowing: the rightmost minimum of every window, each selection recorded once"""
+    if len(hashes) <= window:
+        return [min(hashes, key=lambda entry: entry[0])] if hashes else []
+    selected = []
+    last = -1
+    # Monotonic queue of candidate positions, so each window minimum costs O(1) amortized
+    candidates = deque()
+    for position, entry in enumerate(hashes):
+        while candidates and hashes[candidates[-1]][0] >= entry[0]:
+            candidates.pop()
+        candidates.append(position)
+        if candidates[0] <= position - window:
+            candidates.popleft()
+        if position >= window - 1 and candidates[0] != last:
+            last = candidates[0]
+            selected.append(hashes[last])
+    return selected
+
+
+def fingerprint(content: str, k: int = K_GRAM_TOKENS, window: int = WINDOW_SIZE) -> List[List[int]]:
+    """Winnowed [hash, first_line, last_line] fingerprints of one file (what the cache stores)"""
+    tokens = normalized_tokens(content)
+    if len(tokens) < k:
+        return []
+    values = [_token_value(token) for token, _ in tokens]
+    high = pow(HASH_BASE, k - 1, HASH_MODULUS)
+
+    rolling = 0
+    for value in values[:k]:
+        rolling = (rolling * HASH_BASE + value) % HASH_MODULUS
+    hashes = [(rolling, tokens[0][1], tokens[k - 1][1])]
+    for start in range(1, len(tokens) - k + 1):
+        rolling = ((rolling - values[start - 1] * high) * HASH_BASE + values[start + k - 1]) % HASH_MODULUS
+        hashes.append((rolling, tokens[start][1], tokens[start + k - 1][1]))
+    return [list(entry) for entry in winnow(hashes, window)]
+
+
+def _merge_ranges(ranges: Iterable[Tuple[int, int]], gap: int = REGION_LINE_GAP) -> List[List[int]]:
+    merged = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1] + gap:
+            merged[-1][1] = max(merged[-1][1], last)
+        else:
+            merged.append([first, last])
+    return merged
+
+
+class FingerprintIndex:
+    """Inverted index of winnowed fingerprints over a set of files.
+
+    Pairs are scored by the share of fingerprints they have in common, so the
+    work is proportional to the fingerprints rather than to every file pair.
+    """
+
+    def __init__(self, files: Dict[str, str], cache: Optional[AnalysisCache] = None,
+                 hashes: Optional[Dict[str, str]] = None):
+        """`files` maps a name to its content; `hashes` (name -> content hash) enables the cache"""
+        if cache and hashes:
+            by_hash = cache.map('winnowing_fingerprints', FINGERPRINT_VERSION,
+                                {hashes[name]: content for name, content in files.items()}, fingerprint)
+            self.fingerprints = {name: by_hash[hashes[name]] for name in files}
+        else:
+            self.fingerprints = {name: fingerprint(content) for name, content in files.items()}
+
+        # hash -> {file: [(first_line, last_line), ...]}
+        self.postings: Dict[int, Dict[str, List[Tuple[int, int]]]] = defaultdict(lambda: defaultdict(list))
+        for name, entries in self.fingerprints.items():
+            for value, first, last in entries:
+                self.postings[value][name].append((first, last))
+
+    def _unique_count(self, name: str) -> int:
+        return len({value for value, _, _ in self.fingerprints[name]})
+
+    def similar_pairs(self, min_similarity: float = MIN_SIMILARITY,
+                      min_shared: int = MIN_SHARED_FINGERPRINTS) -> List[Dict]:
+        """File pairs sharing copied code, with similarity percentages and duplicated line ranges"""
+        shared = defaultdict(list)
+        for value, files in self.postings.items():
+            if len(files) < 2 or len(files) > MAX_FILES_PER_FINGERPRINT:
+                continue
+            names = sorted(files)
+            for i, first in enumerate(names):
+                for second in names[i + 1:]:
+                    shared[(first, second)].append(value)
+
+        pairs = []
+        for (first, second), values in shared.items():
+            if len(values) < min_shared:
+                continue
+            first_share = len(values) / max(self._unique_count(first), 1)
+            second_share = len(values) / max(self._unique_count(second), 1)
+            if max(first_share, second_share) < min_similarity:
+                continue
+            pairs.append({
+                'files': [first, second],
+                'similarity': round(100 * max(first_share, second_share), 1),
+                'coverage': {first: round(100 * first_share, 1), second: round(100 * second_share, 1)},
+                'shared_fingerprints': len(values),
+                'regions': {
+                    name: _merge_ranges(span for value in values for span in self.postings[value][name])
+                    for name in (first, second)
+                },
+            })
+        pairs.sort(key=lambda pair: (-pair['similarity'], -pair['shared_fingerprints']))
+        return pairs
+
+
+def index_source_tree(index: SourceIndex, extensions=('.ts', '.tsx'),
+                      cache: Optional[AnalysisCache] = None) -> FingerprintIndex:
+    """Fingerprint index of the TypeScript files in a source index"""
+    source_files = [source_file for source_file in index if source_file.path.suffix in extensions]
+    return FingerprintIndex({source_file.relative_path: source_file.content for source_file in source_files},
+                            cache=cache,
+                            hashes={source_file.relative_path: source_file.content_hash for source_file in source_files})
+
+
+def main():
+    root = sys.argv[1] if len(sys.argv) > 1 else "/workspace/claimguru/src"
+    cache = open_cache()
+    fingerprints = index_source_tree(SourceIndex(root, cache=cache), cache=cache)
+    pairs = fingerprints.similar_pairs()
+    print(f"🧬 {len(fingerprints.fingerprints)} files, {len(fingerprints.postings)} distinct fingerprints, "
+          f"{len(pairs)} near-duplicate pairs")
+    for pair in pairs:
+        first, second = pair['files']
+        print(f"   {pair['similarity']:5.1f}%  {first} ↔ {second} ({pair['shared_fingerprints']} shared)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,574 @@
+#!/usr/bin/env python3
+"""
+Transactional Codemod Engine
+Applies a declarative rule set to the source tree in one parallel pass over parsed
+import statements, with a dry-run diff, atomic writes and a rollback journal
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import difflib
+import fnmatch
+import posixpath
+import tempfile
+from pathlib import Path
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from analysis_cache import content_hash, open_cache
+from import_graph import RESOLVE_EXTENSIONS, load_aliases
+from source_index import SKIP_DIRS, SourceIndex
+
+DEFAULT_JOURNAL_DIR = os.environ.get("CODEMOD_JOURNAL_DIR", "/workspace/.codemod_journal")
+CODEMOD_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx')
+# Below this many files, starting worker processes costs more than it saves
+PARALLEL_MIN_FILES = 200
+
+# Comments and template literals are blanked before imports are matched, so
+# commented-out imports and code inside strings are never rewritten
+MASK_PATTERN = re.compile(r"//[^\n]*|/\*.*?\*/|'(?:\\.|[^'\\\n])*'|\"(?:\\.|[^\"\\\n])*\"|`(?:\\.|[^`\\])*`", re.DOTALL)
+IMPORT_STATEMENT_PATTERNS = (
+    ('static', re.compile(r"""\bimport\s+(?:type\s+)?([\w$*{}\s,]+?)\s*from\s*(['"])(.*?)\2""")),
+    ('side-effect', re.compile(r"""\bimport\s*(['"])(.*?)\1""")),
+    ('dynamic', re.compile(r"""\bimport\s*\(\s*(['"])(.*?)\1\s*\)""")),
+    ('reexport', re.compile(r"""\bexport\s+(?:type\s+)?(\*(?:\s+as\s+[\w$]+)?|{[^}]*})\s*from\s*(['"])(.*?)\2""")),
+)
+CLAUSE_NAME_PATTERN = re.compile(r'([\w$]+)(?:\s+as\s+[\w$]+)?')
+# What a replacement template such as r"\\1" leaves behind when it is escaped twice
+BACKREFERENCE_DAMAGE_PATTERN = re.compile(r'\\\d|\\g<')
+CONTROL_CHARACTER_PATTERN = re.compile(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]')
+
+
+def _mask(content: str) -> str:
+    def blank(match):
+        text = match.group()
+        if text[0] in '\'"':
+            return text
+        return re.sub(r'[^\n]', ' ', text)
+    return MASK_PATTERN.sub(blank, content)
+
+
+def _imported_names(clause: str) -> List[str]:
+    """Names a clause imports from the module: `A, { B as C }` -> default, B"""
+    names = []
+    clause = clause.strip()
+    if clause.startswith('*'):
+        return ['*']
+    default, _, braced = clause.partition('{')
+    if default.strip(' ,'):
+        names.append('default')
+    for name in CLAUSE_NAME_PATTERN.findall(braced.rstrip('} ')):
+        if name != 'type':
+            names.append(name)
+    return names
+
+
+class ImportStatement:
+    """One import/re-export with the exact offsets of its specifier"""
+
+    def __init__(self, kind: str, specifier: str, start: int, end: int, names: List[str], default_name: str = ''):
+        self.kind = kind
+        self.specifier = specifier
+        self.start = start
+        self.end = end
+        self.names = names
+        self.default_name = default_name
+
+
+def parse_imports(content: str) -> List[ImportStatement]:
+    masked = _mask(content)
+    statements = {}
+    for kind, pattern in IMPORT_STATEMENT_PATTERNS:
+        for match in pattern.finditer(masked):
+            specifier_group = match.lastindex
+            start, end = match.span(specifier_group)
+            if start in statements:
+                continue
+            names = []
+            default_name = ''
+            if kind in ('static', 'reexport'):
+                clause = match.group(1)
+                names = _imported_names(clause)
+                default_name = clause.split('{')[0].strip(' ,') if kind == 'static' else ''
+            statements[start] = ImportStatement(kind, content[start:end], start, end, names, default_name)
+    return [statements[start] for start in sorted(statements)]
+
+
+class CodemodContext:
+    """What rules may know about the tree: every file, the aliases and each module's exports.
+
+    Plain data so it can be shipped to worker processes once.
+    """
+
+    def __init__(self, project_root: Path, files: Set[str], aliases: Dict[str, str],
+                 exports: Dict[str, Set[str]]):
+        self.project_root = project_root
+        self.files = files
+        self.aliases = aliases
+        self._alias_order = sorted(aliases, key=len, reverse=True)
+        self.exports = exports
+        self.by_lower: Dict[str, List[str]] = defaultdict(list)
+        for path in files:
+            self.by_lower[path.lower()].append(path)
+
+    @classmethod
+    def build(cls, project_root: Path, source_root: Path) -> 'CodemodContext':
+        files = set()
+        for root, dirs, names in os.walk(source_root):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            for name in names:
+                files.add((Path(root) / name).relative_to(project_root).as_posix())
+        aliases = {}
+        for alias, target in load_aliases(project_root).items():
+            try:
+                aliases[alias] = target.relative_to(project_root.resolve()).as_posix()
+            except ValueError:
+                continue
+        index = SourceIndex(source_root, cache=open_cache())
+        exports = {(source_root / source_file.relative_path).relative_to(project_root).as_posix():
+                   source_file.exported_names for source_file in index}
+        return cls(project_root, files, aliases, exports)
+
+    def locate(self, specifier: str, importer: str) -> Optional[Tuple[str, str]]:
+        """(project-relative base path, alias used or '') for a local specifier; None for packages"""
+        specifier = specifier.split('?')[0]
+        if specifier.startswith('.'):
+            return posixpath.normpath(posixpath.join(posixpath.dirname(importer), specifier)), ''
+        if specifier.startswith('/'):
+            return specifier.lstrip('/'), ''
+        for alias in self._alias_order:
+            if specifier == alias or specifier.startswith(alias + '/'):
+                return posixpath.normpath(posixpath.join(self.aliases[alias], specifier[len(alias):].lstrip('/'))), alias
+        return None
+
+    def _candidates(self, base: str) -> List[str]:
+        candidates = [base] + [base + ext for ext in RESOLVE_EXTENSIONS]
+        if base.endswith(('.js', '.jsx')):
+            candidates += [base.rsplit('.', 1)[0] + ext for ext in ('.ts', '.tsx')]
+        return candidates + [f"{base}/index{ext}" for ext in RESOLVE_EXTENSIONS]
+
+    def resolves(self, specifier: str, importer: str) -> bool:
+        """True for packages and for local specifiers that point at an existing file"""
+        located = self.locate(specifier, importer)
+        if located is None:
+            return True
+        return any(candidate in self.files for candidate in self._candidates(located[0]))
+
+    def resolve_ignoring_case(self, specifier: str, importer: str) -> Optional[str]:
+        located = self.locate(specifier, importer)
+        if located is None:
+            return None
+        matches = {match for candidate in self._candidates(located[0]) for match in self.by_lower.get(candidate.lower(), [])}
+        return matches.pop() if len(matches) == 1 else None
+
+    def specifier_for(self, target: str, importer: str, original: str) -> str:
+        """Specifier for `target` written the way `original` was (alias or relative, extension or not)"""
+        located = self.locate(original, importer)
+        alias = located[1] if located else ''
+        original_stem = original.rstrip('/').rsplit('/', 1)[-1]
+        stem, extension = posixpath.splitext(target)
+        if extension in RESOLVE_EXTENSIONS and not original.endswith(extension):
+            target = stem
+            if target.endswith('/index') and original_stem.lower() != 'index':
+                target = target[:-len('/index')]
+        if alias:
+            return f"{alias}/{posixpath.relpath(target, self.aliases[alias])}"
+        relative = posixpath.relpath(target, posixpath.dirname(importer))
+        return relative if relative.startswith('.') else f"./{relative}"
+
+
+class Rule:
+    """A rewrite applied to every matching file.
+
+    `paths` are fnmatch globs on the project-relative path; subclasses
+    implement apply(content, path, context) and return the new content.
+    """
+
+    name = 'rule'
+
+    def __init__(self, paths: Sequence[str] = ('*',), extensions: Sequence[str] = CODEMOD_EXTENSIONS):
+        self.paths = tuple(paths)
+        self.extensions = tuple(extensions)
+
+    def matches(self, path: str) -> bool:
+        return path.endswith(self.extensions) and any(fnmatch.fnmatch(path, pattern) for pattern in self.paths)
+
+    def apply(self, content: str, path: str, context: CodemodContext) -> str:
+        raise NotImplementedError
+
+
+class SpecifierRule(Rule):
+    """Rewrites import specifiers one statement at a time; override rewrite()"""
+
+    def rewrite(self, statement: ImportStatement, path: str, context: CodemodContext) -> Optional[str]:
+        raise NotImplementedError
+
+    def apply(self, content: str, path: str, context: CodemodContext) -> str:
+        pieces = []
+        last = 0
+        for statement in parse_imports(content):
+            replacement = self.rewrite(statement, path, context)
+            if replacement is None or replacement == statement.specifier:
+                continue
+            pieces.append(content[last:statement.start])
+            pieces.append(replacement)
+            last = statement.end
+        if not pieces:
+            return content
+        pieces.append(content[last:])
+        return ''.join(pieces)
+
+
+class PrefixRewrite(SpecifierRule):
+    """Move imports from one module prefix to another ('@/services/old' -> '@/services/new')"""
+
+    name = 'prefix-rewrite'
+
+    def __init__(self, old_prefix: str, new_prefix: str, **kwargs):
+        super().__init__(**kwargs)
+        self.old_prefix = old_prefix
+        self.new_prefix = new_prefix
+
+    def rewrite(self, statement, path, context):
+        if statement.specifier == self.old_prefix or statement.specifier.startswith(self.old_prefix + '/'):
+            return self.new_prefix + statement.specifier[len(self.old_prefix):]
+        return None
+
+
+class RepairBrokenImportPaths(SpecifierRule):
+    """Point unresolvable local imports at the one file they can mean.
+
+    Covers what fix_imports*.py, fix_all_imports.py and fix_pages_imports.py
+    did blindly: wrong letter case ('ui/Button' vs 'ui/button') and the wrong
+    number of '../'. Only imports that do not resolve are touched, and only
+    when exactly one file matches.
+    """
+
+    name = 'repair-broken-import-paths'
+
+    def rewrite(self, statement, path, context):
+        specifier = statement.specifier
+        if context.resolves(specifier, path) or BACKREFERENCE_DAMAGE_PATTERN.search(specifier):
+            return None
+        target = context.resolve_ignoring_case(specifier, path)
+        if target is None:
+            # Same trailing path segments anywhere in the tree
+            segments = [segment for segment in specifier.split('?')[0].split('/')
+                        if segment not in ('', '.', '..') and not segment.startswith('@')]
+            if not segments:
+                return None
+            suffix = '/' + '/'.join(segments).lower()
+            matches = {file for file in context.files
+                       if os.path.splitext(file)[1] in RESOLVE_EXTENSIONS
+                       and (os.path.splitext(file)[0].lower().endswith(suffix)
+                            or os.path.splitext(file)[0].lower() == suffix.lstrip('/') + '/index'
+                            or os.path.splitext(file)[0].lower().endswith(suffix + '/index'))}
+            if len(matches) != 1:
+                return None
+            target = matches.pop()
+        return context.specifier_for(target, path, specifier)
+
+
+class RepairCorruptedSpecifiers(SpecifierRule):
+    """Recover specifiers such as '../components/ui/\\1' left by a double-escaped replacement.
+
+    fix_corrupted_imports.py guessed Card or Button from the '../' depth;
+    this picks the module in the named directory that exports every name the
+    statement imports, and leaves the import alone when that is ambiguous.
+    """
+
+    name = 'repair-corrupted-specifiers'
+
+    def rewrite(self, statement, path, context):
+        specifier = statement.specifier
+        if not BACKREFERENCE_DAMAGE_PATTERN.search(specifier):
+            return None
+        directory = specifier.split('\\')[0].rstrip('/')
+        located = context.locate(directory or '.', path)
+        if located is None:
+            return None
+        prefix = located[0].lower() + '/'
+        wanted = [name for name in statement.names if name not in ('default', '*')]
+        matches = []
+        for file in context.files:
+            if not file.lower().startswith(prefix) or '/' in file[len(prefix):]:
+                continue
+            exported = context.exports.get(file)
+            if exported is None:
+                continue
+            stem = posixpath.splitext(posixpath.basename(file))[0]
+            if wanted and all(name in exported for name in wanted):
+                matches.append(file)
+            elif not wanted and statement.default_name and stem.lower() == statement.default_name.lower():
+                matches.append(file)
+        if len(matches) != 1:
+            return None
+        return context.specifier_for(matches[0], path, specifier)
+
+
+class TextReplace(Rule):
+    """Literal replacement, or regex with a callable/template replacement when regex=True"""
+
+    name = 'text-replace'
+
+    def __init__(self, old: str, new, regex: bool = False, name: Optional[str] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.old = re.compile(old) if regex else old
+        self.new = new
+        self.regex = regex
+        if name:
+            self.name = name
+
+    def apply(self, content, path, context):
+        if self.regex:
+            return self.old.sub(self.new, content)
+        return content.replace(self.old, self.new)
+
+
+class StripControlCharacters(Rule):
+    """Drop stray control characters (everything below 0x20 except tab, newline and CR)"""
+
+    name = 'strip-control-characters'
+
+    def apply(self, content, path, context):
+        return CONTROL_CHARACTER_PATTERN.sub('', content)
+
+
+# Each former fix_*.py script as a rule set
+RULE_SETS: Dict[str, List[Rule]] = {
+    'imports': [RepairCorruptedSpecifiers(), RepairBrokenImportPaths()],
+    # fix_escape_sequences.py and comprehensive_fix.py: octal escapes are a
+    # syntax error in strict mode template literals
+    'escapes': [TextReplace('\\001', '\\x01', name='octal-escapes'), StripControlCharacters()],
+}
+RULE_SETS['all'] = RULE_SETS['imports'] + RULE_SETS['escapes']
+
+
+def _unresolved(content: str, path: str, context: CodemodContext) -> Set[str]:
+    return {statement.specifier for statement in parse_imports(content)
+            if not context.resolves(statement.specifier, path)}
+
+
+_WORKER_STATE: Tuple[List[Rule], Optional[CodemodContext]] = ([], None)
+
+
+def _init_worker(rules: List[Rule], context: CodemodContext):
+    global _WORKER_STATE
+    _WORKER_STATE = (rules, context)
+
+
+def _transform(path: str) -> Optional[Dict]:
+    """Read one file and run every matching rule over it; None when nothing changes"""
+    rules, context = _WORKER_STATE
+    absolute = context.project_root / path
+    try:
+        data = absolute.read_bytes()
+        original = data.decode('utf-8')
+    except (OSError, UnicodeDecodeError) as e:
+        return {'path': path, 'error': str(e)}
+
+    content = original
+    applied = []
+    for rule in rules:
+        if not rule.matches(path):
+            continue
+        updated = rule.apply(content, path, context)
+        if updated != content:
+            applied.append(rule.name)
+            content = updated
+    if content == original:
+        return None
+
+    result = {'path': path, 'old_hash': content_hash(data), 'content': content, 'rules': applied}
+    # A rewrite may fix imports, never break them
+    before = _unresolved(original, path, context)
+    after = _unresolved(content, path, context)
+    broken = sorted(after - before)
+    if broken or len(after) > len(before):
+        result['rejected'] = f"would leave unresolved imports: {', '.join(broken)}"
+    elif any(BACKREFERENCE_DAMAGE_PATTERN.search(statement.specifier) for statement in parse_imports(content)) \
+            and not any(BACKREFERENCE_DAMAGE_PATTERN.search(statement.specifier) for statement in parse_imports(original)):
+        result['rejected'] = "would write a backreference into an import specifier"
+    return result
+
+
+def atomic_write(path: Path, content: Union[str, bytes]):
+    """Write through a temp file in the same directory and rename it over the target; bytes are written as-is"""
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    descriptor, temporary = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.codemod')
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            shutil.copymode(path, temporary)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.unlink(temporary)
+        raise
+
+
+class CodemodEngine:
+    """Runs a rule set over src/ as one transaction.
+
+    Every file is read and rewritten in a single (parallel) pass. Nothing
+    touches the tree until all changes are computed and validated; then the
+    originals are saved to a journal and each file is replaced atomically. A
+    failure part way through restores every file already written, and a
+    finished run can be undone later from its journal.
+    """
+
+    def __init__(self, project_root: str, rules: List[Rule], workers: Optional[int] = None,
+                 journal_dir: str = DEFAULT_JOURNAL_DIR, source_dir: str = "src"):
+        self.project_root = Path(project_root).resolve()
+        self.source_root = self.project_root / source_dir
+        self.rules = rules
+        self.workers = workers or os.cpu_count() or 1
+        self.journal_dir = Path(journal_dir)
+        self.context = CodemodContext.build(self.project_root, self.source_root)
+
+    def plan(self) -> List[Dict]:
+        """Changes the rules would make, without writing anything"""
+        paths = sorted(path for path in self.context.files if any(rule.matches(path) for rule in self.rules))
+        if self.workers > 1 and len(paths) >= PARALLEL_MIN_FILES:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self.rules, self.context)) as pool:
+                results = list(pool.map(_transform, paths, chunksize=max(1, len(paths) // (self.workers * 4))))
+        else:
+            _init_worker(self.rules, self.context)
+            results = [_transform(path) for path in paths]
+        return [result for result in results if result]
+
+    def diff(self, changes: List[Dict]) -> str:
+        chunks = []
+        for change in changes:
+            if 'content' not in change:
+                continue
+            original = (self.project_root / change['path']).read_bytes().decode('utf-8')
+            chunks.extend(difflib.unified_diff(original.splitlines(keepends=True), change['content'].splitlines(keepends=True),
+                                               fromfile=f"a/{change['path']}", tofile=f"b/{change['path']}"))
+        return ''.join(chunks)
+
+    def apply(self, changes: List[Dict]) -> Optional[Path]:
+        """Write the accepted changes as one transaction; returns the journal directory"""
+        accepted = [change for change in changes if 'content' in change and 'rejected' not in change]
+        if not accepted:
+            return None
+
+        journal = self.journal_dir / time.strftime('%Y%m%d-%H%M%S')
+        while journal.exists():
+            journal = journal.with_name(journal.name + '-1')
+        (journal / "originals").mkdir(parents=True)
+        manifest = {'project_root': str(self.project_root), 'created_at': time.time(), 'status': 'pending',
+                    'rules': [rule.name for rule in self.rules], 'files': []}
+        for number, change in enumerate(accepted):
+            backup = journal / "originals" / f"{number:05d}"
+            shutil.copy2(self.project_root / change['path'], backup)
+            manifest['files'].append({'path': change['path'], 'backup': backup.name, 'old_hash': change['old_hash'],
+                                      'new_hash': content_hash(change['content'].encode('utf-8')),
+                                      'rules': change['rules']})
+        self._write_manifest(journal, manifest)
+
+        written = []
+        try:
+            for change, entry in zip(accepted, manifest['files']):
+                target = self.project_root / change['path']
+                if content_hash(target.read_bytes()) != change['old_hash']:
+                    raise RuntimeError(f"{change['path']} changed while the codemod was running")
+                atomic_write(target, change['content'])
+                written.append(entry)
+        except BaseException:
+            for entry in written:
+                atomic_write(self.project_root / entry['path'], (journal / "originals" / entry['backup']).read_bytes())
+            manifest['status'] = 'aborted'
+            self._write_manifest(journal, manifest)
+            raise
+        manifest['status'] = 'applied'
+        self._write_manifest(journal, manifest)
+        return journal
+
+    @staticmethod
+    def _write_manifest(journal: Path, manifest: Dict):
+        atomic_write(journal / "manifest.json", json.dumps(manifest, indent=2))
+
+
+def journals(journal_dir: str = DEFAULT_JOURNAL_DIR) -> List[Path]:
+    root = Path(journal_dir)
+    if not root.exists():
+        return []
+    return sorted(path for path in root.iterdir() if (path / "manifest.json").exists())
+
+
+def rollback(journal: Path, force: bool = False) -> Tuple[List[str], List[str]]:
+    """Restore the originals from a journal; files edited since the codemod are skipped unless forced"""
+    manifest = json.loads((journal / "manifest.json").read_text(encoding='utf-8'))
+    project_root = Path(manifest['project_root'])
+    restored, skipped = [], []
+    for entry in manifest['files']:
+        target = project_root / entry['path']
+        current = content_hash(target.read_bytes()) if target.exists() else None
+        if current == entry['old_hash']:
+            continue
+        if current != entry['new_hash'] and not force:
+            skipped.append(entry['path'])
+            continue
+        atomic_write(target, (journal / "originals" / entry['backup']).read_bytes())
+        restored.append(entry['path'])
+    manifest['status'] = 'rolled back' if not skipped else 'partially rolled back'
+    CodemodEngine._write_manifest(journal, manifest)
+    return restored, skipped
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    options = dict(arg[2:].split('=', 1) if '=' in arg else (arg[2:], '') for arg in sys.argv[1:] if arg.startswith('--'))
+
+    if 'rollback' in options:
+        available = journals()
+        journal = Path(options['rollback']) if options['rollback'] else (available[-1] if available else None)
+        if journal is None:
+            print("❌ No codemod journal to roll back")
+            return
+        restored, skipped = rollback(journal, force='force' in options)
+        print(f"↩️ Restored {len(restored)} files from {journal}")
+        for path in skipped:
+            print(f"⚠️ {path} was edited after the codemod; rerun with --force to overwrite it")
+        return
+    if 'journals' in options:
+        for journal in journals():
+            manifest = json.loads((journal / "manifest.json").read_text(encoding='utf-8'))
+            print(f"   {journal.name}  {manifest['status']:<22} {len(manifest['files'])} files  {', '.join(manifest['rules'])}")
+        return
+
+    project_root = args[0] if args else "/workspace/claimguru"
+    rule_set = options.get('rules') or 'all'
+    rules = [rule for name in rule_set.split(',') for rule in RULE_SETS[name]]
+    workers = int(options['workers']) if options.get('workers') else None
+    engine = CodemodEngine(project_root, rules, workers=workers)
+
+    start = time.perf_counter()
+    changes = engine.plan()
+    elapsed = time.perf_counter() - start
+    rejected = [change for change in changes if 'rejected' in change or 'error' in change]
+    print(f"🛠️ {len(changes) - len(rejected)} files to change, {len(rejected)} rejected "
+          f"({len(engine.context.files)} files scanned in {elapsed:.2f}s)")
+    for change in rejected:
+        print(f"   ⚠️ {change['path']}: {change.get('rejected') or change.get('error')}")
+
+    if 'dry-run' in options:
+        print(engine.diff([change for change in changes if 'rejected' not in change]))
+        return
+    journal = engine.apply(changes)
+    if journal:
+        print(f"✅ Applied; undo with: python codemod.py --rollback={journal}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,80 +8,98 @@ import os
 import json
 import re
 from pathlib import Path
-from typing import Set, Dict, List, Tuple
+from typing import Set, Dict, List, Optional, Tuple
 from collections import defaultdict
 
+from analysis_cache import DEFAULT_CACHE_PATH, open_cache
+from asset_references import AssetReferenceIndex
+from dependency_usage import DependencyUsageAnalyzer
+from file_inventory import open_inventory
+from import_graph import ImportGraph
+
+# Bump when find_dead_code_patterns changes what it records per file
+DEAD_CODE_PATTERNS_VERSION = '1'
+
+def scan_dead_code_patterns(content: str) -> Dict[str, List[Dict]]:
+    """Commented blocks, TODOs and console calls in one file (without the file path)"""
+    found = {'commented_blocks': [], 'todo_comments': [], 'debug_code': []}
+    lines = content.split('\n')
+
+    # Find large commented blocks (5+ consecutive comment lines)
+    comment_block_start = None
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if stripped.startswith('//') or stripped.startswith('/*'):
+            if comment_block_start is None:
+                comment_block_start = i
+        else:
+            if comment_block_start is not None and (i - comment_block_start) >= 5:
+                found['commented_blocks'].append({
+                    'lines': f"{comment_block_start + 1}-{i}",
+                    'size': i - comment_block_start
+                })
+            comment_block_start = None
+
+    # Find TODO/FIXME comments
+    todo_pattern = r'//.*(?:TODO|FIXME|XXX|HACK)'
+    for i, line in enumerate(lines):
+        if re.search(todo_pattern, line, re.IGNORECASE):
+            found['todo_comments'].append({'line': i + 1, 'content': line.strip()})
+
+    # Find console.log statements
+    console_pattern = r'console\.(log|debug|info|warn|error)'
+    for i, line in enumerate(lines):
+        if re.search(console_pattern, line) and not line.strip().startswith('//'):
+            found['debug_code'].append({'line': i + 1, 'content': line.strip()})
+
+    return found
+
 class CodebaseCleanupAnalyzer:
-    def __init__(self, project_root: str):
+    def __init__(self, project_root: str, cache_path: Optional[str] = DEFAULT_CACHE_PATH):
         self.project_root = Path(project_root)
+        self.cache = open_cache(cache_path)
         self.src_root = self.project_root / "src"
         self.unused_files = []
         self.unused_imports = defaultdict(list)
         self.dead_components = []
         self.temporary_files = []
         self.analysis_results = {}
+        self._import_graph = None
+
+    @property
+    def import_graph(self) -> ImportGraph:
+        """Resolved import graph of src/, built once per analyzer"""
+        if self._import_graph is None:
+            self._import_graph = ImportGraph(str(self.project_root), cache=self.cache)
+        return self._import_graph
         
     def analyze_typescript_imports(self) -> Dict[str, Set[str]]:
         """Analyze all TypeScript imports in the codebase"""
         import_map = defaultdict(set)
         file_imports = defaultdict(set)
-        
-        # Find all TypeScript files
-        ts_files = list(self.src_root.rglob("*.ts")) + list(self.src_root.rglob("*.tsx"))
-        
-        for file_path in ts_files:
-            try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                # Find import statements
-                import_patterns = [
-                    r"import\s+(?:{[^}]+}|\*\s+as\s+\w+|\w+)\s+from\s+['\"]([^'\"]+)['\"];",
-                    r"import\s+['\"]([^'\"]+)['\"];",
-                    r"from\s+['\"]([^'\"]+)['\"]\s+import"
-                ]
-                
-                for pattern in import_patterns:
-                    matches = re.findall(pattern, content)
-                    for match in matches:
-                        if match.startswith('.'):  # Relative import
-                            file_imports[str(file_path)].add(match)
-                        import_map[match].add(str(file_path))
-                        
-            except Exception as e:
-                print(f"Error reading {file_path}: {e}")
-                
+
+        # Static imports of every TypeScript file, taken from the shared source index
+        for source_file in self.import_graph.index:
+            if source_file.path.suffix not in ('.ts', '.tsx'):
+                continue
+            for specifier, kind in source_file.imports:
+                if kind not in ('static', 'side-effect'):
+                    continue
+                if specifier.startswith('.'):  # Relative import
+                    file_imports[str(source_file.path)].add(specifier)
+                import_map[specifier].add(str(source_file.path))
+
         return dict(import_map), dict(file_imports)
     
     def find_unused_components(self) -> List[str]:
-        """Find React components that are not imported anywhere"""
-        components_dir = self.src_root / "components"
+        """Find React components that main.tsx and the App routes can never load"""
+        components_dir = (self.src_root / "components").resolve()
         if not components_dir.exists():
             return []
-            
-        component_files = list(components_dir.rglob("*.tsx")) + list(components_dir.rglob("*.ts"))
-        unused_components = []
-        
-        # Get all import statements
-        import_map, _ = self.analyze_typescript_imports()
-        
-        for comp_file in component_files:
-            component_name = comp_file.stem
-            relative_path = str(comp_file.relative_to(self.src_root))
-            
-            # Check if this component is imported anywhere
-            is_used = False
-            for import_path, importers in import_map.items():
-                if (component_name.lower() in import_path.lower() or 
-                    relative_path.replace('\\', '/') in import_path or
-                    f"./{relative_path.replace('\\', '/')}" in import_path):
-                    is_used = True
-                    break
-                    
-            if not is_used:
-                unused_components.append(str(comp_file))
-                
-        return unused_components
+
+        report = self.import_graph.analyze()
+        return [module for module in report['unreachable_modules']
+                if Path(module).is_relative_to(components_dir)]
     
     def find_dead_code_patterns(self) -> Dict[str, List[str]]:
         """Find common dead code patterns"""
@@ -92,62 +110,25 @@ class CodebaseCleanupAnalyzer:
             'todo_comments': []
         }
         
-        ts_files = list(self.src_root.rglob("*.ts")) + list(self.src_root.rglob("*.tsx"))
-        
-        for file_path in ts_files:
-            try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    lines = content.split('\n')
-                    
-                # Find large commented blocks (5+ consecutive comment lines)
-                comment_block_start = None
-                for i, line in enumerate(lines):
-                    stripped = line.strip()
-                    if stripped.startswith('//') or stripped.startswith('/*'):
-                        if comment_block_start is None:
-                            comment_block_start = i
-                    else:
-                        if comment_block_start is not None and (i - comment_block_start) >= 5:
-                            dead_code['commented_blocks'].append({
-                                'file': str(file_path),
-                                'lines': f"{comment_block_start + 1}-{i}",
-                                'size': i - comment_block_start
-                            })
-                        comment_block_start = None
-                        
-                # Find TODO/FIXME comments
-                todo_pattern = r'//.*(?:TODO|FIXME|XXX|HACK)'
-                for i, line in enumerate(lines):
-                    if re.search(todo_pattern, line, re.IGNORECASE):
-                        dead_code['todo_comments'].append({
-                            'file': str(file_path),
-                            'line': i + 1,
-                            'content': line.strip()
-                        })
-                        
-                # Find console.log statements
-                console_pattern = r'console\.(log|debug|info|warn|error)'
-                for i, line in enumerate(lines):
-                    if re.search(console_pattern, line) and not line.strip().startswith('//'):
-                        dead_code['debug_code'].append({
-                            'file': str(file_path),
-                            'line': i + 1,
-                            'content': line.strip()
-                        })
-                        
-            except Exception as e:
-                print(f"Error analyzing {file_path}: {e}")
-                
+        ts_files = [source_file for source_file in self.import_graph.index
+                    if source_file.path.suffix in ('.ts', '.tsx')]
+        contents = {source_file.content_hash: source_file.content for source_file in ts_files}
+        if self.cache:
+            found_by_hash = self.cache.map('dead_code_patterns', DEAD_CODE_PATTERNS_VERSION,
+                                           contents, scan_dead_code_patterns)
+        else:
+            found_by_hash = {digest: scan_dead_code_patterns(content) for digest, content in contents.items()}
+
+        for source_file in ts_files:
+            for category, entries in found_by_hash[source_file.content_hash].items():
+                dead_code[category].extend({'file': str(source_file.path), **entry} for entry in entries)
+
         return dead_code
     
     def find_obsolete_test_files(self) -> List[str]:
         """Find test files that no longer have corresponding implementation files"""
-        test_files = []
-        test_patterns = ['**/*.test.ts', '**/*.test.tsx', '**/*.spec.ts', '**/*.spec.tsx']
-        
-        for pattern in test_patterns:
-            test_files.extend(self.project_root.rglob(pattern))
+        test_suffixes = ('.test.ts', '.test.tsx', '.spec.ts', '.spec.tsx')
+        test_files = open_inventory().files(self.project_root, test_suffixes)
             
         orphaned_tests = []
         
@@ -161,7 +142,7 @@ class CodebaseCleanupAnalyzer:
                 test_file.parent / f"{test_name}.jsx"
             ]
             
-            has_implementation = any(impl_file.exists() for impl_file in impl_patterns)
+            has_implementation = any(open_inventory().exists(impl_file) for impl_file in impl_patterns)
             
             if not has_implementation:
                 orphaned_tests.append(str(test_file))
@@ -170,77 +151,22 @@ class CodebaseCleanupAnalyzer:
     
     def find_unused_assets(self) -> List[str]:
         """Find unused static assets (images, fonts, etc.)"""
-        public_dir = self.project_root / "public"
-        if not public_dir.exists():
+        if not (self.project_root / "public").exists() and not self.src_root.exists():
             return []
-            
-        asset_files = []
-        asset_extensions = {'.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico', '.pdf', '.webp'}
-        
-        for file_path in public_dir.rglob("*"):
-            if file_path.suffix.lower() in asset_extensions:
-                asset_files.append(file_path)
-                
-        # Check if assets are referenced in code
-        unused_assets = []
-        all_source_files = list(self.src_root.rglob("*")) + [self.project_root / "index.html"]
-        
-        for asset in asset_files:
-            asset_name = asset.name
-            is_referenced = False
-            
-            for source_file in all_source_files:
-                if source_file.is_file() and source_file.suffix in {'.ts', '.tsx', '.js', '.jsx', '.html', '.css', '.scss'}:
-                    try:
-                        with open(source_file, 'r', encoding='utf-8', errors='ignore') as f:
-                            content = f.read()
-                            if asset_name in content:
-                                is_referenced = True
-                                break
-                    except:
-                        continue
-                        
-            if not is_referenced:
-                unused_assets.append(str(asset))
-                
-        return unused_assets
+
+        # One tokenized pass over src/, index.html, stylesheets and public/ manifests;
+        # each asset is then a set lookup
+        references = AssetReferenceIndex(str(self.project_root), index=self.import_graph.index, cache=self.cache)
+        return [str(asset) for asset in references.unused_assets()]
     
     def analyze_package_dependencies(self) -> Dict[str, List[str]]:
         """Analyze package.json for potentially unused dependencies"""
         package_json = self.project_root / "package.json"
         if not package_json.exists():
             return {'unused_dependencies': [], 'dev_dependencies': []}
-            
-        with open(package_json, 'r') as f:
-            package_data = json.load(f)
-            
-        dependencies = package_data.get('dependencies', {})
-        dev_dependencies = package_data.get('devDependencies', {})
-        
-        # Simple check - look for imports in source files
-        all_source_content = ""
-        ts_files = list(self.src_root.rglob("*.ts")) + list(self.src_root.rglob("*.tsx"))
-        
-        for file_path in ts_files:
-            try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    all_source_content += f.read() + "\n"
-            except:
-                continue
-                
-        potentially_unused = []
-        for dep_name in dependencies.keys():
-            if dep_name not in all_source_content and not any([
-                dep_name.replace('-', '').lower() in all_source_content.lower(),
-                dep_name.replace('@', '').replace('/', '') in all_source_content
-            ]):
-                potentially_unused.append(dep_name)
-                
-        return {
-            'potentially_unused_dependencies': potentially_unused,
-            'total_dependencies': len(dependencies),
-            'total_dev_dependencies': len(dev_dependencies)
-        }
+
+        # Usage comes from parsed import specifiers mapped to package names, not substring search
+        return DependencyUsageAnalyzer(str(self.project_root), graph=self.import_graph, cache=self.cache).analyze()
     
     def run_comprehensive_analysis(self) -> Dict:
         """Run all analysis functions and compile results"""
@@ -249,6 +175,7 @@ class CodebaseCleanupAnalyzer:
         print("📂 Analyzing imports and components...")
         import_map, file_imports = self.analyze_typescript_imports()
         unused_components = self.find_unused_components()
+        graph_report = self.import_graph.analyze()
         
         print("💀 Finding dead code patterns...")
         dead_code = self.find_dead_code_patterns()
@@ -264,14 +191,18 @@ class CodebaseCleanupAnalyzer:
         
         results = {
             'summary': {
-                'total_typescript_files': len(list(self.src_root.rglob("*.ts")) + list(self.src_root.rglob("*.tsx"))),
+                'total_typescript_files': len(open_inventory().files(self.src_root, ('.ts', '.tsx'))),
                 'unused_components_count': len(unused_components),
+                'unreachable_modules_count': len(graph_report['unreachable_modules']),
                 'commented_blocks_count': len(dead_code['commented_blocks']),
                 'debug_statements_count': len(dead_code['debug_code']),
                 'orphaned_tests_count': len(orphaned_tests),
                 'unused_assets_count': len(unused_assets)
             },
             'unused_components': unused_components,
+            'unreachable_modules': graph_report['unreachable_modules'],
+            'test_only_modules': graph_report['test_only_modules'],
+            'unresolved_imports': graph_report['unresolved_imports'],
             'dead_code': dead_code,
             'orphaned_tests': orphaned_tests,
             'unused_assets': unused_assets,
@@ -302,6 +233,7 @@ def main():
     print("\n📊 CLEANUP ANALYSIS SUMMARY:")
     print(f"📄 Total TypeScript files: {results['summary']['total_typescript_files']}")
     print(f"🗑️ Unused components: {results['summary']['unused_components_count']}")
+    print(f"🕸️ Unreachable modules: {results['summary']['unreachable_modules_count']}")
     print(f"💬 Large commented blocks: {results['summary']['commented_blocks_count']}")
     print(f"🐛 Debug statements: {results['summary']['debug_statements_count']}")
     print(f"🧪 Orphaned test files: {results['summary']['orphaned_tests_count']}")
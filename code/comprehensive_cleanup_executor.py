@@ -11,6 +11,8 @@ import re
 from pathlib import Path
 from typing import List, Dict
 
+from file_inventory import open_inventory, tree_totals
+
 class CodebaseCleanupExecutor:
     def __init__(self, workspace_root: str):
         self.workspace_root = Path(workspace_root)
@@ -18,6 +20,8 @@ class CodebaseCleanupExecutor:
         self.cleanup_log = []
         self.total_size_freed = 0
         self.total_files_removed = 0
+        # Deletions are forgotten in the shared inventory so later tools in the run see them
+        self.inventory = open_inventory()
         
     def log_action(self, action: str, details: str = ""):
         """Log cleanup actions"""
@@ -29,14 +33,7 @@ class CodebaseCleanupExecutor:
         
     def get_directory_size(self, path: Path) -> int:
         """Get total size of directory in bytes"""
-        total = 0
-        try:
-            for file_path in path.rglob('*'):
-                if file_path.is_file():
-                    total += file_path.stat().st_size
-        except Exception as e:
-            print(f"Warning: Could not calculate size for {path}: {e}")
-        return total
+        return tree_totals(path)[1]
         
     def remove_archived_directories(self):
         """Remove archived and temporary directories"""
@@ -52,11 +49,12 @@ class CodebaseCleanupExecutor:
         
         for dir_path in directories_to_remove:
             if dir_path.exists():
-                size = self.get_directory_size(dir_path)
-                file_count = sum(1 for _ in dir_path.rglob('*') if _.is_file())
+                # Everything rmtree frees, node_modules included, not just what the inventory tracks
+                file_count, size = tree_totals(dir_path)
                 
                 try:
                     shutil.rmtree(dir_path)
+                    self.inventory.forget(dir_path)
                     self.total_size_freed += size
                     self.total_files_removed += file_count
                     self.log_action(f"Removed directory {dir_path.name}", 
@@ -85,6 +83,7 @@ class CodebaseCleanupExecutor:
                 try:
                     size = comp_file.stat().st_size
                     comp_file.unlink()
+                    self.inventory.forget(comp_file)
                     self.total_size_freed += size
                     self.total_files_removed += 1
                     self.log_action(f"Removed unused component", comp_file.name)
@@ -173,6 +172,7 @@ class CodebaseCleanupExecutor:
                 try:
                     size = asset_file.stat().st_size
                     asset_file.unlink()
+                    self.inventory.forget(asset_file)
                     self.total_size_freed += size
                     self.total_files_removed += 1
                     self.log_action(f"Removed unused asset", asset_file.name)
@@ -254,9 +254,9 @@ class CodebaseCleanupExecutor:
                 
         for temp_dir in temp_dirs:
             try:
-                size = self.get_directory_size(temp_dir)
-                file_count = sum(1 for _ in temp_dir.rglob('*') if _.is_file())
+                file_count, size = tree_totals(temp_dir)
                 shutil.rmtree(temp_dir)
+                self.inventory.forget(temp_dir)
                 self.total_size_freed += size
                 self.total_files_removed += file_count
                 self.log_action(f"Removed temp extraction dir", f"{temp_dir.name} ({file_count} files)")
@@ -281,6 +281,7 @@ class CodebaseCleanupExecutor:
                 try:
                     size = file_path.stat().st_size
                     file_path.unlink()
+                    self.inventory.forget(file_path)
                     self.total_size_freed += size
                     self.total_files_removed += 1
                     self.log_action(f"Removed loose file", filename)
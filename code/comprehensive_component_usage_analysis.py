@@ -8,13 +8,47 @@ import os
 import re
 from pathlib import Path
 from collections import defaultdict
+from typing import Optional
 import json
 
-def comprehensive_component_analysis():
+from aho_corasick import AhoCorasick
+from analysis_cache import DEFAULT_CACHE_PATH, open_cache
+from source_index import SourceIndex
+
+def find_wizard_step_references(matcher: AhoCorasick, content: str) -> set:
+    """Lowercased component names a file references, from one pass of `matcher`.
+
+    `matcher` holds the lowercased component names plus 'from', 'import',
+    'wizard-steps' and '\\n'. A name counts when its line reads like
+    `from.*wizard-steps.*Name` or `import.*Name`, or it directly follows
+    `wizard-steps/` (the patterns this script used to run per component).
+    """
+    referenced = set()
+    import_end = from_end = steps_end = None
+    for start, end, key in matcher.iter_matches(content):
+        if key == '\n':
+            import_end = from_end = steps_end = None
+        elif key == 'import':
+            import_end = import_end or end
+        elif key == 'from':
+            from_end = from_end or end
+        elif key == 'wizard-steps':
+            if steps_end is None and from_end is not None and start >= from_end:
+                steps_end = end
+        elif ((import_end is not None and import_end <= start)
+              or (steps_end is not None and steps_end <= start)
+              or content[max(start - 13, 0):start].lower() == 'wizard-steps/'):
+            referenced.add(key)
+    return referenced
+
+def comprehensive_component_analysis(project_root: str = "/workspace/claimguru",
+                                     cache_path: Optional[str] = DEFAULT_CACHE_PATH):
     """Analyze all wizard step component usage across entire codebase"""
     
-    base_path = Path("/workspace/claimguru")
+    base_path = Path(project_root)
     wizard_steps_path = base_path / "src/components/claims/wizard-steps"
+    # Shares parsed files with the other analyzers through the analysis cache
+    index = SourceIndex(base_path / "src", cache=open_cache(cache_path))
     
     results = {
         "component_files": [],
@@ -44,16 +78,9 @@ def comprehensive_component_analysis():
         return results
     
     # 2. Find all wizard-related files that might import components
-    wizard_patterns = [
-        "**/claims/*wizard*.tsx",
-        "**/claims/*Wizard*.tsx", 
-        "**/*wizard*.tsx",
-        "**/*Wizard*.tsx"
-    ]
-    
-    wizard_files = set()
-    for pattern in wizard_patterns:
-        wizard_files.update(base_path.glob(pattern))
+    wizard_files = {source_file.path for source_file in index
+                    if source_file.path.suffix == '.tsx'
+                    and ('wizard' in source_file.path.name or 'Wizard' in source_file.path.name)}
     
     results["wizard_files"] = [str(f.relative_to(base_path)) for f in wizard_files]
     
@@ -66,11 +93,11 @@ def comprehensive_component_analysis():
     print(f"\n🔎 Analyzing component imports in wizard files:")
     
     for wizard_file in wizard_files:
-        if wizard_file.exists():
+        source_file = index.get(wizard_file)
+        if source_file:
             try:
-                with open(wizard_file, 'r') as f:
-                    content = f.read()
-                
+                content = source_file.content
+
                 # Find import statements for wizard steps
                 import_pattern = r"import.*?from\s+['\"]\.\/wizard-steps\/([^'\"]+)['\"]"
                 imports = re.findall(import_pattern, content)
@@ -98,31 +125,18 @@ def comprehensive_component_analysis():
     src_path = base_path / "src"
     all_refs = defaultdict(list)
     
-    # Search all .tsx and .ts files
-    for file_path in src_path.rglob("*.tsx"):
-        if file_path.exists() and "wizard-steps" not in str(file_path):
-            try:
-                with open(file_path, 'r') as f:
-                    content = f.read()
-                
-                # Check for any reference to wizard step files
-                for comp_file in results["component_files"]:
-                    comp_name = comp_file.replace('.tsx', '')
-                    # Look for imports, references, or mentions
-                    patterns = [
-                        f"from.*wizard-steps.*{comp_name}",
-                        f"import.*{comp_name}",
-                        f"wizard-steps/{comp_file}",
-                        f"wizard-steps/{comp_name}"
-                    ]
-                    
-                    for pattern in patterns:
-                        if re.search(pattern, content, re.IGNORECASE):
-                            all_refs[comp_file].append(str(file_path.relative_to(base_path)))
-                            break
-                            
-            except Exception as e:
-                continue
+    # One automaton over every component name: each file is scanned once
+    names = [comp_file.replace('.tsx', '').lower() for comp_file in results["component_files"]]
+    matcher = AhoCorasick(names + ['from', 'import', 'wizard-steps', '\n'], ignore_case=True)
+
+    # Search all .tsx files
+    for source_file in index:
+        file_path = source_file.path
+        if file_path.suffix == '.tsx' and "wizard-steps" not in str(file_path):
+            referenced = find_wizard_step_references(matcher, source_file.content)
+            for comp_file in results["component_files"]:
+                if comp_file.replace('.tsx', '').lower() in referenced:
+                    all_refs[comp_file].append(str(file_path.relative_to(base_path)))
     
     results["other_usage"] = dict(all_refs)
     
@@ -242,4 +256,5 @@ def comprehensive_component_analysis():
     return results
 
 if __name__ == "__main__":
-    comprehensive_component_analysis()
+    import sys
+    comprehensive_component_analysis(*sys.argv[1:2])
@@ -4,16 +4,43 @@ Comprehensive ClaimGuru System Audit Script
 Analyzes codebase for duplicates, unused code, and generates production roadmap
 """
 
-import os
 import re
+import sys
 import json
 from pathlib import Path
 from collections import defaultdict, Counter
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
+
+from analysis_cache import DEFAULT_CACHE_PATH, open_cache
+from code_fingerprints import index_source_tree
+from source_index import SourceIndex
+from source_snapshot import SourceSnapshot, snapshot_for
+
+# Bump when the function signature patterns change
+FUNCTION_SIGNATURES_VERSION = '1'
+FUNCTION_PATTERNS = [
+    r"export\s+(?:async\s+)?function\s+(\w+)",
+    r"(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s+)?(?:\([^)]*\)\s*=>|\([^)]*\)\s*=>\s*{)",
+    r"(?<!\w)(\w+)\s*:\s*(?:async\s+)?\([^)]*\)\s*=>"
+]
+
+def extract_function_names(content: str) -> List[str]:
+    """Function-like declarations in one file, in pattern order"""
+    names = []
+    for pattern in FUNCTION_PATTERNS:
+        for match in re.findall(pattern, content):
+            names.append(match if isinstance(match, str) else match[0])
+    return names
 
 class ClaimGuruAuditor:
-    def __init__(self, project_root: str = "/workspace/claimguru"):
-        self.project_root = Path(project_root)
+    def __init__(self, project_root: str = "/workspace/claimguru", cache_path: Optional[str] = DEFAULT_CACHE_PATH,
+                 snapshot: Optional[SourceSnapshot] = None, verbose: bool = True):
+        # With a snapshot every read comes from it, so audits can run against any past commit
+        self.snapshot = snapshot
+        # Progress counts are skipped when the audit reruns on every change, as in audit_watch
+        self.verbose = verbose
+        self.project_root = snapshot.root if snapshot else Path(project_root)
+        self.cache = open_cache(cache_path)
         self.src_path = self.project_root / "src"
         self.components_path = self.src_path / "components"
         self.services_path = self.src_path / "services"
@@ -25,62 +52,55 @@ class ClaimGuruAuditor:
         self.service_usage = defaultdict(list)
         self.import_analysis = defaultdict(set)
         self.duplicate_functions = defaultdict(list)
+        self.near_duplicates = []
         self.wizard_components = defaultdict(list)
         self.wizard_analysis = {}
-        
+        self._index = None
+
+    @property
+    def index(self) -> SourceIndex:
+        """Source index of src/, built on first use and shared by every analysis"""
+        if self._index is None:
+            self._index = SourceIndex(self.src_path, cache=self.cache, snapshot=self.snapshot)
+            if self.verbose:
+                print(f"Indexed {len(self._index)} source files in {self._index.build_seconds:.2f}s")
+        return self._index
+
+    def _exists(self, directory: Path) -> bool:
+        if self.snapshot:
+            return bool(self.snapshot.files(directory))
+        return directory.exists()
+
+    def _list(self, directory: Path, suffix: str) -> List[Path]:
+        """Direct children of directory with suffix, from the snapshot or the live tree"""
+        if self.snapshot:
+            paths = (self.snapshot.root / path for path in self.snapshot.files(directory, (suffix,)))
+            return [path for path in paths if path.parent == directory]
+        return list(directory.glob(f"*{suffix}"))
+
     def analyze_imports_in_file(self, file_path: Path) -> Set[str]:
         """Extract all imports from a TypeScript/JavaScript file"""
         imports = set()
-        if not file_path.exists():
+        source_file = self.index.get(file_path)
+        if source_file is None:
             return imports
-            
-        try:
-            content = file_path.read_text(encoding='utf-8')
-            
-            # Match various import patterns
-            import_patterns = [
-                r"import\s+.*?from\s+['\"](.+?)['\"]",  # Standard imports
-                r"import\s*\(\s*['\"](.+?)['\"]\s*\)",   # Dynamic imports
-                r"require\s*\(\s*['\"](.+?)['\"]\s*\)",  # CommonJS requires
-            ]
-            
-            for pattern in import_patterns:
-                matches = re.findall(pattern, content, re.MULTILINE)
-                for match in matches:
-                    # Clean up the import path
-                    clean_import = match.strip()
-                    if clean_import.startswith('./') or clean_import.startswith('../'):
-                        # Convert relative imports to component names
-                        component_name = clean_import.split('/')[-1]
-                        if component_name:
-                            imports.add(component_name)
-                    elif '/' in clean_import and not clean_import.startswith('@'):
-                        # Internal imports
-                        imports.add(clean_import.split('/')[-1])
-                        
-        except Exception as e:
-            print(f"Error reading {file_path}: {e}")
-            
+
+        for specifier, kind in source_file.imports:
+            if kind not in ('static', 'dynamic', 'require'):
+                continue
+            # Clean up the import path
+            clean_import = specifier.strip()
+            if clean_import.startswith('./') or clean_import.startswith('../'):
+                # Convert relative imports to component names
+                component_name = clean_import.split('/')[-1]
+                if component_name:
+                    imports.add(component_name)
+            elif '/' in clean_import and not clean_import.startswith('@'):
+                # Internal imports
+                imports.add(clean_import.split('/')[-1])
+
         return imports
     
-    def find_component_references(self, component_name: str, search_content: str) -> List[str]:
-        """Find references to a component in file content"""
-        references = []
-        
-        # Pattern to match component usage in JSX
-        patterns = [
-            rf"<{component_name}[\s/>]",  # JSX tag
-            rf"\b{component_name}\s*\(",   # Function call
-            rf"import.*{component_name}",   # Import statement
-            rf"export.*{component_name}",   # Export statement
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, search_content, re.IGNORECASE)
-            references.extend(matches)
-            
-        return references
-    
     def analyze_wizard_components(self):
         """Analyze wizard-specific components and their relationships"""
         wizard_files = [
@@ -94,9 +114,10 @@ class ClaimGuruAuditor:
         
         for wizard_file in wizard_files:
             wizard_path = self.components_path / "claims" / wizard_file
-            if wizard_path.exists():
+            source_file = self.index.get(wizard_path)
+            if source_file:
                 try:
-                    content = wizard_path.read_text(encoding='utf-8')
+                    content = source_file.content
                     imports = self.analyze_imports_in_file(wizard_path)
                     self.wizard_components[wizard_file] = list(imports)
                     
@@ -118,104 +139,66 @@ class ClaimGuruAuditor:
     
     def analyze_component_usage(self):
         """Analyze which components are used where"""
-        if not self.components_path.exists():
+        if not self._exists(self.components_path):
             print(f"Components path not found: {self.components_path}")
             return
             
         # Get all component files
-        component_files = []
-        for root, dirs, files in os.walk(self.components_path):
-            for file in files:
-                if file.endswith(('.tsx', '.ts')):
-                    component_files.append(Path(root) / file)
-        
-        print(f"Found {len(component_files)} component files")
-        
-        # Analyze each component
+        component_files = [source_file for source_file in self.index
+                           if source_file.path.suffix in ('.tsx', '.ts')
+                           and source_file.path.is_relative_to(self.components_path)]
+
+        if self.verbose:
+            print(f"Found {len(component_files)} component files")
+
+        # Look each component up in the index instead of rescanning src/ for it
         for component_file in component_files:
-            component_name = component_file.stem
-            
-            # Search for usage across entire src directory
-            usage_files = []
-            for root, dirs, files in os.walk(self.src_path):
-                for file in files:
-                    if file.endswith(('.tsx', '.ts', '.js')):
-                        file_path = Path(root) / file
-                        if file_path != component_file:  # Don't include self
-                            try:
-                                content = file_path.read_text(encoding='utf-8')
-                                references = self.find_component_references(component_name, content)
-                                if references:
-                                    relative_path = file_path.relative_to(self.src_path)
-                                    usage_files.append(str(relative_path))
-                            except Exception as e:
-                                continue
-            
-            self.component_usage[component_name] = usage_files
+            component_name = component_file.path.stem
+            usage_files = self.index.files_referencing(component_name) - {component_file.relative_path}
+            self.component_usage[component_name] = sorted(usage_files)
     
     def analyze_services_usage(self):
         """Analyze service file usage and potential duplicates"""
-        if not self.services_path.exists():
+        if not self._exists(self.services_path):
             print(f"Services path not found: {self.services_path}")
             return
             
-        service_files = list(self.services_path.glob("*.ts"))
-        print(f"Found {len(service_files)} service files")
+        service_files = self._list(self.services_path, ".ts")
+        if self.verbose:
+            print(f"Found {len(service_files)} service files")
         
         for service_file in service_files:
             service_name = service_file.stem
-            
-            # Search for usage
-            usage_files = []
-            for root, dirs, files in os.walk(self.src_path):
-                for file in files:
-                    if file.endswith(('.tsx', '.ts', '.js')):
-                        file_path = Path(root) / file
-                        if file_path != service_file:
-                            try:
-                                content = file_path.read_text(encoding='utf-8')
-                                if service_name in content:
-                                    relative_path = file_path.relative_to(self.src_path)
-                                    usage_files.append(str(relative_path))
-                            except Exception as e:
-                                continue
-            
-            self.service_usage[service_name] = usage_files
+            usage_files = self.index.files_containing(service_name) - {str(service_file.relative_to(self.src_path))}
+            self.service_usage[service_name] = sorted(usage_files)
     
     def find_duplicate_functions(self):
         """Find potentially duplicate functions across services"""
         function_signatures = defaultdict(list)
         
+        ts_files = [source_file for source_file in self.index if source_file.path.suffix in ('.ts', '.tsx')]
+        contents = {source_file.content_hash: source_file.content for source_file in ts_files}
+        if self.cache:
+            names_by_hash = self.cache.map('function_signatures', FUNCTION_SIGNATURES_VERSION,
+                                           contents, extract_function_names)
+        else:
+            names_by_hash = {digest: extract_function_names(content) for digest, content in contents.items()}
+
         # Analyze all TypeScript files for function signatures
-        for root, dirs, files in os.walk(self.src_path):
-            for file in files:
-                if file.endswith(('.ts', '.tsx')):
-                    file_path = Path(root) / file
-                    try:
-                        content = file_path.read_text(encoding='utf-8')
-                        
-                        # Find function declarations
-                        function_patterns = [
-                            r"export\s+(?:async\s+)?function\s+(\w+)",
-                            r"(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s+)?(?:\([^)]*\)\s*=>|\([^)]*\)\s*=>\s*{)",
-                            r"(\w+)\s*:\s*(?:async\s+)?\([^)]*\)\s*=>"
-                        ]
-                        
-                        for pattern in function_patterns:
-                            matches = re.findall(pattern, content)
-                            for match in matches:
-                                func_name = match if isinstance(match, str) else match[0]
-                                relative_path = file_path.relative_to(self.src_path)
-                                function_signatures[func_name].append(str(relative_path))
-                                
-                    except Exception as e:
-                        continue
+        for source_file in ts_files:
+            for func_name in names_by_hash[source_file.content_hash]:
+                function_signatures[func_name].append(source_file.relative_path)
         
         # Find potential duplicates
         for func_name, locations in function_signatures.items():
             if len(locations) > 1:
                 self.duplicate_functions[func_name] = locations
     
+    def find_near_duplicate_code(self):
+        """Find near-copied files by winnowed token fingerprints rather than by function names"""
+        fingerprints = index_source_tree(self.index, cache=self.cache)
+        self.near_duplicates = fingerprints.similar_pairs()
+    
     def identify_unused_components(self) -> Dict[str, List[str]]:
         """Identify components that appear to be unused"""
         unused = {}
@@ -235,11 +218,11 @@ class ClaimGuruAuditor:
     def analyze_wizard_step_components(self):
         """Specifically analyze wizard step components"""
         wizard_steps_path = self.components_path / "claims" / "wizard-steps"
-        if not wizard_steps_path.exists():
+        if not self._exists(wizard_steps_path):
             print(f"Wizard steps path not found: {wizard_steps_path}")
             return {}
             
-        step_files = list(wizard_steps_path.glob("*.tsx"))
+        step_files = self._list(wizard_steps_path, ".tsx")
         step_analysis = {}
         
         for step_file in step_files:
@@ -271,6 +254,7 @@ class ClaimGuruAuditor:
                 'unused_components': len(unused_analysis['definitely_unused']),
                 'potentially_unused_components': len(unused_analysis['potentially_unused']),
                 'duplicate_functions': len(self.duplicate_functions),
+                'near_duplicate_pairs': len(self.near_duplicates),
                 'wizard_files': len(self.wizard_analysis)
             },
             'unused_components': unused_analysis,
@@ -278,6 +262,7 @@ class ClaimGuruAuditor:
             'wizard_step_analysis': step_analysis,
             'service_usage': dict(self.service_usage),
             'duplicate_functions': dict(self.duplicate_functions),
+            'near_duplicates': self.near_duplicates,
             'detailed_component_usage': dict(self.component_usage)
         }
         
@@ -299,14 +284,28 @@ class ClaimGuruAuditor:
         print("4. Finding duplicate functions...")
         self.find_duplicate_functions()
         
-        print("5. Generating audit report...")
+        print("5. Finding near-duplicate code...")
+        self.find_near_duplicate_code()
+        
+        print("6. Generating audit report...")
         report = self.generate_audit_report()
         
         return report
 
 def main():
-    auditor = ClaimGuruAuditor()
-    report = auditor.run_full_audit()
+    # --snapshot=FILE or --commit=REF audits a source snapshot instead of the working tree
+    options = dict(arg[2:].split('=', 1) for arg in sys.argv[1:] if arg.startswith('--') and '=' in arg)
+    snapshot = None
+    if 'snapshot' in options:
+        snapshot = SourceSnapshot(options['snapshot'])
+    elif 'commit' in options:
+        snapshot = snapshot_for("/workspace/claimguru", options['commit'])
+    try:
+        auditor = ClaimGuruAuditor(snapshot=snapshot)
+        report = auditor.run_full_audit()
+    finally:
+        if snapshot:
+            snapshot.close()
     
     # Save detailed report
     output_file = "/workspace/comprehensive_system_audit_report.json"
@@ -324,6 +323,7 @@ def main():
     print(f"Unused Components: {report['summary']['unused_components']}")
     print(f"Potentially Unused: {report['summary']['potentially_unused_components']}")
     print(f"Duplicate Functions: {report['summary']['duplicate_functions']}")
+    print(f"Near-Duplicate File Pairs: {report['summary']['near_duplicate_pairs']}")
     print(f"Wizard Files: {report['summary']['wizard_files']}")
     
     if report['unused_components']['definitely_unused']:
@@ -331,6 +331,12 @@ def main():
         for comp in report['unused_components']['definitely_unused']:
             print(f"   - {comp}")
     
+    if report['near_duplicates']:
+        print(f"\n🧬 NEAR-DUPLICATE CODE:")
+        for pair in report['near_duplicates'][:15]:
+            first, second = pair['files']
+            print(f"   {pair['similarity']:5.1f}%  {first} ↔ {second}")
+    
     if report['wizard_analysis']:
         print(f"\n🧙 WIZARD ANALYSIS:")
         for wizard, analysis in report['wizard_analysis'].items():
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+ClaimGuru Dependency Usage Analyzer
+Maps every import specifier in src/, supabase/functions/, the build configs and
+scripts/ to the npm package it belongs to, and reports which chunk pulls each dependency in
+"""
+
+import re
+import sys
+import json
+from pathlib import Path
+from collections import defaultdict
+from typing import Dict, Optional, Set
+
+from analysis_cache import AnalysisCache, open_cache
+from import_graph import ImportGraph, package_name
+from source_index import SOURCE_EXTENSIONS, SourceIndex, parse_source
+
+SCRIPT_EXTENSIONS = SOURCE_EXTENSIONS + ('.mjs', '.cjs')
+CONFIG_GLOBS = ('vite.config*.*', 'vitest.config.*', 'tailwind.config.*', 'postcss.config.*', 'eslint.config.*')
+# A config file means the tool it configures is in use
+CONFIG_TOOLS = {'vite': 'vite', 'vitest': 'vitest', 'tailwind': 'tailwindcss', 'postcss': 'postcss', 'eslint': 'eslint'}
+NODE_BUILTINS = {
+    'assert', 'buffer', 'child_process', 'cluster', 'crypto', 'dns', 'events', 'fs', 'http', 'http2', 'https',
+    'module', 'net', 'os', 'path', 'perf_hooks', 'process', 'querystring', 'readline', 'stream', 'string_decoder',
+    'timers', 'tls', 'url', 'util', 'v8', 'vm', 'worker_threads', 'zlib',
+}
+# Deno edge functions pull npm packages through these CDNs
+ESM_CDN_PATTERN = re.compile(r'^https?://(?:esm\.sh|cdn\.skypack\.dev|cdn\.jsdelivr\.net/npm|unpkg\.com)/(.+)$')
+VERSION_SUFFIX_PATTERN = re.compile(r'^((?:@[^/@]+/)?[^/@]+)@[^/]*')
+REFERENCE_TYPES_PATTERN = re.compile(r'///\s*<reference\s+types=["\']([^"\']+)["\']')
+# Configs also name packages without importing them: postcss plugins as object
+# keys, vitest environments and manualChunks entries as strings
+POSTCSS_PLUGIN_PATTERN = re.compile(r'["\']?([@\w./-]+)["\']?\s*:\s*{')
+STRING_LITERAL_PATTERN = re.compile(r'["\']([@\w./-]+)["\']')
+SCRIPT_TOKEN_PATTERN = re.compile(r'[@\w./-]+')
+KNOWN_BINARIES = {'tsc': 'typescript', 'tsserver': 'typescript', 'eslint': 'eslint', 'vite': 'vite', 'vitest': 'vitest'}
+
+
+def specifier_package(specifier: str) -> Optional[str]:
+    """npm package an import specifier loads, or None for local files, URLs and Node builtins"""
+    if specifier.startswith('npm:'):
+        specifier = specifier[4:]
+    else:
+        cdn = ESM_CDN_PATTERN.match(specifier)
+        if cdn:
+            specifier = cdn.group(1)
+        elif specifier.startswith(('.', '/', 'node:', 'jsr:', 'http:', 'https:', 'data:', 'virtual:')):
+            return None
+    # Strip version pins such as pkg@1.2.3/sub or @scope/pkg@^2
+    versioned = VERSION_SUFFIX_PATTERN.match(specifier)
+    if versioned:
+        specifier = versioned.group(1) + specifier[versioned.end():]
+    name = package_name(specifier)
+    if not name or name in NODE_BUILTINS:
+        return None
+    return name
+
+
+def types_package_target(name: str) -> Optional[str]:
+    """Package a DefinitelyTyped package describes (@types/scope__pkg -> @scope/pkg)"""
+    if not name.startswith('@types/'):
+        return None
+    target = name[len('@types/'):]
+    if '__' in target:
+        scope, package = target.split('__', 1)
+        return f"@{scope}/{package}"
+    return target
+
+
+class DependencyUsageAnalyzer:
+    """Which declared dependencies are imported, by what, and from which chunk.
+
+    Usage is tracked per area: app (src/ outside tests), test, edge-function,
+    config, script and package-script (binaries run by package.json scripts).
+    """
+
+    def __init__(self, project_root: str, graph: Optional[ImportGraph] = None,
+                 cache: Optional[AnalysisCache] = None):
+        self.project_root = Path(project_root).resolve()
+        self.cache = cache
+        self.graph = graph or ImportGraph(str(self.project_root), cache=cache)
+        package_json = self.project_root / "package.json"
+        self.package_data = json.loads(package_json.read_text(encoding='utf-8')) if package_json.exists() else {}
+        self.dependencies: Dict[str, str] = self.package_data.get('dependencies', {})
+        self.dev_dependencies: Dict[str, str] = self.package_data.get('devDependencies', {})
+
+        # package -> area -> files that import it
+        self.usage: Dict[str, Dict[str, Set[str]]] = defaultdict(lambda: defaultdict(set))
+        self.module_packages: Dict[Path, Set[str]] = defaultdict(set)
+        self._collect()
+
+    @property
+    def declared(self) -> Dict[str, str]:
+        return {**self.dev_dependencies, **self.dependencies}
+
+    def _relative(self, path: Path) -> str:
+        try:
+            return str(path.resolve().relative_to(self.project_root))
+        except ValueError:
+            return str(path)
+
+    def _record(self, specifier: str, area: str, path: Path) -> Optional[str]:
+        name = specifier_package(specifier)
+        if name:
+            self.usage[name][area].add(self._relative(path))
+        elif specifier.startswith('node:') or package_name(specifier) in NODE_BUILTINS:
+            self.usage['@types/node'][area].add(self._relative(path))
+        return name
+
+    def _collect(self):
+        for source_file in self.graph.index:
+            module = source_file.path.resolve()
+            area = 'test' if self.graph.is_test_module(module) else 'app'
+            for specifier in self.graph.external_imports.get(module, ()):
+                name = self._record(specifier, area, module)
+                if name:
+                    self.module_packages[module].add(name)
+            for referenced in REFERENCE_TYPES_PATTERN.findall(source_file.content):
+                self._record(referenced, area, module)
+
+        for directory, area in (('supabase/functions', 'edge-function'), ('scripts', 'script')):
+            root = self.project_root / directory
+            if root.exists():
+                for source_file in SourceIndex(root, extensions=SCRIPT_EXTENSIONS, cache=self.cache):
+                    for specifier in source_file.import_specifiers:
+                        self._record(specifier, area, source_file.path)
+
+        for pattern in CONFIG_GLOBS:
+            for config in self.project_root.glob(pattern):
+                content = config.read_text(encoding='utf-8')
+                for specifier, _ in parse_source(content)['imports']:
+                    self._record(specifier, 'config', config)
+                named = set(STRING_LITERAL_PATTERN.findall(content)) | {CONFIG_TOOLS[config.name.split('.')[0]]}
+                if config.name.startswith('postcss.config'):
+                    named |= set(POSTCSS_PLUGIN_PATTERN.findall(content))
+                for name in named & set(self.declared):
+                    self._record(name, 'config', config)
+
+        binaries = self._binaries()
+        for command in self.package_data.get('scripts', {}).values():
+            for token in SCRIPT_TOKEN_PATTERN.findall(command):
+                name = binaries.get(token, token)
+                if name in self.declared:
+                    self.usage[name]['package-script'].add('package.json')
+
+    def _binaries(self) -> Dict[str, str]:
+        """Binary name -> package, from node_modules when installed"""
+        binaries = dict(KNOWN_BINARIES)
+        for name in self.declared:
+            manifest = self.project_root / "node_modules" / name / "package.json"
+            if not manifest.exists():
+                continue
+            try:
+                bin_field = json.loads(manifest.read_text(encoding='utf-8')).get('bin', {})
+            except (json.JSONDecodeError, OSError):
+                continue
+            if isinstance(bin_field, str):
+                binaries[name.split('/')[-1]] = name
+            else:
+                binaries.update((binary, name) for binary in bin_field)
+        return binaries
+
+    def is_used(self, name: str) -> bool:
+        if self.usage.get(name):
+            return True
+        # @types packages are used when the package they describe is; ones for
+        # globals such as google.maps when the global shows up in src/
+        target = types_package_target(name)
+        if not target:
+            return False
+        if target in self.declared or target in self.usage:
+            return bool(self.usage.get(target))
+        return bool(self.graph.index.files_containing(target))
+
+    def chunk_attribution(self) -> Dict[str, Dict]:
+        """For each package src/ imports: the chunks whose static module closure imports it.
+
+        Chunks are the entry modules from index.html plus every lazily imported
+        module, which is where Vite starts a separate chunk.
+        """
+        entries = self.graph.entry_points()
+        lazy_roots = sorted({target for targets in self.graph.edges.values()
+                             for target, kind in targets if kind == 'dynamic'} - set(entries))
+        entry_closure = self.graph.reachable(entries, include_dynamic=False)
+
+        eager = set()
+        for module in entry_closure:
+            eager |= self.module_packages.get(module, set())
+
+        chunks = defaultdict(list)
+        for root in entries + lazy_roots:
+            packages = set()
+            for module in self.graph.reachable([root], include_dynamic=False):
+                packages |= self.module_packages.get(module, set())
+            for name in packages:
+                chunks[name].append(self._relative(root))
+        return {name: {'eager': name in eager, 'chunks': chunks[name]} for name in sorted(chunks)}
+
+    def analyze(self) -> Dict:
+        unused = sorted(name for name in self.dependencies if not self.is_used(name))
+        unused_dev = sorted(name for name in self.dev_dependencies if not self.is_used(name))
+        # Runtime dependencies the shipped app never imports (tests, configs and scripts only)
+        dev_only = sorted(name for name in self.dependencies
+                          if self.is_used(name) and not self.usage.get(name, {}).get('app')
+                          and not types_package_target(name))
+        undeclared = sorted(name for name in self.usage
+                            if name not in self.declared and name != '@types/node'
+                            and set(self.usage[name]) - {'edge-function'})
+        return {
+            'potentially_unused_dependencies': unused,
+            'unused_dev_dependencies': unused_dev,
+            'dev_only_dependencies': dev_only,
+            'undeclared_imports': {name: sorted(set().union(*self.usage[name].values())) for name in undeclared},
+            'usage': {name: {area: sorted(files) for area, files in sorted(areas.items())}
+                      for name, areas in sorted(self.usage.items())},
+            'chunks': self.chunk_attribution(),
+            'total_dependencies': len(self.dependencies),
+            'total_dev_dependencies': len(self.dev_dependencies),
+        }
+
+
+def main():
+    project_root = sys.argv[1] if len(sys.argv) > 1 and not sys.argv[1].startswith('--') else "/workspace/claimguru"
+    report = DependencyUsageAnalyzer(project_root, cache=open_cache()).analyze()
+    if '--json' in sys.argv:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"📦 {report['total_dependencies']} dependencies, {report['total_dev_dependencies']} devDependencies")
+    print(f"🗑️ Unused dependencies: {len(report['potentially_unused_dependencies'])}")
+    for name in report['potentially_unused_dependencies']:
+        print(f"   - {name}")
+    print(f"🗑️ Unused devDependencies: {len(report['unused_dev_dependencies'])}")
+    for name in report['unused_dev_dependencies']:
+        print(f"   - {name}")
+    if report['dev_only_dependencies']:
+        print(f"🔧 Dependencies only used outside the app bundle: {', '.join(report['dev_only_dependencies'])}")
+    if report['undeclared_imports']:
+        print(f"⚠️ Imported but not declared in package.json:")
+        for name, files in report['undeclared_imports'].items():
+            print(f"   {name}: {', '.join(files)}")
+    print("🧩 Chunks pulling each dependency in:")
+    for name, attribution in report['chunks'].items():
+        label = 'entry' if attribution['eager'] else 'lazy'
+        print(f"   {name} ({label}): {', '.join(attribution['chunks'][:3])}"
+              f"{' ...' if len(attribution['chunks']) > 3 else ''}")
+
+
+if __name__ == "__main__":
+    main()
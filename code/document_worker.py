@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Document Processing Worker Pool
+Leases extraction jobs from the persistent job queue and runs them through the
+tiered extraction pipeline, outside the upload request path
+"""
+
+import os
+import sys
+import time
+import socket
+import argparse
+import threading
+import traceback
+import multiprocessing
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+
+from extraction_client import SUPABASE_URL
+from job_queue import (
+    DEFAULT_QUEUE_URL, DEFAULT_LEASE_SECONDS, PRIORITY_INTERACTIVE, PRIORITY_BATCH,
+    JobQueue, open_queue,
+)
+
+IDLE_POLL_SECONDS = 0.5
+JOB_KIND_EXTRACT = 'extract_document'
+SUBSCRIPTION_REFRESH_SECONDS = 300
+
+
+def enqueue_interactive_upload(queue: JobQueue, file_path: str, document_id: Optional[str] = None,
+                               organization_id: Optional[str] = None) -> int:
+    """Queue a document an adjuster is waiting on (wizard upload)"""
+    return queue.enqueue(JOB_KIND_EXTRACT, {'file_path': file_path, 'document_id': document_id},
+                         priority=PRIORITY_INTERACTIVE, organization_id=organization_id)
+
+
+def enqueue_reprocessing(queue: JobQueue, file_path: str, document_id: Optional[str] = None,
+                         organization_id: Optional[str] = None) -> int:
+    """Queue a backfill/reprocessing document; only runs when no interactive work is ready"""
+    return queue.enqueue(JOB_KIND_EXTRACT, {'file_path': file_path, 'document_id': document_id},
+                         priority=PRIORITY_BATCH, organization_id=organization_id)
+
+
+def sync_subscription_tiers(queue: JobQueue) -> int:
+    """Copy active subscription tiers into the scheduler so weights and caps follow billing"""
+    service_role_key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY", "")
+    response = requests.get(
+        f"{SUPABASE_URL.rstrip('/')}/rest/v1/subscriptions",
+        params={'select': 'organization_id,subscription_tier', 'status': 'eq.active'},
+        headers={'apikey': service_role_key, 'Authorization': f'Bearer {service_role_key}'},
+        timeout=30,
+    )
+    response.raise_for_status()
+    subscriptions = response.json()
+    for subscription in subscriptions:
+        queue.set_organization_tier(subscription['organization_id'], subscription['subscription_tier'])
+    return len(subscriptions)
+
+
+def subscription_sync_loop(queue_url: str, stop_event):
+    queue = open_queue(queue_url)
+    while True:
+        try:
+            print(f"🏢 Synced {sync_subscription_tiers(queue)} subscription tiers")
+        except Exception as e:
+            print(f"⚠️ Subscription tier sync failed: {e}")
+        if stop_event.wait(SUBSCRIPTION_REFRESH_SECONDS):
+            return
+
+
+class LeaseKeeper:
+    """Heartbeats a leased job from a background thread while the pipeline runs"""
+
+    def __init__(self, queue: JobQueue, job: Dict, worker_id: str, lease_seconds: int):
+        self.queue = queue
+        self.job = job
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.lease_seconds / 3):
+            if not self.queue.heartbeat(self.job['id'], self.worker_id, self.lease_seconds):
+                self.lost = True
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_job(pipeline, job: Dict) -> Dict:
+    if job['kind'] != JOB_KIND_EXTRACT:
+        raise ValueError(f"Unknown job kind: {job['kind']}")
+    payload = job['payload']
+    result = pipeline.process(payload['file_path'], payload.get('document_id'))
+    # The extracted text is already in the documents table; keep the queue row small
+    return {
+        'processingMethod': result['processingMethod'],
+        'qualityScore': result['qualityScore'],
+        'fieldsExtracted': len([v for v in result['policyData'].values() if v]),
+        'cost': result['cost'],
+    }
+
+
+def worker_loop(queue_url: str, worker_id: str, max_priority: Optional[int],
+                lease_seconds: int = DEFAULT_LEASE_SECONDS, stop_event=None, max_jobs: Optional[int] = None):
+    """Lease, process and acknowledge jobs until stopped.
+
+    Workers started with max_priority=PRIORITY_INTERACTIVE only ever take wizard
+    uploads, so an adjuster never waits behind a long batch job.
+    """
+    # Imported here so the pipeline's dependencies load in the worker process, not the parent
+    from extraction_pipeline import ExtractionPipeline
+    from extraction_tracing import tracer
+    from rate_limiter import RateLimiter
+
+    queue = open_queue(queue_url)
+    pipeline = ExtractionPipeline(rate_limiter=RateLimiter())
+    processed = 0
+
+    while not (stop_event and stop_event.is_set()) and (max_jobs is None or processed < max_jobs):
+        job = queue.lease(worker_id, lease_seconds, max_priority)
+        if job is None:
+            time.sleep(IDLE_POLL_SECONDS)
+            continue
+
+        name = Path(job['payload'].get('file_path', '')).name
+        started = time.time()
+        with LeaseKeeper(queue, job, worker_id, lease_seconds) as keeper:
+            try:
+                with tracer.span('job', job_id=job['id'], organization_id=job['organization_id'] or '',
+                                 priority=job['priority'], attempt=job['attempts'],
+                                 queue_wait_s=round(started - job['created_at'], 3)):
+                    result = run_job(pipeline, job)
+                error = None
+            except Exception as e:
+                error = f"{e}\n{traceback.format_exc(limit=5)}"
+
+        if keeper.lost:
+            print(f"⚠️ [{worker_id}] lease lost for job {job['id']} ({name}); another worker owns it now")
+        elif error is None:
+            queue.complete(job['id'], worker_id, result)
+            print(f"✅ [{worker_id}] job {job['id']} {name}: {result['processingMethod']}, "
+                  f"{time.time() - started:.1f}s")
+        else:
+            queue.fail(job['id'], worker_id, error, job['attempts'], job['max_attempts'])
+            print(f"❌ [{worker_id}] job {job['id']} {name} attempt {job['attempts']}/{job['max_attempts']}: "
+                  f"{error.splitlines()[0]}")
+
+        tracer.export_otlp()
+        processed += 1
+
+
+def run_pool(queue_url: str, workers: int, reserved_interactive: int,
+             lease_seconds: int = DEFAULT_LEASE_SECONDS):
+    """Start worker processes; the first `reserved_interactive` only take interactive jobs"""
+    if reserved_interactive >= workers:
+        raise ValueError("At least one worker must be able to take batch jobs")
+
+    stop_event = multiprocessing.Event()
+    host = socket.gethostname()
+    processes = []
+    for index in range(workers):
+        max_priority = PRIORITY_INTERACTIVE if index < reserved_interactive else None
+        worker_id = f"{host}:{os.getpid()}:{index}"
+        process = multiprocessing.Process(
+            target=worker_loop, args=(queue_url, worker_id, max_priority, lease_seconds, stop_event),
+            name=worker_id)
+        process.start()
+        processes.append(process)
+
+    threading.Thread(target=subscription_sync_loop, args=(queue_url, stop_event), daemon=True).start()
+    print(f"👷 {workers} workers ({reserved_interactive} reserved for interactive uploads) on {queue_url}")
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        print("🛑 Stopping after current jobs...")
+        stop_event.set()
+        for process in processes:
+            process.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Document processing worker pool")
+    parser.add_argument('--queue', default=DEFAULT_QUEUE_URL, help="sqlite:///path or postgresql://dsn")
+    subparsers = parser.add_subparsers(dest='command')
+
+    run_parser = subparsers.add_parser('run', help="Start the worker pool")
+    run_parser.add_argument('--workers', type=int, default=max(2, multiprocessing.cpu_count() // 2))
+    run_parser.add_argument('--reserved-interactive', type=int, default=1)
+    run_parser.add_argument('--lease-seconds', type=int, default=DEFAULT_LEASE_SECONDS)
+
+    enqueue_parser = subparsers.add_parser('enqueue', help="Queue PDFs for extraction")
+    enqueue_parser.add_argument('files', nargs='+')
+    enqueue_parser.add_argument('--batch', action='store_true', help="Queue as batch reprocessing")
+    enqueue_parser.add_argument('--document-id', help="documents.id to update (single file only)")
+    enqueue_parser.add_argument('--organization-id', help="Owning organization, for fair scheduling")
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        run_pool(args.queue, args.workers, args.reserved_interactive, args.lease_seconds)
+    elif args.command == 'enqueue':
+        queue = open_queue(args.queue)
+        enqueue = enqueue_reprocessing if args.batch else enqueue_interactive_upload
+        for file_path in args.files:
+            job_id = enqueue(queue, str(Path(file_path).resolve()), args.document_id, args.organization_id)
+            print(f"📥 Job {job_id}: {file_path} ({'batch' if args.batch else 'interactive'})")
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
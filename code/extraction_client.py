@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+OpenAI Field Extraction Client
+Calls the openai-extract-fields edge function, packing small documents into batch requests
+and streaming partial field results
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional
+from urllib.parse import urlparse
+
+import httpx
+import requests
+
+from extraction_tracing import tracer
+from rate_limiter import RateLimiter
+
+SUPABASE_URL = os.environ.get("SUPABASE_URL", "https://ttnjqxemkbugwsofacxs.supabase.co")
+SUPABASE_ANON_KEY = os.environ.get("SUPABASE_ANON_KEY", "")
+FUNCTION_PATH = "/functions/v1/openai-extract-fields"
+
+# Must match MAX_BATCH_DOCUMENTS / MAX_BATCH_TEXT_LENGTH in the edge function
+MAX_BATCH_DOCUMENTS = 8
+MAX_BATCH_TEXT_LENGTH = 48000
+SINGLE_OUTPUT_TOKENS = 3000
+MAX_BATCH_OUTPUT_TOKENS = 16000
+
+# Short correspondence is cheap to pack; policies are sent on their own
+PACKABLE_DOCUMENT_TYPES = {
+    'letter', 'communication', 'acknowledgement', 'acknowledgment_letter',
+    'rfi', 'request_for_information', 'ror', 'reservation_of_rights',
+    'rejection_letter', 'communication_letter', 'settlement',
+}
+SMALL_DOCUMENT_TOKENS = 2500
+
+# gpt-4o-mini list prices, used to attach an estimated cost to trace spans
+PROMPT_OVERHEAD_TOKENS = 2500
+INPUT_COST_PER_1M_TOKENS = 0.15
+OUTPUT_COST_PER_1M_TOKENS = 0.60
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token for English text)"""
+    return len(text) // 4 + 1
+
+
+def estimate_cost(input_chars: int, output_chars: int) -> float:
+    input_tokens = input_chars // 4 + PROMPT_OVERHEAD_TOKENS
+    output_tokens = output_chars // 4
+    return (input_tokens * INPUT_COST_PER_1M_TOKENS + output_tokens * OUTPUT_COST_PER_1M_TOKENS) / 1_000_000
+
+
+def estimate_request_tokens(documents: List[Dict]) -> int:
+    """Tokens an OpenAI call will be charged against the TPM budget (prompt + max_tokens)"""
+    input_tokens = sum(estimate_tokens(d['text']) for d in documents) + PROMPT_OVERHEAD_TOKENS
+    output_tokens = min(MAX_BATCH_OUTPUT_TOKENS, SINGLE_OUTPUT_TOKENS * len(documents))
+    return input_tokens + output_tokens
+
+
+def is_packable(document: Dict, small_document_tokens: int = SMALL_DOCUMENT_TOKENS) -> bool:
+    """Whether a document is small enough to share a request with others"""
+    tokens = estimate_tokens(document['text'])
+    if tokens > small_document_tokens:
+        return False
+    document_type = (document.get('document_type') or '').lower()
+    return not document_type or document_type in PACKABLE_DOCUMENT_TYPES
+
+
+def pack_documents(documents: List[Dict], token_budget: int = 6000,
+                   small_document_tokens: int = SMALL_DOCUMENT_TOKENS) -> List[List[Dict]]:
+    """Group documents into requests using first-fit decreasing under a token budget.
+
+    Large or non-packable documents always get a request of their own.
+    """
+    singles = []
+    packable = []
+    for document in documents:
+        if is_packable(document, small_document_tokens):
+            packable.append(document)
+        else:
+            singles.append([document])
+
+    packable.sort(key=lambda d: estimate_tokens(d['text']), reverse=True)
+    bins = []  # [tokens, chars, documents]
+    for document in packable:
+        tokens = estimate_tokens(document['text'])
+        chars = len(document['text'])
+        for bin_entry in bins:
+            if (bin_entry[0] + tokens <= token_budget
+                    and bin_entry[1] + chars <= MAX_BATCH_TEXT_LENGTH
+                    and len(bin_entry[2]) < MAX_BATCH_DOCUMENTS):
+                bin_entry[0] += tokens
+                bin_entry[1] += chars
+                bin_entry[2].append(document)
+                break
+        else:
+            bins.append([tokens, chars, [document]])
+
+    return singles + [bin_entry[2] for bin_entry in bins]
+
+
+class ExtractionClient:
+    def __init__(self, base_url: str = SUPABASE_URL, api_key: str = SUPABASE_ANON_KEY,
+                 token_budget: int = 6000, timeout: int = 120,
+                 rate_limiter: Optional[RateLimiter] = None, max_retries: int = 3):
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.token_budget = token_budget
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.requests_made = 0
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        # Each Supabase project has its own OpenAI key, so the project host is the bucket key
+        self.rate_limit_key = urlparse(self.base_url).netloc or 'default'
+
+    @property
+    def function_url(self) -> str:
+        return f"{self.base_url}{FUNCTION_PATH}"
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {'Content-Type': 'application/json'}
+        if self.api_key:
+            headers['Authorization'] = f'Bearer {self.api_key}'
+        return headers
+
+    def _post(self, payload: Dict) -> Dict:
+        documents = payload.get('documents') or [payload]
+        input_chars = sum(len(d['text']) for d in documents)
+        request_tokens = estimate_request_tokens(documents)
+
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter:
+                self.rate_limiter.acquire('openai', self.rate_limit_key, request_tokens)
+            self.requests_made += 1
+
+            with tracer.span('llm_request', documents=len(documents), chars=input_chars, attempt=attempt) as span:
+                response = self.session.post(self.function_url, headers=self._headers(),
+                                             json=payload, timeout=self.timeout)
+                span.set(status_code=response.status_code, bytes=len(response.content))
+                if self.rate_limiter:
+                    self.rate_limiter.observe_response('openai', self.rate_limit_key,
+                                                       response.status_code, response.headers)
+                if response.status_code == 429 and self.rate_limiter and attempt < self.max_retries:
+                    continue
+
+                result = response.json()
+                if response.status_code != 200:
+                    error = result.get('error', {})
+                    raise RuntimeError(f"{error.get('code', response.status_code)}: {error.get('message', response.text)}")
+                span.add_cost(estimate_cost(input_chars, len(response.content)))
+                return result
+
+    def extract(self, text: str) -> Dict:
+        """Extract fields from a single document"""
+        return self._post({'text': text})
+
+    async def stream_fields(self, text: str) -> AsyncIterator[Dict]:
+        """Stream extraction events for a single document as they arrive.
+
+        Yields {'type': 'field', 'field', 'value'} for each field as soon as the
+        model has produced it, then one {'type': 'complete', ...} event carrying
+        the same payload extract() returns. An {'type': 'error'} event raises.
+        """
+        if self.rate_limiter:
+            self.rate_limiter.acquire('openai', self.rate_limit_key, estimate_request_tokens([{'text': text}]))
+        self.requests_made += 1
+        start_ns = time.time_ns()
+        first_field_ns = None
+        received_bytes = 0
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with client.stream('POST', self.function_url, headers=self._headers(),
+                                     json={'text': text, 'stream': True}) as response:
+                if self.rate_limiter:
+                    self.rate_limiter.observe_response('openai', self.rate_limit_key,
+                                                       response.status_code, response.headers)
+                if response.status_code != 200:
+                    body = json.loads(await response.aread() or b'{}')
+                    error = body.get('error', {})
+                    raise RuntimeError(f"{error.get('code', response.status_code)}: {error.get('message', '')}")
+
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    received_bytes += len(line) + 1
+                    event = json.loads(line)
+                    if event.get('type') == 'error':
+                        error = event.get('error', {})
+                        raise RuntimeError(f"{error.get('code')}: {error.get('message')}")
+                    if event.get('type') == 'field' and first_field_ns is None:
+                        first_field_ns = time.time_ns()
+                    if event.get('type') == 'complete':
+                        span = tracer.record_span('llm_stream', start_ns, chars=len(text), bytes=received_bytes)
+                        span.add_cost(estimate_cost(len(text), received_bytes))
+                        if first_field_ns is not None:
+                            span.set(time_to_first_field_ms=round((first_field_ns - start_ns) / 1e6, 1))
+                    yield event
+
+    def extract_batch(self, documents: List[Dict]) -> Dict[str, Dict]:
+        """Extract fields from many documents, packing small ones into shared requests.
+
+        Each document is a dict with 'id', 'text' and optionally 'document_type'.
+        Returns per-document results keyed by id, in the same shape as extract().
+        """
+        ids = [document['id'] for document in documents]
+        if len(set(ids)) != len(ids):
+            raise ValueError("Document ids must be unique")
+
+        results = {}
+        for group in pack_documents(documents, self.token_budget):
+            if len(group) == 1:
+                document = group[0]
+                try:
+                    results[document['id']] = self.extract(document['text'])
+                except Exception as e:
+                    results[document['id']] = {'success': False, 'error': {'message': str(e)}}
+                continue
+
+            payload = {'documents': [{'id': d['id'], 'text': d['text']} for d in group]}
+            try:
+                response = self._post(payload)
+            except Exception as e:
+                for document in group:
+                    results[document['id']] = {'success': False, 'error': {'message': str(e)}}
+                continue
+
+            for item in response.get('results', []):
+                item = dict(item)
+                item['method'] = response.get('method')
+                item['confidence'] = response.get('confidence')
+                results[item.pop('id')] = item
+
+        return {doc_id: results.get(doc_id, {'success': False, 'error': {'message': 'No result returned'}})
+                for doc_id in ids}
+
+
+def load_documents(paths: List[str]) -> List[Dict]:
+    """Load plain-text documents, using the file stem as id"""
+    documents = []
+    for path in paths:
+        file_path = Path(path)
+        documents.append({
+            'id': file_path.stem,
+            'text': file_path.read_text(encoding='utf-8', errors='ignore'),
+        })
+    return documents
+
+
+def benchmark(client: ExtractionClient, documents: List[Dict]) -> Dict:
+    """Compare one-request-per-document against packed batch requests"""
+    client.requests_made = 0
+    start = time.perf_counter()
+    for document in documents:
+        try:
+            client.extract(document['text'])
+        except Exception as e:
+            print(f"❌ {document['id']}: {e}")
+    single_seconds = time.perf_counter() - start
+    single_requests = client.requests_made
+
+    client.requests_made = 0
+    start = time.perf_counter()
+    client.extract_batch(documents)
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        'documents': len(documents),
+        'single': {'requests': single_requests, 'seconds': round(single_seconds, 3)},
+        'batched': {'requests': client.requests_made, 'seconds': round(batch_seconds, 3)},
+    }
+
+
+async def print_stream(client: ExtractionClient, document: Dict):
+    """Print streamed fields with their arrival time, highlighting time-to-first-field"""
+    start = time.perf_counter()
+    first_field_seconds = None
+    async for event in client.stream_fields(document['text']):
+        elapsed = time.perf_counter() - start
+        if event['type'] == 'field':
+            if first_field_seconds is None:
+                first_field_seconds = elapsed
+            print(f"  {elapsed:6.2f}s  {event['field']}: {event['value']}")
+        elif event['type'] == 'complete':
+            print(f"✅ {event.get('fieldsExtracted', 0)} fields in {elapsed:.2f}s")
+
+    if first_field_seconds is not None:
+        print(f"⚡ Time to first field: {first_field_seconds:.2f}s")
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: extraction_client.py [--stream] <document.txt> [<document.txt> ...]")
+        print("Set SUPABASE_URL=http://127.0.0.1:8787 to benchmark against local_extraction_server.py")
+        return
+
+    client = ExtractionClient()
+
+    if sys.argv[1] == '--stream':
+        for document in load_documents(sys.argv[2:]):
+            print(f"📡 Streaming {document['id']} from {client.function_url}")
+            asyncio.run(print_stream(client, document))
+        return
+
+    documents = load_documents(sys.argv[1:])
+
+    print(f"📦 Benchmarking {len(documents)} documents against {client.function_url}")
+    results = benchmark(client, documents)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
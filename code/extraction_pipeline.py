@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Tiered Document Extraction Pipeline
+Python counterpart of hybridPdfExtractionService.ts: text layer -> OCR -> Google Vision -> LLM,
+with every tier recorded as a trace span
+"""
+
+import os
+import re
+import sys
+import base64
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import fitz  # PyMuPDF
+import requests
+
+from extraction_client import ExtractionClient, SUPABASE_URL, SUPABASE_ANON_KEY
+from extraction_tracing import tracer
+from rate_limiter import RateLimiter
+
+try:
+    import pytesseract
+    from PIL import Image
+except ImportError:
+    pytesseract = None
+
+SUPABASE_SERVICE_ROLE_KEY = os.environ.get("SUPABASE_SERVICE_ROLE_KEY", "")
+
+# Same early-exit thresholds as the TypeScript hybrid service
+GOOD_QUALITY_SCORE = 60
+HIGH_QUALITY_SCORE = 75
+VISION_MAX_BYTES = 4 * 1024 * 1024
+VISION_COST_PER_PAGE = 0.0015
+OCR_DPI = 200
+
+INSURANCE_KEYWORDS = [
+    'policy', 'insured', 'coverage', 'deductible', 'premium', 'liability',
+    'dwelling', 'property', 'effective', 'expiration', 'carrier', 'limit',
+    'insurance', 'claim', 'homeowners', 'auto', 'vehicle', 'accident',
+    'damage', 'loss', 'adjuster', 'agent', 'company', 'underwriter',
+    'mortgagee', 'named', 'perils', 'wind', 'hail', 'fire', 'theft'
+]
+
+
+def evaluate_text_quality(text: str) -> int:
+    """Port of HybridPDFExtractionService.evaluateTextQuality (0-100)"""
+    if not text or len(text) < 10:
+        return 0
+
+    clean_text = text.strip()
+    length = len(clean_text)
+    score = 0
+    for threshold, points in [(8000, 25), (4000, 22), (2000, 18), (1000, 15), (500, 12), (200, 8), (50, 5)]:
+        if length > threshold:
+            score += points
+            break
+
+    lower_text = clean_text.lower()
+    score += min(sum(1 for keyword in INSURANCE_KEYWORDS if keyword in lower_text) * 1.5, 35)
+
+    if re.search(r'[A-Z0-9\-]{5,25}', text):
+        score += 8
+    if re.search(r'\(?\d{3}\)?[\s\-]?\d{3}[\s\-]?\d{4}', text):
+        score += 5
+    if re.search(r'\d+\s+[\w\s]+(?:street|st|avenue|ave|road|rd|drive|dr|lane|ln|way|blvd|boulevard)', text, re.IGNORECASE):
+        score += 6
+    if re.search(r'\$[\d,]+', text):
+        score += 4
+    if re.search(r'\d{1,2}[/\-]\d{1,2}[/\-]\d{2,4}', text):
+        score += 2
+
+    if re.search(r'[A-Z][a-z]+\s+[A-Z][a-z]+', text):
+        score += 5
+    if '\n' in text:
+        score += 3
+    if ':' in text:
+        score += 4
+    if ',' in text:
+        score += 3
+
+    readable_ratio = len(re.findall(r'[a-zA-Z]', text)) / len(text)
+    if readable_ratio > 0.6:
+        score += 15
+    elif readable_ratio > 0.4:
+        score += 10
+    elif readable_ratio > 0.2:
+        score += 5
+
+    return int(min(score, 100))
+
+
+def normalize_text(text: str) -> str:
+    """Collapse layout whitespace and strip control characters before scoring"""
+    text = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', text)
+    text = re.sub(r'[ \t]+', ' ', text)
+    return re.sub(r'\n{3,}', '\n\n', text).strip()
+
+
+def validate_policy_data(policy_data: Dict, text: str) -> Dict:
+    """Flag extracted identifiers that do not appear in the source text"""
+    issues = []
+    for field in ('policyNumber', 'claimNumber'):
+        value = policy_data.get(field)
+        if value and value not in text:
+            issues.append(f"{field} '{value}' not found in document text")
+    for field in ('effectiveDate', 'expirationDate'):
+        value = policy_data.get(field)
+        if value and not re.search(r'\d', value):
+            issues.append(f"{field} '{value}' has no date digits")
+    return {'valid': not issues, 'issues': issues}
+
+
+class ExtractionPipeline:
+    def __init__(self, client: Optional[ExtractionClient] = None, supabase_url: str = SUPABASE_URL,
+                 anon_key: str = SUPABASE_ANON_KEY, service_role_key: str = SUPABASE_SERVICE_ROLE_KEY,
+                 rate_limiter: Optional[RateLimiter] = None):
+        self.rate_limiter = rate_limiter
+        self.client = client or ExtractionClient(supabase_url, anon_key, rate_limiter=rate_limiter)
+        self.supabase_url = supabase_url.rstrip('/')
+        self.rate_limit_key = urlparse(self.supabase_url).netloc or 'default'
+        self.anon_key = anon_key
+        self.service_role_key = service_role_key
+
+    def extract_text_layer(self, pdf: fitz.Document) -> str:
+        with tracer.span('text_layer', pages=pdf.page_count) as span:
+            text = '\n'.join(page.get_text() for page in pdf)
+            span.set(chars=len(text))
+            return text
+
+    def run_ocr(self, pdf: fitz.Document) -> str:
+        with tracer.span('ocr', pages=pdf.page_count) as span:
+            if pytesseract is None:
+                span.set(skipped='pytesseract not installed')
+                return ''
+            pages = []
+            for page in pdf:
+                pixmap = page.get_pixmap(dpi=OCR_DPI)
+                image = Image.frombytes('RGB', (pixmap.width, pixmap.height), pixmap.samples)
+                pages.append(pytesseract.image_to_string(image))
+            text = '\n'.join(pages)
+            span.set(chars=len(text))
+            return text
+
+    def run_vision(self, pdf: fitz.Document, file_name: str) -> str:
+        with tracer.span('vision', pages=1) as span:
+            # The edge function annotates a single image, so only the first page is sent
+            image_bytes = pdf[0].get_pixmap(dpi=OCR_DPI).tobytes('png')
+            span.set(bytes=len(image_bytes))
+            if self.rate_limiter:
+                span.set(rate_limit_wait_s=round(self.rate_limiter.acquire('google_vision', self.rate_limit_key), 3))
+            response = requests.post(
+                f"{self.supabase_url}/functions/v1/google-vision-extract",
+                headers={'Authorization': f'Bearer {self.anon_key}', 'Content-Type': 'application/json'},
+                json={'imageData': base64.b64encode(image_bytes).decode('ascii'), 'fileName': file_name},
+                timeout=35,
+            )
+            if self.rate_limiter:
+                self.rate_limiter.observe_response('google_vision', self.rate_limit_key,
+                                                   response.status_code, response.headers)
+            span.add_cost(VISION_COST_PER_PAGE)
+            if response.status_code != 200:
+                raise RuntimeError(f"Google Vision error: {response.status_code}")
+            text = response.json().get('text', '')
+            span.set(chars=len(text))
+            return text
+
+    def write_results(self, document_id: str, text: str, policy_data: Dict):
+        with tracer.span('db_write', document_id=document_id) as span:
+            payload = {'ai_extracted_text': text, 'ai_entities': policy_data}
+            response = requests.patch(
+                f"{self.supabase_url}/rest/v1/documents?id=eq.{document_id}",
+                headers={
+                    'apikey': self.service_role_key,
+                    'Authorization': f'Bearer {self.service_role_key}',
+                    'Content-Type': 'application/json',
+                    'Prefer': 'return=minimal',
+                },
+                json=payload,
+                timeout=30,
+            )
+            span.set(status_code=response.status_code)
+            if response.status_code >= 300:
+                raise RuntimeError(f"Document update failed: {response.status_code} {response.text[:200]}")
+
+    def process(self, file_path: str, document_id: Optional[str] = None) -> Dict:
+        """Run every tier for one PDF; tiers after the text layer only run when quality is low"""
+        path = Path(file_path)
+        with tracer.span('extract_document', file=path.name) as root:
+            with tracer.span('file_read') as span:
+                data = path.read_bytes()
+                span.set(bytes=len(data))
+
+            pdf = fitz.open(stream=data, filetype='pdf')
+            root.set(pages=pdf.page_count, bytes=len(data))
+            methods_attempted = ['text-layer']
+
+            raw_text = self.extract_text_layer(pdf)
+            with tracer.span('preprocessing') as span:
+                text = normalize_text(raw_text)
+                quality = evaluate_text_quality(text)
+                span.set(quality=quality, chars=len(text))
+            method = 'text-layer'
+
+            if quality < HIGH_QUALITY_SCORE:
+                methods_attempted.append('ocr')
+                try:
+                    ocr_text = normalize_text(self.run_ocr(pdf))
+                    ocr_quality = evaluate_text_quality(ocr_text)
+                    if ocr_quality > quality:
+                        text, quality, method = ocr_text, ocr_quality, 'ocr'
+                except Exception as e:
+                    print(f"⚠️ OCR failed: {e}")
+
+            if quality < GOOD_QUALITY_SCORE and len(data) <= VISION_MAX_BYTES:
+                methods_attempted.append('google-vision')
+                try:
+                    vision_text = normalize_text(self.run_vision(pdf, path.name))
+                    vision_quality = evaluate_text_quality(vision_text)
+                    if vision_quality > quality:
+                        text, quality, method = vision_text, vision_quality, 'google-vision'
+                except Exception as e:
+                    print(f"⚠️ Google Vision failed: {e}")
+
+            with tracer.span('llm', chars=len(text)):
+                result = self.client.extract(text)
+            policy_data = result.get('policyData', {})
+
+            with tracer.span('validation') as span:
+                validation = validate_policy_data(policy_data, text)
+                span.set(valid=validation['valid'], issues=len(validation['issues']))
+
+            if document_id:
+                self.write_results(document_id, text, policy_data)
+
+            cost = sum(s.attributes.get('cost_usd', 0.0) for s in tracer.finished_spans
+                       if s.trace_id == root.trace_id)
+            # Its own key: summaries sum cost_usd over every span, root included
+            root.set(method=method, quality=quality, total_cost_usd=round(cost, 6))
+
+            return {
+                'extractedText': text,
+                'processingMethod': method,
+                'qualityScore': quality,
+                'policyData': policy_data,
+                'validation': validation,
+                'cost': cost,
+                'metadata': {
+                    'pageCount': pdf.page_count,
+                    'fileSize': len(data),
+                    'fileName': path.name,
+                    'methodsAttempted': methods_attempted,
+                },
+            }
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: extraction_pipeline.py <document.pdf> [<document.pdf> ...]")
+        return
+
+    pipeline = ExtractionPipeline(rate_limiter=RateLimiter())
+    for file_path in sys.argv[1:]:
+        try:
+            result = pipeline.process(file_path)
+            print(f"✅ {Path(file_path).name}: {result['processingMethod']}, quality {result['qualityScore']}, "
+                  f"{len([v for v in result['policyData'].values() if v])} fields")
+        except Exception as e:
+            print(f"❌ {Path(file_path).name}: {e}")
+
+    trace_file = tracer.export_otlp()
+    print(f"🧵 Traces written to {trace_file}")
+    print(f"🔥 Flame graph: python code/extraction_tracing.py {trace_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Extraction Pipeline Tracing
+Records nested spans for each extraction tier, exports them as OTLP-compatible JSON
+and renders a flame graph with the critical path of any traced document
+"""
+
+import os
+import sys
+import json
+import time
+import secrets
+import contextvars
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+DEFAULT_TRACE_FILE = os.environ.get("EXTRACTION_TRACE_FILE", "/workspace/extraction_traces.json")
+SERVICE_NAME = "claimguru-extraction"
+
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+
+class Span:
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = dict(attributes)
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.status = 'ok'
+        self.error = None
+
+    def set(self, **attributes):
+        """Attach attributes such as pages, bytes or cost_usd to the span"""
+        self.attributes.update(attributes)
+
+    def add_cost(self, cost_usd: float):
+        self.attributes['cost_usd'] = round(self.attributes.get('cost_usd', 0.0) + cost_usd, 6)
+
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e6
+
+
+class Tracer:
+    def __init__(self):
+        self.finished_spans: List[Span] = []
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span]:
+        """Open a span nested under the current one (or start a new trace)"""
+        parent = _current_span.get()
+        trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        span = Span(name, trace_id, parent.span_id if parent else None, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except Exception as e:
+            span.status = 'error'
+            span.error = str(e)
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current_span.reset(token)
+            self.finished_spans.append(span)
+
+    def record_span(self, name: str, start_ns: int, **attributes) -> Span:
+        """Record an already-finished child of the current span.
+
+        Used where a context manager cannot wrap the work, e.g. around an async
+        generator whose consumer runs its own spans between yields.
+        """
+        parent = _current_span.get()
+        span = Span(name, parent.trace_id if parent else secrets.token_hex(16),
+                    parent.span_id if parent else None, attributes)
+        span.start_ns = start_ns
+        span.end_ns = time.time_ns()
+        self.finished_spans.append(span)
+        return span
+
+    def current_span(self) -> Optional[Span]:
+        return _current_span.get()
+
+    def export_otlp(self, output_file: str = DEFAULT_TRACE_FILE) -> Path:
+        """Append finished spans to an OTLP/JSON trace file and clear them"""
+        output_path = Path(output_file)
+        spans = load_spans(output_path) if output_path.exists() else []
+        spans.extend(self.finished_spans)
+        output_path.write_text(json.dumps(spans_to_otlp(spans), indent=2))
+        self.finished_spans = []
+        return output_path
+
+
+tracer = Tracer()
+
+
+def _otlp_value(value) -> Dict:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def _python_value(value: Dict):
+    if 'boolValue' in value:
+        return value['boolValue']
+    if 'intValue' in value:
+        return int(value['intValue'])
+    if 'doubleValue' in value:
+        return float(value['doubleValue'])
+    return value.get('stringValue')
+
+
+def spans_to_otlp(spans: List[Span]) -> Dict:
+    """Encode spans in the OTLP/JSON ExportTraceServiceRequest layout"""
+    otlp_spans = []
+    for span in spans:
+        otlp_span = {
+            'traceId': span.trace_id,
+            'spanId': span.span_id,
+            'name': span.name,
+            'kind': 1,
+            'startTimeUnixNano': str(span.start_ns),
+            'endTimeUnixNano': str(span.end_ns),
+            'attributes': [{'key': k, 'value': _otlp_value(v)} for k, v in span.attributes.items()],
+            'status': {'code': 2, 'message': span.error} if span.status == 'error' else {'code': 1},
+        }
+        if span.parent_id:
+            otlp_span['parentSpanId'] = span.parent_id
+        otlp_spans.append(otlp_span)
+
+    return {
+        'resourceSpans': [{
+            'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': SERVICE_NAME}}]},
+            'scopeSpans': [{'scope': {'name': 'extraction_tracing'}, 'spans': otlp_spans}],
+        }]
+    }
+
+
+def load_spans(trace_file: Path) -> List[Span]:
+    """Load spans back from an OTLP/JSON trace file"""
+    data = json.loads(Path(trace_file).read_text())
+    spans = []
+    for resource_spans in data.get('resourceSpans', []):
+        for scope_spans in resource_spans.get('scopeSpans', []):
+            for otlp_span in scope_spans.get('spans', []):
+                attributes = {a['key']: _python_value(a['value']) for a in otlp_span.get('attributes', [])}
+                span = Span(otlp_span['name'], otlp_span['traceId'], otlp_span.get('parentSpanId'), attributes)
+                span.span_id = otlp_span['spanId']
+                span.start_ns = int(otlp_span['startTimeUnixNano'])
+                span.end_ns = int(otlp_span['endTimeUnixNano'])
+                if otlp_span.get('status', {}).get('code') == 2:
+                    span.status = 'error'
+                    span.error = otlp_span['status'].get('message')
+                spans.append(span)
+    return spans
+
+
+def group_traces(spans: List[Span]) -> Dict[str, List[Span]]:
+    traces = {}
+    for span in spans:
+        traces.setdefault(span.trace_id, []).append(span)
+    return traces
+
+
+def _children_index(spans: List[Span]) -> Dict[Optional[str], List[Span]]:
+    children = {}
+    for span in spans:
+        children.setdefault(span.parent_id, []).append(span)
+    return children
+
+
+def critical_path(spans: List[Span]) -> List[Span]:
+    """Spans that determine the end-to-end latency of a trace.
+
+    Walks back from the root's end: the last child to finish is on the path,
+    then the last child to finish before that one started, and so on.
+    """
+    children = _children_index(spans)
+    roots = children.get(None, [])
+    if not roots:
+        return []
+
+    def walk(span: Span) -> List[Span]:
+        path = [span]
+        cursor = span.end_ns
+        for child in sorted(children.get(span.span_id, []), key=lambda s: s.end_ns, reverse=True):
+            if child.end_ns <= cursor:
+                path.extend(walk(child))
+                cursor = child.start_ns
+        return path
+
+    path = walk(max(roots, key=lambda s: s.end_ns - s.start_ns))
+    return sorted(path, key=lambda s: s.start_ns)
+
+
+def folded_stacks(spans: List[Span]) -> List[str]:
+    """Brendan Gregg folded-stack lines (self time in microseconds)"""
+    by_id = {span.span_id: span for span in spans}
+    children = _children_index(spans)
+    lines = []
+    for span in spans:
+        stack = []
+        node = span
+        while node:
+            stack.append(node.name)
+            node = by_id.get(node.parent_id)
+        child_ns = sum(c.end_ns - c.start_ns for c in children.get(span.span_id, []))
+        self_us = max(0, (span.end_ns - span.start_ns - child_ns) // 1000)
+        lines.append(f"{';'.join(reversed(stack))} {self_us}")
+    return lines
+
+
+def render_flame_graph(spans: List[Span], output_file: Path, width: int = 1200) -> Path:
+    """Render a trace as a time-ordered flame graph SVG, critical path highlighted"""
+    by_id = {span.span_id: span for span in spans}
+    on_path = {span.span_id for span in critical_path(spans)}
+    trace_start = min(span.start_ns for span in spans)
+    trace_end = max(span.end_ns for span in spans)
+    total_ns = max(trace_end - trace_start, 1)
+
+    def depth(span: Span) -> int:
+        level = 0
+        while span.parent_id in by_id:
+            span = by_id[span.parent_id]
+            level += 1
+        return level
+
+    row_height = 20
+    max_depth = max(depth(span) for span in spans)
+    height = (max_depth + 1) * row_height + 40
+    rects = []
+    for span in sorted(spans, key=lambda s: s.start_ns):
+        x = (span.start_ns - trace_start) / total_ns * width
+        w = max((span.end_ns - span.start_ns) / total_ns * width, 1)
+        y = 30 + depth(span) * row_height
+        fill = '#e4572e' if span.span_id in on_path else '#f3a712'
+        if span.status == 'error':
+            fill = '#7b2cbf'
+        details = ', '.join(f"{k}={v}" for k, v in span.attributes.items())
+        label = f"{span.name} ({span.duration_ms:.0f}ms)"
+        rects.append(
+            f'<g><title>{_escape(label)} {_escape(details)}</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{row_height - 2}" fill="{fill}" rx="2"/>'
+            f'<text x="{x + 3:.1f}" y="{y + 14}" font-size="11" font-family="monospace">'
+            f'{_escape(label) if w > 60 else ""}</text></g>'
+        )
+
+    svg = (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}">'
+        f'<text x="4" y="18" font-size="13" font-family="sans-serif">'
+        f'Trace {spans[0].trace_id} — {total_ns / 1e6:.0f}ms (critical path in red)</text>'
+        + ''.join(rects) + '</svg>'
+    )
+    output_file = Path(output_file)
+    output_file.write_text(svg)
+    return output_file
+
+
+def _escape(text: str) -> str:
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def print_trace_summary(spans: List[Span]):
+    path = critical_path(spans)
+    root = path[0]
+    total_cost = sum(span.attributes.get('cost_usd', 0.0) for span in spans)
+    print(f"🧵 Trace {root.trace_id}: {root.name} {root.duration_ms:.0f}ms, cost ${total_cost:.4f}")
+    print("🔥 Critical path:")
+    for span in path:
+        details = ', '.join(f"{k}={v}" for k, v in span.attributes.items())
+        marker = '❌' if span.status == 'error' else '•'
+        print(f"   {marker} {span.name:<24} {span.duration_ms:9.1f}ms  {details}")
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: extraction_tracing.py <traces.json> [trace_id] [--svg out.svg] [--folded]")
+        return
+
+    spans = load_spans(Path(sys.argv[1]))
+    traces = group_traces(spans)
+    if not traces:
+        print("No spans found")
+        return
+
+    args = sys.argv[2:]
+    trace_id = next((a for a in args if not a.startswith('--') and not a.endswith('.svg')), None)
+    if trace_id is None:
+        # Default to the slowest trace in the file
+        trace_id = max(traces, key=lambda t: max(s.end_ns for s in traces[t]) - min(s.start_ns for s in traces[t]))
+    trace_spans = traces[trace_id]
+
+    print_trace_summary(trace_spans)
+
+    if '--folded' in args:
+        print('\n'.join(folded_stacks(trace_spans)))
+
+    svg_file = args[args.index('--svg') + 1] if '--svg' in args else f"flame_{trace_id[:8]}.svg"
+    print(f"📄 Flame graph: {render_flame_graph(trace_spans, Path(svg_file))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Shared Filesystem Inventory
+One parallel scandir walk records path, size, mtime and (on demand) content hash for
+every file, persisted so later runs and other tools only re-stat and rehash what changed
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import hashlib
+from bisect import bisect_left
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_INVENTORY_DB = os.environ.get("FILE_INVENTORY_DB", "/workspace/.file_inventory.sqlite")
+# Never worth walking: dependencies and VCS internals dwarf everything the tools look at
+INVENTORY_SKIP_DIRS = frozenset({'node_modules', '.git'})
+HASH_CHUNK_BYTES = 1024 * 1024
+SQLITE_BATCH = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    hash TEXT
+)
+"""
+
+
+def file_hash(path: str) -> str:
+    """Same digest as analysis_cache.content_hash, streamed so large files are not loaded whole"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _scan_directory(directory: str, skip_dirs: frozenset) -> Tuple[Dict[str, Tuple[int, int]], List[str]]:
+    files, subdirs = {}, []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in skip_dirs:
+                            subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        stat = entry.stat(follow_symlinks=False)
+                        files[entry.path] = (stat.st_size, stat.st_mtime_ns)
+                except OSError:
+                    # Vanished or unreadable between listing and stat
+                    continue
+    except OSError:
+        pass
+    return files, subdirs
+
+
+def _walk(root: str, skip_dirs: frozenset, workers: int) -> Dict[str, Tuple[int, int]]:
+    """(size, mtime_ns) of every file below root, scanning each directory level in parallel"""
+    scanned: Dict[str, Tuple[int, int]] = {}
+    level = [root] if os.path.isdir(root) else []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while level:
+            next_level = []
+            for files, subdirs in pool.map(_scan_directory, level, [skip_dirs] * len(level)):
+                scanned.update(files)
+                next_level.extend(subdirs)
+            level = next_level
+    return scanned
+
+
+def tree_totals(directory, workers: Optional[int] = None) -> Tuple[int, int]:
+    """(file count, bytes) of a whole tree, node_modules included, for reporting what a deletion frees"""
+    scanned = _walk(os.path.abspath(os.fspath(directory)), frozenset(), workers or min(32, (os.cpu_count() or 1) * 4))
+    return len(scanned), sum(size for size, _ in scanned.values())
+
+
+class InventoryEntry:
+    __slots__ = ('path', 'size', 'mtime_ns', 'hash')
+
+    def __init__(self, path: str, size: int, mtime_ns: int, hash: Optional[str]):
+        self.path = Path(path)
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.hash = hash
+
+
+class FileInventory:
+    """Size, mtime and content hash of every file below the directories asked about.
+
+    A directory is walked the first time a query touches it in this process;
+    the walk stats everything but only rehashes files whose size or mtime
+    moved since the stored snapshot. Tools that delete or rewrite files call
+    forget() or refresh() so later queries in the same run see the change.
+    """
+
+    def __init__(self, db_path: Optional[str] = DEFAULT_INVENTORY_DB, workers: Optional[int] = None,
+                 skip_dirs: Iterable[str] = INVENTORY_SKIP_DIRS):
+        self.db_path = Path(db_path) if db_path and db_path != 'off' else None
+        # Directory scans are syscall-bound and release the GIL, so threads overlap them
+        self.workers = workers or min(32, (os.cpu_count() or 1) * 4)
+        self.skip_dirs = frozenset(skip_dirs)
+        self._entries: Dict[str, List] = {}
+        self._sorted_paths: Optional[List[str]] = None
+        self._fresh: List[str] = []
+        self.last_refresh: Dict = {}
+        if self.db_path:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = self._connect()
+            try:
+                conn.execute(SCHEMA)
+                for path, size, mtime_ns, digest in conn.execute("SELECT path, size, mtime_ns, hash FROM files"):
+                    self._entries[path] = [size, mtime_ns, digest]
+            finally:
+                conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _persist(self, upserts: List[Tuple[str, int, int, Optional[str]]], deletions: List[str]):
+        if not self.db_path or not (upserts or deletions):
+            return
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN")
+            for start in range(0, len(deletions), SQLITE_BATCH):
+                conn.executemany("DELETE FROM files WHERE path = ?",
+                                 [(path,) for path in deletions[start:start + SQLITE_BATCH]])
+            for start in range(0, len(upserts), SQLITE_BATCH):
+                conn.executemany("INSERT OR REPLACE INTO files (path, size, mtime_ns, hash) VALUES (?, ?, ?, ?)",
+                                 upserts[start:start + SQLITE_BATCH])
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _key(path) -> str:
+        return os.path.abspath(os.fspath(path))
+
+    def _subtree(self, root: str) -> List[str]:
+        """Stored paths under root, via bisect over the sorted path list"""
+        if self._sorted_paths is None:
+            self._sorted_paths = sorted(self._entries)
+        prefix = root.rstrip(os.sep) + os.sep
+        start = bisect_left(self._sorted_paths, prefix)
+        # os.sep + 1 sorts directly after every path that continues with a separator
+        end = bisect_left(self._sorted_paths, prefix[:-1] + chr(ord(os.sep) + 1), start)
+        return self._sorted_paths[start:end]
+
+    def _is_fresh(self, root: str) -> bool:
+        return any(root == fresh or root.startswith(fresh.rstrip(os.sep) + os.sep) for fresh in self._fresh)
+
+    def refresh(self, directory, hashes: bool = False) -> Dict:
+        """Re-walk one directory tree and sync the stored snapshot with it"""
+        root = self._key(directory)
+        start = time.perf_counter()
+        scanned = _walk(root, self.skip_dirs, self.workers)
+
+        upserts = []
+        for path, (size, mtime_ns) in scanned.items():
+            known = self._entries.get(path)
+            if known is None or known[0] != size or known[1] != mtime_ns:
+                self._entries[path] = [size, mtime_ns, None]
+                upserts.append((path, size, mtime_ns, None))
+        removed = [path for path in self._subtree(root) if path not in scanned]
+        for path in removed:
+            del self._entries[path]
+        if upserts or removed:
+            self._sorted_paths = None
+        self._persist(upserts, removed)
+
+        self._fresh = [fresh for fresh in self._fresh if not fresh.startswith(root.rstrip(os.sep) + os.sep)]
+        self._fresh.append(root)
+        if hashes:
+            self.hash_files(Path(path) for path in scanned)
+        self.last_refresh = {'root': root, 'files': len(scanned), 'changed': len(upserts), 'removed': len(removed),
+                             'seconds': round(time.perf_counter() - start, 3)}
+        return self.last_refresh
+
+    def ensure(self, directory):
+        """Walk directory unless it (or an ancestor) was already walked in this process"""
+        if not self._is_fresh(self._key(directory)):
+            self.refresh(directory)
+
+    def forget(self, path):
+        """Drop a deleted file or directory without re-walking"""
+        key = self._key(path)
+        removed = [key] if key in self._entries else []
+        removed += self._subtree(key)
+        for stale in removed:
+            del self._entries[stale]
+        if removed:
+            self._sorted_paths = None
+        self._persist([], removed)
+
+    def entries(self, directory, extensions: Optional[Tuple[str, ...]] = None,
+                skip_dirs: Iterable[str] = ()) -> List[InventoryEntry]:
+        """Files under directory, optionally limited by suffix and excluding any path through skip_dirs"""
+        root = self._key(directory)
+        self.ensure(root)
+        skip_dirs = set(skip_dirs)
+        found = []
+        for path in self._subtree(root):
+            if extensions and not path.endswith(extensions):
+                continue
+            if skip_dirs and skip_dirs.intersection(path[len(root) + 1:].split(os.sep)[:-1]):
+                continue
+            found.append(InventoryEntry(path, *self._entries[path]))
+        return found
+
+    def files(self, directory, extensions: Optional[Tuple[str, ...]] = None,
+              skip_dirs: Iterable[str] = ()) -> List[Path]:
+        """Paths joined onto directory as given, so relative or resolved roots keep their form"""
+        base, offset = Path(directory), len(self._key(directory).rstrip(os.sep)) + 1
+        return [base / str(entry.path)[offset:] for entry in self.entries(directory, extensions, skip_dirs)]
+
+    def exists(self, path) -> bool:
+        key = self._key(path)
+        self.ensure(os.path.dirname(key))
+        return key in self._entries
+
+    def directory_size(self, directory) -> int:
+        """Bytes of the inventoried files, so skip_dirs are left out; see tree_totals for deletions"""
+        return sum(entry.size for entry in self.entries(directory))
+
+    def file_count(self, directory) -> int:
+        return len(self.entries(directory))
+
+    def hash_files(self, paths: Iterable) -> Dict[Path, str]:
+        """Content hashes, computing (in parallel) only those not stored for the current size and mtime"""
+        keys = [self._key(path) for path in paths]
+        for key in keys:
+            if key not in self._entries:
+                self.ensure(os.path.dirname(key))
+        missing = [key for key in keys if key in self._entries and self._entries[key][2] is None]
+
+        def compute(key: str) -> Optional[str]:
+            try:
+                return file_hash(key)
+            except OSError:
+                return None
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                digests = list(pool.map(compute, missing))
+            upserts = []
+            for key, digest in zip(missing, digests):
+                if digest is not None:
+                    self._entries[key][2] = digest
+                    upserts.append((key, self._entries[key][0], self._entries[key][1], digest))
+            self._persist(upserts, [])
+        return {Path(key): self._entries[key][2] for key in keys if key in self._entries}
+
+    def content_hash(self, path) -> Optional[str]:
+        return self.hash_files([path]).get(Path(self._key(path)))
+
+
+_shared: Dict[str, FileInventory] = {}
+
+
+def open_inventory(db_path: Optional[str] = DEFAULT_INVENTORY_DB) -> FileInventory:
+    """Process-wide inventory so every tool in one run shares a single walk; FILE_INVENTORY_DB=off keeps it in memory"""
+    key = db_path or 'off'
+    if key not in _shared:
+        _shared[key] = FileInventory(db_path)
+    return _shared[key]
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    root = Path(args[0] if args else "/workspace").resolve()
+    inventory = open_inventory()
+    stats = inventory.refresh(root, hashes='--hashes' in sys.argv)
+    print(f"🗂️ {stats['files']} files under {root} in {stats['seconds']}s "
+          f"({stats['changed']} changed, {stats['removed']} removed since last scan)")
+
+    sizes: Dict[str, List[int]] = {}
+    for entry in inventory.entries(root):
+        top = entry.path.relative_to(root).parts[0]
+        totals = sizes.setdefault(top, [0, 0])
+        totals[0] += entry.size
+        totals[1] += 1
+    print("📦 Largest entries:")
+    for name, (size, count) in sorted(sizes.items(), key=lambda item: -item[1][0])[:15]:
+        print(f"   {size / (1024 * 1024):8.1f} MB  {count:6d} files  {name}")
+
+
+if __name__ == "__main__":
+    main()
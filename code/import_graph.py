@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+ClaimGuru Import Graph Engine
+Resolves every import in src/ the way Vite does (relative paths, the @/ alias,
+extensions, index barrels, lazy import()) and computes which modules are
+reachable from the application entry points
+"""
+
+import os
+import re
+import sys
+import json
+from pathlib import Path
+from collections import defaultdict, deque
+from typing import Dict, List, Optional, Set, Tuple
+
+from analysis_cache import AnalysisCache, open_cache
+from file_inventory import open_inventory
+from source_index import SourceFile, SourceIndex
+
+RESOLVE_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx', '.mjs', '.json')
+INDEX_FILES = tuple(f"index{ext}" for ext in RESOLVE_EXTENSIONS)
+SCRIPT_SRC_PATTERN = re.compile(r'<script[^>]*type=["\']module["\'][^>]*src=["\']([^"\']+)["\']')
+VITE_ALIAS_PATTERN = re.compile(r'["\']?([@~\w/$-]+)["\']?\s*:\s*path\.resolve\(\s*__dirname\s*,\s*["\']([^"\']+)["\']\s*\)')
+TEST_FILE_PATTERN = re.compile(r'(\.test\.|\.spec\.|/__tests__/|^test/|/test/)')
+
+
+def package_name(specifier: str) -> str:
+    """npm package a bare specifier belongs to (@scope/pkg/sub -> @scope/pkg, pkg/sub -> pkg)"""
+    parts = specifier.split('/')
+    if specifier.startswith('@') and len(parts) > 1:
+        return '/'.join(parts[:2])
+    return parts[0]
+
+
+def _strip_json_comments(text: str) -> str:
+    text = re.sub(r'/\*.*?\*/', '', text, flags=re.DOTALL)
+    text = re.sub(r'(^|[^:"])//[^\n]*', r'\1', text)
+    return re.sub(r',(\s*[}\]])', r'\1', text)
+
+
+def load_aliases(project_root: Path) -> Dict[str, Path]:
+    """Module aliases from vite.config.ts and the tsconfig `paths` of the project"""
+    aliases = {}
+    for config_name in ('vite.config.ts', 'vite.config.js'):
+        config = project_root / config_name
+        if config.exists():
+            for alias, target in VITE_ALIAS_PATTERN.findall(config.read_text(encoding='utf-8')):
+                aliases[alias] = (project_root / target).resolve()
+
+    for tsconfig_name in ('tsconfig.json', 'tsconfig.app.json'):
+        tsconfig = project_root / tsconfig_name
+        if not tsconfig.exists():
+            continue
+        try:
+            options = json.loads(_strip_json_comments(tsconfig.read_text(encoding='utf-8'))).get('compilerOptions', {})
+        except json.JSONDecodeError:
+            continue
+        base_url = project_root / options.get('baseUrl', '.')
+        for pattern, targets in options.get('paths', {}).items():
+            if pattern.endswith('/*') and targets:
+                aliases.setdefault(pattern[:-2], (base_url / targets[0].rstrip('*').rstrip('/')).resolve())
+    return aliases
+
+
+class ImportGraph:
+    """Resolved module graph of a Vite project.
+
+    Nodes are absolute file paths under src/. Edges carry the import kind
+    (static, side-effect, dynamic, require, reexport) so callers can tell lazy
+    route chunks apart from eagerly loaded code.
+    """
+
+    def __init__(self, project_root: str, index: Optional[SourceIndex] = None,
+                 aliases: Optional[Dict[str, Path]] = None, cache: Optional[AnalysisCache] = None):
+        self.project_root = Path(project_root).resolve()
+        self.src_root = self.project_root / "src"
+        self.index = index or SourceIndex(self.src_root, cache=cache)
+        self.aliases = aliases if aliases is not None else load_aliases(self.project_root)
+        # Longest alias first so '@/components' style aliases win over '@'
+        self._alias_order = sorted(self.aliases, key=len, reverse=True)
+
+        self.edges: Dict[Path, List[Tuple[Path, str]]] = defaultdict(list)
+        self.importers: Dict[Path, Set[Path]] = defaultdict(set)
+        self.external_imports: Dict[Path, Set[str]] = defaultdict(set)
+        self.unresolved: Dict[Path, List[str]] = defaultdict(list)
+        # Index path -> resolved module path, so repeated analyses skip realpath syscalls
+        self._resolved: Dict[Path, Path] = {}
+        self._existing_files = self._scan_files()
+        self._build()
+
+    def _scan_files(self) -> Set[Path]:
+        """Every file under src/, so resolution is set lookups rather than stat calls"""
+        return set(open_inventory().files(self.src_root))
+
+    def _module(self, source_file: SourceFile) -> Path:
+        module = self._resolved.get(source_file.path)
+        if module is None:
+            module = self._resolved[source_file.path] = source_file.path.resolve()
+        return module
+
+    @property
+    def modules(self) -> List[Path]:
+        return [self._module(source_file) for source_file in self.index]
+
+    def _try_file(self, base: Path) -> Optional[Path]:
+        if base in self._existing_files:
+            return base
+        for ext in RESOLVE_EXTENSIONS:
+            candidate = base.with_name(base.name + ext)
+            if candidate in self._existing_files:
+                return candidate
+        # TypeScript ESM style: './foo.js' refers to foo.ts
+        if base.suffix in ('.js', '.jsx'):
+            for ext in ('.ts', '.tsx'):
+                candidate = base.with_suffix(ext)
+                if candidate in self._existing_files:
+                    return candidate
+        for index_file in INDEX_FILES:
+            candidate = base / index_file
+            if candidate in self._existing_files:
+                return candidate
+        return None
+
+    def resolve(self, specifier: str, importer: Path) -> Optional[Path]:
+        """Absolute path a specifier points to, or None for packages and unresolvable imports"""
+        specifier = specifier.split('?')[0]
+        if specifier.startswith('.'):
+            base = importer.parent / specifier
+        elif specifier.startswith('/'):
+            base = self.project_root / specifier.lstrip('/')
+        else:
+            for alias in self._alias_order:
+                if specifier == alias or specifier.startswith(alias + '/'):
+                    base = self.aliases[alias] / specifier[len(alias):].lstrip('/')
+                    break
+            else:
+                return None
+        return self._try_file(Path(os.path.normpath(base)))
+
+    def is_external(self, specifier: str) -> bool:
+        if specifier.startswith(('.', '/')):
+            return False
+        return not any(specifier == alias or specifier.startswith(alias + '/') for alias in self._alias_order)
+
+    def _link(self, source_file: SourceFile):
+        module = self._module(source_file)
+        for specifier, kind in source_file.imports:
+            if self.is_external(specifier):
+                self.external_imports[module].add(specifier)
+                continue
+            target = self.resolve(specifier, module)
+            if target is None:
+                self.unresolved[module].append(specifier)
+                continue
+            self.edges[module].append((target, kind))
+            self.importers[target].add(module)
+
+    def _unlink(self, module: Path):
+        for target, _ in self.edges.pop(module, ()):
+            importers = self.importers.get(target)
+            if importers is not None:
+                importers.discard(module)
+                if not importers:
+                    del self.importers[target]
+        self.external_imports.pop(module, None)
+        self.unresolved.pop(module, None)
+
+    def _build(self):
+        for source_file in self.index:
+            self._link(source_file)
+
+    def update(self, paths: List[Path]) -> Set[Path]:
+        """Refresh the index and edges for files that changed on disk; returns every module relinked.
+
+        Edits only relink the edited modules. Files appearing or disappearing can
+        change how other modules resolve, so their importers and every module with
+        unresolved imports are relinked as well.
+        """
+        relink = set()
+        created_or_deleted = False
+        for path in paths:
+            path = Path(path)
+            module = path.resolve()
+            if not module.is_relative_to(self.src_root):
+                continue
+            existed = module in self._existing_files
+            if path.exists():
+                self._existing_files.add(module)
+            else:
+                self._existing_files.discard(module)
+            if existed != (module in self._existing_files):
+                created_or_deleted = True
+                relink.update(self.importers.get(module, ()))
+            if path.suffix in self.index.extensions:
+                indexed_path = self.index.root / module.relative_to(self.src_root)
+                if self.index.update(indexed_path) is None:
+                    self._resolved.pop(indexed_path, None)
+            relink.add(module)
+        if created_or_deleted:
+            relink.update(self.unresolved)
+
+        for module in relink:
+            self._unlink(module)
+            source_file = self.index.get(self.index.root / module.relative_to(self.src_root))
+            if source_file is not None:
+                self._link(source_file)
+        return relink
+
+    def entry_points(self) -> List[Path]:
+        """Module scripts referenced by index.html (falling back to src/main.tsx)"""
+        entries = []
+        index_html = self.project_root / "index.html"
+        if index_html.exists():
+            for src in SCRIPT_SRC_PATTERN.findall(index_html.read_text(encoding='utf-8')):
+                resolved = self._try_file(self.project_root / src.lstrip('/'))
+                if resolved:
+                    entries.append(resolved)
+        if not entries:
+            main_file = self._try_file(self.src_root / "main")
+            if main_file:
+                entries.append(main_file)
+        return entries
+
+    def route_entries(self, app_file: str = "App.tsx") -> List[Path]:
+        """Modules App.tsx pulls in for routes, including lazy React.lazy(() => import()) pages"""
+        app = (self.src_root / app_file).resolve()
+        return [target for target, kind in self.edges.get(app, []) if kind in ('static', 'dynamic')]
+
+    def reachable(self, entries: List[Path], include_dynamic: bool = True) -> Set[Path]:
+        """Breadth-first closure over import edges, O(modules + imports)"""
+        seen = set(entries)
+        queue = deque(entries)
+        while queue:
+            module = queue.popleft()
+            for target, kind in self.edges.get(module, ()):
+                if target in seen or (kind == 'dynamic' and not include_dynamic):
+                    continue
+                seen.add(target)
+                queue.append(target)
+        return seen
+
+    def is_test_module(self, module: Path) -> bool:
+        path, prefix = module.as_posix(), self.src_root.as_posix() + '/'
+        return path.startswith(prefix) and bool(TEST_FILE_PATTERN.search(path[len(prefix):]))
+
+    def analyze(self, extra_entries: Optional[List[Path]] = None) -> Dict:
+        """Reachability report: unreachable modules, test-only modules and broken imports"""
+        entries = self.entry_points() + self.route_entries() + list(extra_entries or [])
+        app_reachable = self.reachable(entries)
+        modules = self.modules
+        test_modules = [module for module in modules if self.is_test_module(module)]
+        test_reachable = self.reachable(test_modules) - app_reachable
+
+        unreachable = sorted(module for module in modules
+                             if module not in app_reachable and module not in test_reachable
+                             and not module.name.endswith('.d.ts'))
+        return {
+            'entries': [str(entry) for entry in entries],
+            'modules': len(modules),
+            'edges': sum(len(targets) for targets in self.edges.values()),
+            'reachable': len(app_reachable),
+            'unreachable_modules': [str(module) for module in unreachable],
+            'test_only_modules': sorted(str(module) for module in test_reachable if not self.is_test_module(module)),
+            'unresolved_imports': {str(module): specifiers for module, specifiers in sorted(self.unresolved.items())},
+        }
+
+
+def main():
+    project_root = sys.argv[1] if len(sys.argv) > 1 else "/workspace/claimguru"
+    graph = ImportGraph(project_root, cache=open_cache())
+    report = graph.analyze()
+    src_root = graph.src_root
+
+    print(f"🕸️ {report['modules']} modules, {report['edges']} resolved imports, "
+          f"{report['reachable']} reachable from {len(report['entries'])} entries")
+    print(f"🗑️ Unreachable modules: {len(report['unreachable_modules'])}")
+    for module in report['unreachable_modules']:
+        print(f"   - {Path(module).relative_to(src_root)}")
+    if report['test_only_modules']:
+        print(f"🧪 Only reachable from tests: {len(report['test_only_modules'])}")
+    if report['unresolved_imports']:
+        print(f"⚠️ Files with unresolved imports: {len(report['unresolved_imports'])}")
+        for module, specifiers in report['unresolved_imports'].items():
+            print(f"   {Path(module).relative_to(src_root)}: {', '.join(specifiers)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+Persistent Document Processing Job Queue
+Durable priority queue with leases, visibility timeouts and retries, shared fairly
+between organizations. SQLite by default, Postgres when JOB_QUEUE_URL points at a
+postgresql:// database
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_QUEUE_URL = os.environ.get("JOB_QUEUE_URL", "sqlite:////workspace/.document_jobs.sqlite")
+
+# Lower value = served first. Interactive wizard uploads always beat batch reprocessing.
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NORMAL = 50
+PRIORITY_BATCH = 100
+
+DEFAULT_LEASE_SECONDS = 120
+DEFAULT_MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 5
+RETRY_MAX_SECONDS = 600
+
+# Weighted fair queuing between organizations, keyed by subscriptions.subscription_tier
+TIER_WEIGHTS = {'individual': 1.0, 'firm': 3.0, 'enterprise': 6.0}
+TIER_MAX_CONCURRENCY = {'individual': 2, 'firm': 4, 'enterprise': 8}
+DEFAULT_TIER = 'individual'
+METRICS_WINDOW_SECONDS = 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS document_jobs (
+    id {id_type},
+    organization_id TEXT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at DOUBLE PRECISION NOT NULL,
+    lease_owner TEXT,
+    lease_expires_at DOUBLE PRECISION,
+    started_at DOUBLE PRECISION,
+    last_error TEXT,
+    result TEXT,
+    created_at DOUBLE PRECISION NOT NULL,
+    updated_at DOUBLE PRECISION NOT NULL
+)
+"""
+INDEX = ("CREATE INDEX IF NOT EXISTS document_jobs_ready "
+         "ON document_jobs (status, priority, available_at)")
+
+# Columns added after the first release, applied to existing queue databases on open
+ADDED_COLUMNS = [('organization_id', 'TEXT'), ('started_at', 'DOUBLE PRECISION')]
+
+# Per-organization scheduling state. virtual_time is the start-time fair queuing tag:
+# each leased job advances it by 1/weight, and the org with the lowest tag goes next.
+ORGANIZATION_SCHEMA = """
+CREATE TABLE IF NOT EXISTS organization_schedule (
+    organization_id TEXT PRIMARY KEY,
+    subscription_tier TEXT NOT NULL,
+    weight DOUBLE PRECISION NOT NULL,
+    max_concurrency INTEGER NOT NULL,
+    virtual_time DOUBLE PRECISION NOT NULL DEFAULT 0,
+    updated_at DOUBLE PRECISION NOT NULL
+)
+"""
+SCHEDULER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scheduler_clock (
+    id INTEGER PRIMARY KEY,
+    virtual_time DOUBLE PRECISION NOT NULL
+)
+"""
+
+JOB_COLUMNS = ['id', 'organization_id', 'kind', 'payload', 'priority', 'status', 'attempts', 'max_attempts',
+               'available_at', 'lease_owner', 'lease_expires_at', 'started_at', 'last_error', 'result',
+               'created_at', 'updated_at']
+
+# A job is leasable when it is queued and due, or leased but its visibility timeout ran out
+READY_CONDITION = ("((status = 'queued' AND available_at <= ?) "
+                   "OR (status = 'leased' AND lease_expires_at < ?))")
+
+
+def _row_to_job(row) -> Dict:
+    job = dict(zip(JOB_COLUMNS, row))
+    job['payload'] = json.loads(job['payload'])
+    if job['result']:
+        job['result'] = json.loads(job['result'])
+    return job
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class JobQueue:
+    """Backend-neutral queue logic; subclasses provide connections and SQL dialect"""
+
+    placeholder = '?'
+    lock_clause = ''
+
+    def _connect(self):
+        raise NotImplementedError
+
+    def _sql(self, statement: str) -> str:
+        return statement.replace('?', self.placeholder)
+
+    def _begin(self, conn):
+        raise NotImplementedError
+
+    def _create_schema(self, conn, id_type: str):
+        cursor = conn.cursor()
+        cursor.execute(SCHEMA.format(id_type=id_type))
+        existing = self._column_names(cursor)
+        for column, column_type in ADDED_COLUMNS:
+            if column not in existing:
+                cursor.execute(f"ALTER TABLE document_jobs ADD COLUMN {column} {column_type}")
+        cursor.execute(INDEX)
+        cursor.execute(ORGANIZATION_SCHEMA)
+        cursor.execute(SCHEDULER_SCHEMA)
+        cursor.execute("INSERT INTO scheduler_clock (id, virtual_time) VALUES (1, 0) ON CONFLICT (id) DO NOTHING")
+        conn.commit()
+
+    def _column_names(self, cursor) -> set:
+        raise NotImplementedError
+
+    def enqueue(self, kind: str, payload: Dict, priority: int = PRIORITY_NORMAL,
+                max_attempts: int = DEFAULT_MAX_ATTEMPTS, delay_seconds: float = 0,
+                organization_id: Optional[str] = None) -> int:
+        now = time.time()
+        conn = self._connect()
+        try:
+            self._begin(conn)
+            cursor = conn.cursor()
+            cursor.execute(self._sql(
+                "INSERT INTO document_jobs (organization_id, kind, payload, priority, status, attempts, "
+                "max_attempts, available_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, 'queued', 0, ?, ?, ?, ?)" + self._returning_id()),
+                (organization_id, kind, json.dumps(payload), priority, max_attempts,
+                 now + delay_seconds, now, now))
+            job_id = self._inserted_id(cursor)
+            conn.commit()
+            return job_id
+        finally:
+            conn.close()
+
+    def _returning_id(self) -> str:
+        return ''
+
+    def _inserted_id(self, cursor) -> int:
+        return cursor.lastrowid
+
+    def set_organization_tier(self, organization_id: str, subscription_tier: str):
+        """Record an organization's tier; its weight and concurrency cap follow from it"""
+        tier = subscription_tier if subscription_tier in TIER_WEIGHTS else DEFAULT_TIER
+        conn = self._connect()
+        try:
+            self._begin(conn)
+            conn.cursor().execute(self._sql(
+                "INSERT INTO organization_schedule (organization_id, subscription_tier, weight, max_concurrency, "
+                "virtual_time, updated_at) VALUES (?, ?, ?, ?, 0, ?) ON CONFLICT (organization_id) DO UPDATE SET "
+                "subscription_tier = excluded.subscription_tier, weight = excluded.weight, "
+                "max_concurrency = excluded.max_concurrency, updated_at = excluded.updated_at"),
+                (organization_id, tier, TIER_WEIGHTS[tier], TIER_MAX_CONCURRENCY[tier], time.time()))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _organization_schedule(self, cursor, organization_ids) -> Dict[str, Dict]:
+        cursor.execute("SELECT organization_id, weight, max_concurrency, virtual_time FROM organization_schedule")
+        schedule = {org: {'weight': weight, 'max_concurrency': cap, 'virtual_time': vt}
+                    for org, weight, cap, vt in cursor.fetchall()}
+        for org in organization_ids:
+            schedule.setdefault(org, {'weight': TIER_WEIGHTS[DEFAULT_TIER],
+                                      'max_concurrency': TIER_MAX_CONCURRENCY[DEFAULT_TIER],
+                                      'virtual_time': 0.0, 'new': True})
+        return schedule
+
+    def _pick_organization(self, cursor, now: float, max_priority: Optional[int]):
+        """Choose (organization, priority, start tag) to serve next, or None.
+
+        Priority stays strict across organizations. Within the most urgent class the
+        organization with the lowest start tag wins, where an org's tag is its own
+        virtual time but never below the scheduler clock, so a tenant that was idle
+        during someone else's bulk import is served next instead of waiting behind it.
+        Batch jobs also respect the org's concurrency cap; interactive ones never do.
+        """
+        sql = f"SELECT COALESCE(organization_id, ''), MIN(priority) FROM document_jobs WHERE {READY_CONDITION}"
+        params = [now, now]
+        if max_priority is not None:
+            sql += " AND priority <= ?"
+            params.append(max_priority)
+        cursor.execute(self._sql(sql + " GROUP BY COALESCE(organization_id, '')"), params)
+        candidates = dict(cursor.fetchall())
+        if not candidates:
+            return None
+
+        cursor.execute(self._sql(
+            "SELECT COALESCE(organization_id, ''), COUNT(*) FROM document_jobs "
+            "WHERE status = 'leased' AND lease_expires_at >= ? GROUP BY COALESCE(organization_id, '')"), (now,))
+        running = dict(cursor.fetchall())
+        schedule = self._organization_schedule(cursor, candidates)
+        cursor.execute("SELECT virtual_time FROM scheduler_clock WHERE id = 1")
+        clock = cursor.fetchone()[0]
+
+        eligible = [org for org, priority in candidates.items()
+                    if priority <= PRIORITY_INTERACTIVE
+                    or running.get(org, 0) < schedule[org]['max_concurrency']]
+        if not eligible:
+            return None
+        best_priority = min(candidates[org] for org in eligible)
+        tags = {org: max(schedule[org]['virtual_time'], clock)
+                for org in eligible if candidates[org] == best_priority}
+        org = min(tags, key=lambda o: (tags[o], o))
+        return org, best_priority, tags[org], schedule[org]
+
+    def _advance_virtual_time(self, cursor, organization_id: str, start_tag: float, schedule: Dict, now: float):
+        finish_tag = start_tag + 1.0 / schedule['weight']
+        if schedule.get('new'):
+            cursor.execute(self._sql(
+                "INSERT INTO organization_schedule (organization_id, subscription_tier, weight, max_concurrency, "
+                "virtual_time, updated_at) VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (organization_id) DO UPDATE SET "
+                "virtual_time = excluded.virtual_time, updated_at = excluded.updated_at"),
+                (organization_id, DEFAULT_TIER, schedule['weight'], schedule['max_concurrency'], finish_tag, now))
+        else:
+            cursor.execute(self._sql(
+                "UPDATE organization_schedule SET virtual_time = ?, updated_at = ? WHERE organization_id = ?"),
+                (finish_tag, now, organization_id))
+        cursor.execute(self._sql("UPDATE scheduler_clock SET virtual_time = ? WHERE id = 1"), (start_tag,))
+
+    def lease(self, worker_id: str, lease_seconds: int = DEFAULT_LEASE_SECONDS,
+              max_priority: Optional[int] = None) -> Optional[Dict]:
+        """Claim the next job under priority and per-organization fair scheduling, or None.
+
+        max_priority restricts the lease to jobs at least that urgent, which is how
+        reserved workers stay free for interactive uploads.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            self._begin(conn)
+            cursor = conn.cursor()
+            picked = self._pick_organization(cursor, now, max_priority)
+            if picked is None:
+                conn.commit()
+                return None
+
+            organization_id, priority, start_tag, schedule = picked
+            cursor.execute(self._sql(
+                f"SELECT {', '.join(JOB_COLUMNS)} FROM document_jobs WHERE {READY_CONDITION} "
+                "AND COALESCE(organization_id, '') = ? AND priority = ? "
+                "ORDER BY available_at, id LIMIT 1" + self.lock_clause),
+                (now, now, organization_id, priority))
+            row = cursor.fetchone()
+            if row is None:
+                # Another worker took the org's last ready job between the two reads
+                conn.commit()
+                return None
+
+            job = _row_to_job(row)
+            if job['attempts'] >= job['max_attempts']:
+                # Lease expired on the final attempt: the worker died mid-job too many times
+                cursor.execute(self._sql(
+                    "UPDATE document_jobs SET status = 'dead', lease_owner = NULL, updated_at = ?, "
+                    "last_error = COALESCE(last_error, 'lease expired') WHERE id = ?"), (now, job['id']))
+                conn.commit()
+                return self.lease(worker_id, lease_seconds, max_priority)
+
+            cursor.execute(self._sql(
+                "UPDATE document_jobs SET status = 'leased', lease_owner = ?, lease_expires_at = ?, "
+                "attempts = attempts + 1, started_at = COALESCE(started_at, ?), updated_at = ? WHERE id = ?"),
+                (worker_id, now + lease_seconds, now, now, job['id']))
+            self._advance_virtual_time(cursor, organization_id, start_tag, schedule, now)
+            conn.commit()
+
+            job.update(status='leased', lease_owner=worker_id, lease_expires_at=now + lease_seconds,
+                       attempts=job['attempts'] + 1, started_at=job['started_at'] or now)
+            return job
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _update_owned(self, job_id: int, worker_id: str, assignments: str, params: tuple) -> bool:
+        """Apply an update only while this worker still holds the lease"""
+        conn = self._connect()
+        try:
+            self._begin(conn)
+            cursor = conn.cursor()
+            cursor.execute(self._sql(
+                f"UPDATE document_jobs SET {assignments}, updated_at = ? "
+                "WHERE id = ? AND lease_owner = ? AND status = 'leased'"),
+                params + (time.time(), job_id, worker_id))
+            updated = cursor.rowcount == 1
+            conn.commit()
+            return updated
+        finally:
+            conn.close()
+
+    def heartbeat(self, job_id: int, worker_id: str, lease_seconds: int = DEFAULT_LEASE_SECONDS) -> bool:
+        """Extend the visibility timeout; False means the lease was lost to another worker"""
+        return self._update_owned(job_id, worker_id, "lease_expires_at = ?", (time.time() + lease_seconds,))
+
+    def complete(self, job_id: int, worker_id: str, result: Optional[Dict] = None) -> bool:
+        return self._update_owned(job_id, worker_id, "status = 'done', lease_owner = NULL, result = ?",
+                                  (json.dumps(result or {}),))
+
+    def fail(self, job_id: int, worker_id: str, error: str, attempts: int, max_attempts: int) -> bool:
+        """Requeue with exponential backoff, or mark dead after the last attempt"""
+        if attempts >= max_attempts:
+            return self._update_owned(job_id, worker_id, "status = 'dead', lease_owner = NULL, last_error = ?",
+                                      (error[:2000],))
+        delay = min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+        return self._update_owned(
+            job_id, worker_id,
+            "status = 'queued', lease_owner = NULL, lease_expires_at = NULL, available_at = ?, last_error = ?",
+            (time.time() + delay, error[:2000]))
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Job counts by status and priority"""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT status, priority, COUNT(*) FROM document_jobs GROUP BY status, priority")
+            stats = {}
+            for status, priority, count in cursor.fetchall():
+                stats.setdefault(status, {})[str(priority)] = count
+            return stats
+        finally:
+            conn.close()
+
+    def organization_metrics(self, window_seconds: int = METRICS_WINDOW_SECONDS) -> Dict[str, Dict]:
+        """Per-organization queue depth, running jobs and queue wait times for admins.
+
+        Wait time is first lease minus enqueue, over jobs started within the window.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(self._sql(
+                "SELECT COALESCE(organization_id, ''), status, priority, created_at, started_at, lease_expires_at "
+                "FROM document_jobs WHERE status IN ('queued', 'leased') OR started_at >= ? OR updated_at >= ?"),
+                (now - window_seconds, now - window_seconds))
+            rows = cursor.fetchall()
+            schedule = self._organization_schedule(cursor, {row[0] for row in rows})
+            cursor.execute("SELECT organization_id, subscription_tier FROM organization_schedule")
+            tiers = dict(cursor.fetchall())
+        finally:
+            conn.close()
+
+        metrics = {}
+        waits = {}
+        for org, status, priority, created_at, started_at, lease_expires_at in rows:
+            entry = metrics.setdefault(org, {
+                'subscription_tier': tiers.get(org, DEFAULT_TIER),
+                'weight': schedule[org]['weight'],
+                'max_concurrency': schedule[org]['max_concurrency'],
+                'queued_interactive': 0, 'queued_batch': 0, 'running': 0,
+                'completed': 0, 'dead': 0, 'oldest_queued_s': 0.0,
+            })
+            if status == 'queued':
+                entry['queued_interactive' if priority <= PRIORITY_INTERACTIVE else 'queued_batch'] += 1
+                entry['oldest_queued_s'] = max(entry['oldest_queued_s'], round(now - created_at, 1))
+            elif status == 'leased' and lease_expires_at >= now:
+                entry['running'] += 1
+            elif status == 'done':
+                entry['completed'] += 1
+            elif status == 'dead':
+                entry['dead'] += 1
+            if started_at and started_at >= now - window_seconds:
+                waits.setdefault(org, []).append(started_at - created_at)
+
+        for org, entry in metrics.items():
+            org_waits = waits.get(org)
+            entry['wait_avg_s'] = round(sum(org_waits) / len(org_waits), 2) if org_waits else None
+            entry['wait_p95_s'] = round(_percentile(org_waits, 0.95), 2) if org_waits else None
+            entry['wait_max_s'] = round(max(org_waits), 2) if org_waits else None
+        return metrics
+
+
+class SQLiteJobQueue(JobQueue):
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            self._create_schema(conn, 'INTEGER PRIMARY KEY AUTOINCREMENT')
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _begin(self, conn):
+        # Take the write lock up front so two workers can never lease the same job
+        conn.execute("BEGIN IMMEDIATE")
+
+    def _column_names(self, cursor) -> set:
+        cursor.execute("PRAGMA table_info(document_jobs)")
+        return {row[1] for row in cursor.fetchall()}
+
+
+class PostgresJobQueue(JobQueue):
+    placeholder = '%s'
+    # SKIP LOCKED lets many workers lease concurrently without blocking on each other
+    lock_clause = ' FOR UPDATE SKIP LOCKED'
+
+    def __init__(self, dsn: str):
+        import psycopg  # optional dependency, only needed for the Postgres backend
+        self._psycopg = psycopg
+        self.dsn = dsn
+        conn = self._connect()
+        try:
+            self._create_schema(conn, 'BIGSERIAL PRIMARY KEY')
+        finally:
+            conn.close()
+
+    def _connect(self):
+        return self._psycopg.connect(self.dsn)
+
+    def _begin(self, conn):
+        pass  # psycopg opens a transaction implicitly
+
+    def _column_names(self, cursor) -> set:
+        cursor.execute("SELECT column_name FROM information_schema.columns WHERE table_name = 'document_jobs'")
+        return {row[0] for row in cursor.fetchall()}
+
+    def _returning_id(self) -> str:
+        return ' RETURNING id'
+
+    def _inserted_id(self, cursor) -> int:
+        return cursor.fetchone()[0]
+
+
+def open_queue(url: str = DEFAULT_QUEUE_URL) -> JobQueue:
+    """Open a queue from a sqlite:///path or postgresql://... URL"""
+    if url.startswith('sqlite:///'):
+        return SQLiteJobQueue(url[len('sqlite:///'):])
+    if url.startswith(('postgres://', 'postgresql://')):
+        return PostgresJobQueue(url)
+    raise ValueError(f"Unsupported job queue URL: {url}")
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    queue = open_queue(args[0] if args else DEFAULT_QUEUE_URL)
+    metrics = queue.organization_metrics()
+    if '--json' in sys.argv:
+        print(json.dumps({'stats': queue.stats(), 'organizations': metrics}, indent=2))
+        return
+
+    print("📋 Document job queue")
+    for status, by_priority in sorted(queue.stats().items()):
+        counts = ', '.join(f"p{priority}: {count}" for priority, count in sorted(by_priority.items()))
+        print(f"  {status}: {counts}")
+
+    print(f"\n🏢 Organizations (last {METRICS_WINDOW_SECONDS // 60} min)")
+    for org, entry in sorted(metrics.items(), key=lambda item: -(item[1]['queued_interactive'] +
+                                                                  item[1]['queued_batch'])):
+        wait = (f"wait avg {entry['wait_avg_s']}s p95 {entry['wait_p95_s']}s"
+                if entry['wait_avg_s'] is not None else "no jobs started")
+        print(f"  {org or '(none)'} [{entry['subscription_tier']} x{entry['weight']:g}, cap {entry['max_concurrency']}]: "
+              f"{entry['queued_interactive']} interactive + {entry['queued_batch']} batch queued, "
+              f"{entry['running']} running, oldest {entry['oldest_queued_s']}s, {wait}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Local Stand-in for the openai-extract-fields Edge Function
+Serves the same single-document, batch and streaming request shapes with regex
+extraction and simulated call latency, so client changes can be benchmarked without OpenAI
+"""
+
+import os
+import re
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+FUNCTION_PATH = "/functions/v1/openai-extract-fields"
+
+# Must match the edge function limits
+MAX_BATCH_DOCUMENTS = 8
+MAX_BATCH_TEXT_LENGTH = 48000
+
+# Simulated latency: fixed per-call overhead (network + cold path) plus model time
+CALL_OVERHEAD_SECONDS = float(os.environ.get("STANDIN_CALL_OVERHEAD", "0.8"))
+SECONDS_PER_1K_TOKENS = float(os.environ.get("STANDIN_SECONDS_PER_1K_TOKENS", "0.15"))
+SECONDS_PER_STREAMED_FIELD = float(os.environ.get("STANDIN_SECONDS_PER_FIELD", "0.05"))
+
+FIELD_PATTERNS = {
+    'policyNumber': r'Policy\s*(?:Number|No\.?|#)\s*:?\s*([A-Z0-9][A-Z0-9\-]{4,})',
+    'claimNumber': r'Claim\s*(?:Number|No\.?|#)\s*:?\s*([A-Z0-9][A-Z0-9\-]{3,})',
+    'fileNumber': r'(?:File|Our File)\s*(?:Number|No\.?|#)?\s*:?\s*([A-Z0-9][A-Z0-9\-]{3,})',
+    'insuredName': r'(?:Named\s+)?Insured(?:\s+Name)?\s*:\s*([A-Z][A-Za-z .,&\'-]{3,60})',
+    'effectiveDate': r'Effective\s*(?:Date)?\s*:?\s*(\d{1,2}/\d{1,2}/\d{2,4})',
+    'expirationDate': r'Expir\w*\s*(?:Date)?\s*:?\s*(\d{1,2}/\d{1,2}/\d{2,4})',
+    'coverageA': r'(?:Coverage\s*A|Dwelling)\s*:?\s*(\$[\d,]+)',
+    'coverageB': r'(?:Coverage\s*B|Other\s+Structures)\s*:?\s*(\$[\d,]+)',
+    'coverageC': r'(?:Coverage\s*C|Personal\s+Property)\s*:?\s*(\$[\d,]+)',
+    'coverageD': r'(?:Coverage\s*D|Loss\s+of\s+Use)\s*:?\s*(\$[\d,]+)',
+    'deductible': r'Deductible\s*:?\s*(\$[\d,]+|\d+(?:\.\d+)?%)',
+    'premium': r'(?:Total\s+)?Premium\s*:?\s*(\$[\d,]+(?:\.\d{2})?)',
+}
+COMPILED_PATTERNS = {field: re.compile(pattern, re.IGNORECASE) for field, pattern in FIELD_PATTERNS.items()}
+
+DOCUMENT_TYPE_KEYWORDS = [
+    ('ror', 'reservation of rights'),
+    ('rfi', 'request for information'),
+    ('acknowledgement', 'acknowledg'),
+    ('settlement', 'settlement'),
+    ('policy', 'declarations'),
+    ('claim', 'claim'),
+]
+
+
+def extract_fields(text: str) -> Dict:
+    """Regex extraction standing in for the OpenAI call"""
+    policy_data = {}
+    for field, pattern in COMPILED_PATTERNS.items():
+        match = pattern.search(text)
+        policy_data[field] = match.group(1).strip() if match else None
+
+    lowered = text.lower()
+    policy_data['documentType'] = next(
+        (doc_type for doc_type, keyword in DOCUMENT_TYPE_KEYWORDS if keyword in lowered), None)
+    return policy_data
+
+
+def summarize(policy_data: Dict) -> Dict:
+    return {
+        'fieldsExtracted': len([k for k, v in policy_data.items() if v]),
+        'identifiersExtracted': {
+            'policyNumber': bool(policy_data.get('policyNumber')),
+            'claimNumber': bool(policy_data.get('claimNumber')),
+            'fileNumber': bool(policy_data.get('fileNumber')),
+            'carrierClaimNumber': bool(policy_data.get('carrierClaimNumber')),
+        },
+    }
+
+
+def simulate_latency(total_chars: int):
+    time.sleep(CALL_OVERHEAD_SECONDS + (total_chars / 4000) * SECONDS_PER_1K_TOKENS)
+
+
+def handle_single(text: str) -> Dict:
+    simulate_latency(len(text))
+    policy_data = extract_fields(text)
+    return {
+        'success': True,
+        'policyData': policy_data,
+        'confidence': 0.9,
+        'method': 'local-standin-regex',
+        **summarize(policy_data),
+    }
+
+
+def handle_batch(documents: List[Dict]) -> Dict:
+    if not documents:
+        raise ValueError('No documents provided for batch extraction')
+    if len(documents) > MAX_BATCH_DOCUMENTS:
+        raise ValueError(f'Batch exceeds {MAX_BATCH_DOCUMENTS} documents')
+
+    seen_ids = set()
+    for document in documents:
+        if not isinstance(document, dict) or not isinstance(document.get('id'), str) or not document['id']:
+            raise ValueError('Every batch document needs a string id')
+        if not document.get('text'):
+            raise ValueError(f"No text provided for document {document['id']}")
+        if document['id'] in seen_ids:
+            raise ValueError(f"Duplicate document id in batch: {document['id']}")
+        seen_ids.add(document['id'])
+
+    total_length = sum(len(document['text']) for document in documents)
+    if total_length > MAX_BATCH_TEXT_LENGTH:
+        raise ValueError(f'Batch text exceeds {MAX_BATCH_TEXT_LENGTH} characters')
+
+    simulate_latency(total_length)
+    results = []
+    for document in documents:
+        policy_data = extract_fields(document['text'])
+        results.append({'id': document['id'], 'success': True, 'policyData': policy_data, **summarize(policy_data)})
+
+    return {
+        'success': True,
+        'batch': True,
+        'results': results,
+        'confidence': 0.9,
+        'method': 'local-standin-regex-batch',
+    }
+
+
+def stream_single(text: str):
+    """Yield NDJSON events in the same order the edge function emits them"""
+    time.sleep(CALL_OVERHEAD_SECONDS)
+    policy_data = extract_fields(text)
+    for field, value in policy_data.items():
+        time.sleep(SECONDS_PER_STREAMED_FIELD)
+        yield {'type': 'field', 'field': field, 'value': value}
+    yield {
+        'type': 'complete',
+        'success': True,
+        'policyData': policy_data,
+        'confidence': 0.9,
+        'method': 'local-standin-regex-stream',
+        **summarize(policy_data),
+    }
+
+
+class ExtractionStandInHandler(BaseHTTPRequestHandler):
+    def _send_json(self, status: int, body: Dict):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_ndjson(self, events):
+        # HTTP/1.0 response without Content-Length: the body ends when the connection closes
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        for event in events:
+            self.wfile.write(json.dumps(event).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+    def do_POST(self):
+        if self.path != FUNCTION_PATH:
+            self._send_json(404, {'error': {'code': 'NOT_FOUND', 'message': self.path}})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b'{}')
+            documents = body.get('documents')
+            if isinstance(documents, list):
+                self._send_json(200, handle_batch(documents))
+            elif body.get('text') and body.get('stream'):
+                self._send_ndjson(stream_single(body['text']))
+            elif body.get('text'):
+                self._send_json(200, handle_single(body['text']))
+            else:
+                raise ValueError('No text provided for extraction')
+        except Exception as e:
+            self._send_json(500, {'error': {'code': 'LOCAL_STANDIN_EXTRACTION_ERROR', 'message': str(e)}})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    port = int(os.environ.get("STANDIN_PORT", "8787"))
+    server = ThreadingHTTPServer(('127.0.0.1', port), ExtractionStandInHandler)
+    print(f"🧪 Local extraction stand-in listening on http://127.0.0.1:{port}{FUNCTION_PATH}")
+    print(f"⏱️ Call overhead: {CALL_OVERHEAD_SECONDS}s, {SECONDS_PER_1K_TOKENS}s per 1K tokens")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
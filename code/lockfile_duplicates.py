@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+"""
+Lockfile Duplicate Package Analyzer
+Streams package-lock.json and pnpm-lock.yaml for packages resolved at more than one version,
+weights each duplicate by the bytes its copies ship in the bundle and plans dedupes and overrides
+"""
+
+import re
+import sys
+import json
+import itertools
+from pathlib import Path
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from bundle_composition import APP_PACKAGE, BundleCompositionAnalyzer, BundleHistory
+from import_graph import package_name
+
+LOCKFILES = ('package-lock.json', 'pnpm-lock.yaml')
+ROOT_DEPENDENT = '(project)'
+# Peer dependencies resolve to the dependent's own dependency, so they are not edges of their own
+DEPENDENCY_FIELDS = ('dependencies', 'optionalDependencies')
+# One "key": value per line, as npm writes package-lock.json
+JSON_LINE_PATTERN = re.compile(r'^\s*(?:"((?:[^"\\]|\\.)*)"\s*:\s*)?(.*?),?\s*$')
+PNPM_V5_KEY_PATTERN = re.compile(r'^((?:@[^/@]+/)?[^/@]+)/(\d[^/_(]*)(?:_.*)?$')
+VERSION_PATTERN = re.compile(r'^\s*v?(\d+)(?:\.(\d+|[xX*]))?(?:\.(\d+|[xX*]))?')
+
+
+def _json_leaves(lines: Iterable[str]) -> Iterator[Tuple[tuple, object]]:
+    """(key path, value) for every scalar in pretty-printed JSON, one line at a time"""
+    stack: List[Optional[str]] = []
+    for line in lines:
+        key, rest = JSON_LINE_PATTERN.match(line).groups()
+        if key is not None:
+            key = json.loads(f'"{key}"')
+        if rest in ('{', '['):
+            stack.append(key)
+        elif rest in ('}', ']'):
+            if stack:
+                stack.pop()
+        elif rest and rest not in ('{}', '[]'):
+            yield tuple(stack[1:]) + (key,), json.loads(rest)
+
+
+def _walk(value, path: tuple = ()) -> Iterator[Tuple[tuple, object]]:
+    if isinstance(value, dict):
+        for key, child in value.items():
+            yield from _walk(child, path + (key,))
+    elif isinstance(value, list):
+        for child in value:
+            yield from _walk(child, path + (None,))
+    else:
+        yield path, value
+
+
+def _yaml_leaves(lines: Iterable[str]) -> Iterator[Tuple[tuple, str]]:
+    """(key path, scalar) for the block-mapping subset of YAML that pnpm writes"""
+    stack: List[Tuple[int, str]] = []
+    for line in lines:
+        content = line.rstrip('\n').lstrip(' ')
+        if not content or content.startswith(('#', '- ')):
+            continue
+        indent = len(line) - len(line.lstrip(' '))
+        if content[0] in '\'"':
+            end = content.index(content[0], 1)
+            key, rest = content[1:end], content[end + 1:]
+        else:
+            key, _, rest = content.partition(':')
+            rest = ':' + rest
+        value = rest[1:].strip() if rest.startswith(':') else ''
+        while stack and stack[-1][0] >= indent:
+            stack.pop()
+        if value:
+            yield tuple(name for _, name in stack) + (key,), value.strip('\'"')
+        else:
+            stack.append((indent, key))
+
+
+def parse_version(version: str) -> Tuple[int, int, int]:
+    match = VERSION_PATTERN.match(version or '')
+    if not match:
+        return (0, 0, 0)
+    return tuple(int(part) if part and part.isdigit() else 0 for part in match.groups())
+
+
+def _partial(text: str) -> List[int]:
+    """Numeric components of a possibly partial version (1, 1.2, 1.x, 1.2.3-beta)"""
+    match = VERSION_PATTERN.match(text.lstrip('=v'))
+    if not match:
+        return []
+    parts = []
+    for part in match.groups():
+        if part is None or not part.isdigit():
+            break
+        parts.append(int(part))
+    return parts
+
+
+def _bump(parts: List[int]) -> Tuple[int, int, int]:
+    raised = parts[:-1] + [parts[-1] + 1]
+    return tuple(raised + [0] * (3 - len(raised)))
+
+
+def _pad(parts: List[int]) -> Tuple[int, int, int]:
+    return tuple(parts + [0] * (3 - len(parts)))
+
+
+def _comparators(token: str) -> List[Tuple[str, Tuple[int, int, int]]]:
+    if token in ('', '*', 'x', 'X', 'latest'):
+        return []
+    for operator in ('>=', '<=', '>', '<', '^', '~', '='):
+        if token.startswith(operator):
+            parts = _partial(token[len(operator):])
+            break
+    else:
+        operator, parts = '', _partial(token)
+    if not parts:
+        if operator in ('', '=', '^', '~', '>=') and token.lstrip('=^~>v').strip('xX*.') == '':
+            return []
+        raise ValueError(token)
+    if operator == '^':
+        major, minor = (parts + [0, 0])[:2]
+        if major > 0 or len(parts) == 1:
+            upper = (major + 1, 0, 0)
+        elif minor > 0 or len(parts) == 2:
+            upper = (0, minor + 1, 0)
+        else:
+            upper = (0, 0, parts[2] + 1)
+        return [('>=', _pad(parts)), ('<', upper)]
+    if operator == '~':
+        return [('>=', _pad(parts)), ('<', _bump(parts[:2]) if len(parts) > 1 else _bump(parts))]
+    if operator in ('', '='):
+        return [('=', _pad(parts))] if len(parts) == 3 else [('>=', _pad(parts)), ('<', _bump(parts))]
+    if operator == '>':
+        return [('>', _pad(parts))] if len(parts) == 3 else [('>=', _bump(parts))]
+    if operator == '<=':
+        return [('<=', _pad(parts))] if len(parts) == 3 else [('<', _bump(parts))]
+    return [(operator, _pad(parts))]
+
+
+def satisfies(version: str, requested: Optional[str]) -> Optional[bool]:
+    """Whether version is in an npm semver range; None when the range is not a version range"""
+    if requested is None or requested.startswith(('npm:', 'file:', 'link:', 'git', 'http', 'workspace:')):
+        return None
+    checks = {'=': lambda a, b: a == b, '>': lambda a, b: a > b, '>=': lambda a, b: a >= b,
+              '<': lambda a, b: a < b, '<=': lambda a, b: a <= b}
+    resolved = parse_version(version)
+    try:
+        for alternative in requested.split('||'):
+            alternative = alternative.strip()
+            if ' - ' in alternative:
+                low, high = alternative.split(' - ', 1)
+                comparators = _comparators('>=' + low.strip()) + _comparators('<=' + high.strip())
+            else:
+                comparators = [comparator for token in re.sub(r'([<>=^~]+)\s+', r'\1', alternative).split()
+                               for comparator in _comparators(token)]
+            if all(checks[operator](resolved, bound) for operator, bound in comparators):
+                return True
+    except ValueError:
+        return None
+    return False
+
+
+def _assumed_compatible(candidate: str, resolved: str) -> bool:
+    """Without a recorded range: a later version on the same caret release line than the one resolved"""
+    left, right = parse_version(candidate), parse_version(resolved)
+    if left < right:
+        return False
+    if left[0] or right[0]:
+        return left[0] == right[0]
+    return left[:2] == right[:2]
+
+
+class Lockfile:
+    """Every resolved (package, version) in one lockfile, with its install paths and dependents"""
+
+    def __init__(self, path: Path, kind: str):
+        self.path = path
+        self.kind = kind
+        self.lockfile_version = None
+        self.packages: Dict[str, Dict[str, Dict]] = defaultdict(dict)
+        # Install path (npm) or package key (pnpm) -> (name, version)
+        self.installs: Dict[str, Tuple[str, str]] = {}
+        # (dependent name@version, dependency) -> requested range, where the lockfile records it
+        self.ranges: Dict[Tuple[str, str], str] = {}
+
+    def _record(self, name: str, version: str, install: str, dev: bool) -> Dict:
+        entry = self.packages[name].setdefault(version, {'installs': [], 'dev': True, 'dependents': []})
+        entry['installs'].append(install)
+        entry['dev'] = entry['dev'] and dev
+        self.installs[install] = (name, version)
+        return entry
+
+    def duplicates(self) -> Dict[str, Dict[str, Dict]]:
+        return {name: versions for name, versions in self.packages.items() if len(versions) > 1}
+
+
+def _npm_install_key(path: tuple) -> Optional[str]:
+    """node_modules/a/node_modules/b for a lockfile v1 ('dependencies', 'a', 'dependencies', 'b') path"""
+    names = path[1::2]
+    if any(marker != 'dependencies' for marker in path[0::2]):
+        return None
+    return '/'.join(f"node_modules/{name}" for name in names)
+
+
+def _npm_resolve(entries: Dict[str, Dict], install: str, dependency: str) -> Optional[str]:
+    """Install a dependency of `install` resolves to, walking up node_modules like require() does"""
+    base = install
+    while True:
+        candidate = f"{base}/node_modules/{dependency}" if base else f"node_modules/{dependency}"
+        if candidate in entries:
+            return candidate
+        if not base:
+            return None
+        base = base.rsplit('/node_modules/', 1)[0] if '/node_modules/' in base else ''
+
+
+def parse_package_lock(path: Path) -> Lockfile:
+    lockfile = Lockfile(path, 'npm')
+    entries: Dict[str, Dict] = defaultdict(lambda: {'dependencies': {}})
+    with open(path, encoding='utf-8') as f:
+        first = f.readline()
+        if first.strip() == '{':
+            leaves = _json_leaves(itertools.chain([first], f))
+        else:
+            # Not pretty-printed, so not line-oriented; fall back to a full parse
+            f.seek(0)
+            leaves = _walk(json.load(f))
+        for key_path, value in leaves:
+            if key_path == ('lockfileVersion',):
+                lockfile.lockfile_version = value
+            elif len(key_path) >= 3 and key_path[0] == 'packages':
+                install, field = key_path[1], key_path[2]
+                if len(key_path) == 3:
+                    entries[install][field] = value
+                elif len(key_path) == 4 and (field in DEPENDENCY_FIELDS or field == 'devDependencies' and not install):
+                    entries[install]['dependencies'][key_path[3]] = value
+            elif key_path[0] == 'dependencies' and (lockfile.lockfile_version or 1) < 2 and len(key_path) >= 3:
+                # Lockfile v1 nests installs: dependencies.a.dependencies.b.version
+                if key_path[-2] == 'requires':
+                    install = _npm_install_key(key_path[:-2])
+                    if install:
+                        entries[install]['dependencies'][key_path[-1]] = value
+                else:
+                    install = _npm_install_key(key_path[:-1])
+                    if install:
+                        entries[install][key_path[-1]] = value
+
+    for install, entry in entries.items():
+        if not install or entry.get('link') or 'version' not in entry:
+            continue
+        name = entry.get('name') or package_name(install.rsplit('node_modules/', 1)[1])
+        lockfile._record(name, entry['version'], install, bool(entry.get('dev') or entry.get('devOptional')))
+    for install, entry in entries.items():
+        if install and install not in lockfile.installs:
+            continue
+        dependent = '@'.join(lockfile.installs[install]) if install else ROOT_DEPENDENT
+        for dependency, requested in entry['dependencies'].items():
+            target = _npm_resolve(entries, install, dependency)
+            lockfile.ranges[(dependent, dependency)] = requested
+            if target in lockfile.installs:
+                name, version = lockfile.installs[target]
+                lockfile.packages[name][version]['dependents'].append({'dependent': dependent, 'range': requested})
+    return lockfile
+
+
+def _pnpm_package(key: str) -> Optional[Tuple[str, str]]:
+    """(name, version) for a pnpm package key: /name@1.0.0(peer@2), /@scope/name@1.0.0, /name/1.0.0_peer@2 (v5)"""
+    key = key.lstrip('/')
+    if key.startswith(('link:', 'file:')):
+        return None
+    legacy = PNPM_V5_KEY_PATTERN.match(key)
+    if legacy:
+        return legacy.group(1), legacy.group(2)
+    key = re.sub(r'\(.*$', '', key)
+    at = key.find('@', 1)
+    if at > 0:
+        return key[:at], key[at + 1:]
+    return None
+
+
+def _pnpm_reference(dependency: str, reference: str) -> Optional[Tuple[str, str]]:
+    """(name, version) a dependency value points at: 1.2.3(peer@1), 1.2.3_peer (v5) or an alias /other@1.2.3"""
+    if reference.startswith(('link:', 'file:')):
+        return None
+    if not reference[:1].isdigit():
+        return _pnpm_package(reference)
+    return dependency, re.sub(r'\(.*$', '', reference).split('_')[0]
+
+
+def parse_pnpm_lock(path: Path) -> Lockfile:
+    lockfile = Lockfile(path, 'pnpm')
+    dev_flags: Dict[str, bool] = {}
+    keys: Dict[str, Tuple[str, str]] = {}
+    edges: List[Tuple[str, str, str]] = []
+    importers: Dict[Tuple[str, str], Dict] = defaultdict(dict)
+    with open(path, encoding='utf-8') as f:
+        for key_path, value in _yaml_leaves(f):
+            section = key_path[0]
+            if key_path == ('lockfileVersion',):
+                lockfile.lockfile_version = value
+            elif section in ('packages', 'snapshots') and len(key_path) >= 2:
+                package = key_path[1]
+                if package not in keys:
+                    parsed = _pnpm_package(package)
+                    if parsed is None:
+                        continue
+                    keys[package] = parsed
+                if len(key_path) == 3 and key_path[2] == 'dev':
+                    dev_flags[package] = value == 'true'
+                elif len(key_path) == 4 and key_path[2] in DEPENDENCY_FIELDS[:2]:
+                    edges.append((package, key_path[3], value))
+            elif section in ('dependencies', 'devDependencies', 'optionalDependencies') and len(key_path) >= 2:
+                # Single-project lockfile v6: dependencies.name.{specifier, version}; v5: dependencies.name: version
+                field = key_path[2] if len(key_path) == 3 else 'version'
+                importers[(section, key_path[1])][field] = value
+            elif section == 'specifiers' and len(key_path) == 2:
+                importers[('dependencies', key_path[1])]['specifier'] = value
+            elif section == 'importers' and len(key_path) == 5:
+                importers[(key_path[2], key_path[3])][key_path[4]] = value
+
+    for package, (name, version) in keys.items():
+        # v9 keeps dev flags nowhere; v6 marks dev: true/false per package
+        lockfile._record(name, version, package, dev_flags.get(package, False))
+    for package, dependency, reference in edges:
+        target = _pnpm_reference(dependency, reference)
+        if target and target[1] in lockfile.packages.get(target[0], {}):
+            # pnpm records what each package resolved to, not the range it asked for
+            lockfile.packages[target[0]][target[1]]['dependents'].append(
+                {'dependent': '@'.join(keys[package]), 'range': None})
+    for (section, dependency), fields in importers.items():
+        target = _pnpm_reference(dependency, fields.get('version', ''))
+        if target and target[1] in lockfile.packages.get(target[0], {}):
+            lockfile.packages[target[0]][target[1]]['dependents'].append(
+                {'dependent': ROOT_DEPENDENT, 'range': fields.get('specifier')})
+    return lockfile
+
+
+def _install_version(install: str, project_root: Path, lockfiles: Dict[str, Lockfile]) -> Optional[str]:
+    """Version of the package copy the bundle took from an install directory"""
+    if '.pnpm/' in install:
+        directory = install.split('.pnpm/', 1)[1].split('/', 1)[0]
+        at = directory.find('@', 1)
+        if at > 0:
+            return directory[at + 1:].split('_')[0].split('(')[0]
+    npm = lockfiles.get('package-lock.json')
+    if npm and install in npm.installs:
+        return npm.installs[install][1]
+    manifest = project_root / install / 'package.json'
+    try:
+        return json.loads(manifest.read_text(encoding='utf-8')).get('version')
+    except (OSError, ValueError):
+        return None
+
+
+def shipped_versions(report: Dict, project_root: Path, lockfiles: Dict[str, Lockfile]) -> Dict[str, Dict]:
+    """package -> {raw, gzip, versions: {version: raw bytes}} from a bundle composition report"""
+    shipped: Dict[str, Dict] = {}
+    for name, sizes in report.get('packages', {}).items():
+        if name != APP_PACKAGE:
+            shipped[name] = {'raw': sizes['raw'], 'gzip': sizes.get('gzip') or 0, 'versions': {}}
+    for module in report.get('modules', {}).values():
+        entry = shipped.get(module['package'])
+        if entry is None:
+            continue
+        for install, size in module.get('installs', {}).items():
+            version = _install_version(install, project_root, lockfiles) or 'unknown'
+            entry['versions'][version] = entry['versions'].get(version, 0) + size
+    return shipped
+
+
+class LockfileDuplicateAnalyzer:
+    """Packages resolved at several versions, ranked by what the extra copies ship.
+
+    Savings are the bytes of every shipped copy except the largest, which
+    stands in for the single copy left after a dedupe. Copies are told
+    apart by the install directory the sourcemaps point into, so bundle
+    reports recorded before install directories were tracked only give
+    per-package totals and no saving estimate.
+    """
+
+    def __init__(self, project_root: str, bundle_report: Optional[Dict] = None):
+        self.project_root = Path(project_root)
+        self.bundle_report = bundle_report
+        self.lockfiles: Dict[str, Lockfile] = {}
+
+    def load(self) -> Dict[str, Lockfile]:
+        parsers = {'package-lock.json': parse_package_lock, 'pnpm-lock.yaml': parse_pnpm_lock}
+        for name in LOCKFILES:
+            path = self.project_root / name
+            if path.exists():
+                self.lockfiles[name] = parsers[name](path)
+        return self.lockfiles
+
+    def _range(self, dependent: Dict, name: str) -> Optional[str]:
+        """The requested range, borrowed from another lockfile when this one only records resolutions"""
+        if dependent['range'] is not None:
+            return dependent['range']
+        for lockfile in self.lockfiles.values():
+            requested = lockfile.ranges.get((dependent['dependent'], name))
+            if requested is not None:
+                return requested
+        return None
+
+    def _plan(self, name: str, versions: Dict[str, Dict], kind: str) -> Dict:
+        """Dedupe when one version satisfies every dependent, otherwise an override with the dependents it breaks"""
+        candidates = []
+        for candidate in versions:
+            broken, unverified = [], []
+            for version, entry in versions.items():
+                for dependent in entry['dependents']:
+                    verdict = satisfies(candidate, self._range(dependent, name))
+                    if verdict is None:
+                        verdict = _assumed_compatible(candidate, version)
+                        if verdict and candidate != version:
+                            unverified.append(dependent['dependent'])
+                    if not verdict:
+                        broken.append({**dependent, 'resolved': version})
+            candidates.append((len(broken), [-part for part in parse_version(candidate)], candidate, broken, unverified))
+        _, _, target, broken, unverified = min(candidates)
+        plan = {'target': target, 'breaks': broken, 'unverified': sorted(set(unverified))}
+        if not broken:
+            return {'action': 'dedupe', 'command': f"npm dedupe {name}" if kind == 'npm' else "pnpm dedupe", **plan}
+        override = {'overrides': {name: target}} if kind == 'npm' else {'pnpm': {'overrides': {name: target}}}
+        return {'action': 'override', 'package_json': override, **plan}
+
+    def analyze(self) -> Dict:
+        if not self.lockfiles:
+            self.load()
+        report = self.bundle_report or {}
+        shipped = shipped_versions(report, self.project_root, self.lockfiles)
+        duplicates = []
+        for lockfile_name, lockfile in self.lockfiles.items():
+            for name, versions in lockfile.duplicates().items():
+                bundle = shipped.get(name)
+                copies = {version: size for version, size in (bundle or {}).get('versions', {}).items()}
+                saving = None
+                if bundle and bundle['versions']:
+                    saving_raw = sum(copies.values()) - max(copies.values())
+                    ratio = bundle['gzip'] / bundle['raw'] if bundle['raw'] else 0
+                    saving = {'raw': saving_raw, 'gzip': round(saving_raw * ratio)}
+                duplicates.append({
+                    'package': name,
+                    'lockfile': lockfile_name,
+                    'versions': {version: {'installs': entry['installs'], 'dev': entry['dev'],
+                                           'dependents': entry['dependents'], 'shipped_raw': copies.get(version, 0)}
+                                 for version, entry in sorted(versions.items(), key=lambda item: parse_version(item[0]))},
+                    'production': not all(entry['dev'] for entry in versions.values()),
+                    'shipped_raw': bundle['raw'] if bundle else 0,
+                    'shipped_gzip': bundle['gzip'] if bundle else 0,
+                    'estimated_saving': saving,
+                    'plan': self._plan(name, versions, lockfile.kind),
+                })
+        duplicates.sort(key=lambda entry: (-(entry['estimated_saving'] or {}).get('raw', 0), -entry['shipped_raw'],
+                                           not entry['production'], entry['package']))
+
+        drift = {}
+        if len(self.lockfiles) > 1:
+            names = set.intersection(*(set(lockfile.packages) for lockfile in self.lockfiles.values()))
+            for name in sorted(names):
+                resolved = {lockfile_name: sorted(lockfile.packages[name], key=parse_version)
+                            for lockfile_name, lockfile in self.lockfiles.items()}
+                if len({tuple(versions) for versions in resolved.values()}) > 1:
+                    drift[name] = resolved
+
+        # A package duplicated in both lockfiles only ships from one install, so count it once
+        savings: Dict[str, Dict] = {}
+        for entry in duplicates:
+            if entry['estimated_saving'] and entry['package'] not in savings:
+                savings[entry['package']] = entry['estimated_saving']
+        return {
+            'bundle': report.get('commit'),
+            'lockfiles': {name: {'format': lockfile.kind, 'lockfile_version': lockfile.lockfile_version,
+                                 'packages': len(lockfile.packages), 'duplicates': len(lockfile.duplicates())}
+                          for name, lockfile in self.lockfiles.items()},
+            'duplicates': duplicates,
+            'lockfile_drift': drift,
+            'estimated_saving': {'raw': sum(saving['raw'] for saving in savings.values()),
+                                 'gzip': sum(saving['gzip'] for saving in savings.values())},
+        }
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    options = dict(arg[2:].split('=', 1) for arg in sys.argv[1:] if arg.startswith('--') and '=' in arg)
+    project_root = args[0] if args else "/workspace/claimguru"
+    if '--analyze' in sys.argv:
+        bundle_report = BundleCompositionAnalyzer(project_root).analyze()
+    else:
+        history = BundleHistory()
+        commit = options.get('bundle') or next((build['commit'] for build in history.builds(1)), None)
+        bundle_report = history.get(commit) if commit else None
+    report = LockfileDuplicateAnalyzer(project_root, bundle_report).analyze()
+    if '--json' in sys.argv:
+        print(json.dumps(report, indent=2))
+        return
+
+    for name, stats in report['lockfiles'].items():
+        print(f"🔒 {name} (v{stats['lockfile_version']}): {stats['packages']} packages, "
+              f"{stats['duplicates']} resolved at more than one version")
+    if report['bundle']:
+        print(f"📦 Weighted by bundle {report['bundle']}")
+    else:
+        print("⚠️ No bundle composition recorded; run bundle_composition.py (or pass --analyze) to rank by shipped bytes")
+    shipping = [entry for entry in report['duplicates'] if entry['shipped_raw']]
+    print(f"🧬 Duplicates that ship in the bundle: {len(shipping)}")
+    for entry in report['duplicates'][:20]:
+        versions = ', '.join(f"{version}{'' if info['shipped_raw'] else ' (not shipped)'}"
+                             for version, info in entry['versions'].items())
+        saving = entry['estimated_saving']
+        saving_label = f"save ~{saving['raw'] / 1024:.1f} KB raw / {saving['gzip'] / 1024:.1f} KB gzip" \
+            if saving else f"{entry['shipped_raw'] / 1024:.1f} KB shipped" if entry['shipped_raw'] else \
+            "not in bundle" if entry['production'] else "dev only"
+        plan = entry['plan']
+        print(f"   {entry['package']} [{entry['lockfile']}] {versions} — {saving_label}")
+        if plan['action'] == 'dedupe':
+            print(f"      → {plan['command']} (every dependent accepts {plan['target']})")
+        else:
+            print(f"      → override to {plan['target']}: {json.dumps(plan['package_json'])}; "
+                  f"check {', '.join(sorted({broken['dependent'] for broken in plan['breaks']})[:4])}")
+        if plan['unverified']:
+            print(f"      ⚠️ ranges not recorded for {', '.join(plan['unverified'][:4])}; verify after installing")
+    if report['lockfile_drift']:
+        print(f"🔀 Packages the two lockfiles resolve differently: {len(report['lockfile_drift'])}")
+        for name, resolved in list(report['lockfile_drift'].items())[:10]:
+            print(f"   {name}: " + '; '.join(f"{lockfile} {', '.join(versions)}" for lockfile, versions in resolved.items()))
+    saving = report['estimated_saving']
+    print(f"💾 Estimated saving: {saving['raw'] / 1024:.1f} KB raw, {saving['gzip'] / 1024:.1f} KB gzip")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,16 +4,73 @@ Post-Cleanup Repair Script
 Fixes syntax errors introduced during debug statement cleanup
 """
 
-import os
 import re
+import sys
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+
+from analysis_cache import open_cache
+from file_inventory import open_inventory
+from syntax_validation import SyntaxValidator, SyntaxValidationUnavailable, changed_files
+
+# Lines either side of an esbuild error that a repair may touch
+REPAIR_WINDOW_LINES = 3
+MAX_REPAIR_PASSES = 4
+
+
+def _comment_orphaned_object(text: str) -> str:
+    # console.log('message:', {
+    #   key: value,
+    #   key2: value2
+    # })
+    # Became:
+    #   key: value,
+    #   key2: value2
+    # })
+    pattern = r'(\s+)(\w+):\s*([^,\n}]+),?\s*\n(\s+)(\w+):\s*([^,\n}]+)\s*\n\s*}\)'
+    return re.sub(pattern, r'\1// \2: \3,\n\4// \5: \6\n\1// })', text)
+
+
+def _drop_orphaned_closing(text: str) -> str:
+    return re.sub(r'^[ \t]*}\);?[ \t]*\n?', '', text, flags=re.MULTILINE)
+
+
+def _comment_orphaned_properties(text: str) -> str:
+    lines = text.split('\n')
+    fixed_lines = []
+    for i, line in enumerate(lines):
+        if re.match(r'^\s*(\w+):\s*[^,\n}]+,?\s*$', line):
+            prev_line = lines[i-1] if i > 0 else ''
+            next_line = lines[i+1] if i < len(lines)-1 else ''
+            # Not preceded by an opening brace or comma, not followed by object content
+            if (not prev_line.strip().endswith(('{', ',')) and
+                not next_line.strip().startswith(('}', ')')) and
+                not re.match(r'^\s*\w+:', next_line)):
+                fixed_lines.append(f"{line[:len(line) - len(line.lstrip())]}// {line.strip()}")
+                continue
+        fixed_lines.append(line)
+    return '\n'.join(fixed_lines)
+
+
+def _open_missing_try(text: str) -> str:
+    return re.sub(r'^([ \t]*)(} catch \(\w+\))', r'\1try {\n\1  // Code was here\n\1\2', text, flags=re.MULTILINE)
+
+
+# Tried in turn on each error window; the one that removes the most errors wins
+REPAIRS = [
+    ('commented orphaned object', _comment_orphaned_object),
+    ('dropped orphaned closing', _drop_orphaned_closing),
+    ('commented orphaned properties', _comment_orphaned_properties),
+    ('opened missing try', _open_missing_try),
+]
+
 
 class PostCleanupRepairTool:
-    def __init__(self, project_root: str):
+    def __init__(self, project_root: str, workers: Optional[int] = None):
         self.project_root = Path(project_root)
         self.src_root = self.project_root / "src"
         self.repairs_made = []
+        self.validator = SyntaxValidator(project_root, workers=workers, cache=open_cache())
         
     def log_repair(self, file_path: str, repair: str):
         """Log repair actions"""
@@ -21,79 +78,89 @@ class PostCleanupRepairTool:
         self.repairs_made.append(log_entry)
         print(log_entry)
         
-    def fix_broken_syntax(self):
-        """Fix common syntax errors from overly aggressive cleanup"""
+    def _failing_files(self, paths: Optional[List[Path]]) -> Dict[Path, List[Dict]]:
+        if paths is None:
+            paths = open_inventory().files(self.src_root, ('.ts', '.tsx'))
+        results = self.validator.validate_files(paths)
+        return {path: errors for path, errors in results.items() if errors}
+
+    @staticmethod
+    def _error_windows(errors: List[Dict], line_count: int) -> List[Tuple[int, int]]:
+        """0-based inclusive line ranges around each error, merged where they overlap"""
+        windows = []
+        for error in sorted(errors, key=lambda error: error['line']):
+            line = max(error['line'] - 1, 0)
+            start, end = max(line - REPAIR_WINDOW_LINES, 0), min(line + REPAIR_WINDOW_LINES, line_count - 1)
+            if windows and start <= windows[-1][1] + 1:
+                windows[-1] = (windows[-1][0], max(windows[-1][1], end))
+            else:
+                windows.append((start, end))
+        return windows
+
+    def _repair_regions(self, content: str, errors: List[Dict], repair) -> str:
+        lines = content.split('\n')
+        # Bottom-up so earlier windows keep their line numbers
+        for start, end in reversed(self._error_windows(errors, len(lines))):
+            region = repair('\n'.join(lines[start:end + 1])).split('\n')
+            lines[start:end + 1] = region
+        return '\n'.join(lines)
+
+    def fix_broken_syntax(self, paths: Optional[List[Path]] = None):
+        """Repair only the regions esbuild reports as unparseable, keeping repairs that remove errors"""
         print("🔧 PHASE 1: Fixing Broken Syntax")
-        
-        ts_files = list(self.src_root.rglob("*.ts")) + list(self.src_root.rglob("*.tsx"))
-        
-        for file_path in ts_files:
+
+        try:
+            failing = self._failing_files(paths)
+        except SyntaxValidationUnavailable as e:
+            print(f"❌ Cannot validate syntax, skipping repairs: {e}")
+            return
+        print(f"🔍 {len(failing)} files with syntax errors")
+
+        contents = {path: path.read_text(encoding='utf-8') for path in failing}
+        errors = dict(failing)
+        applied = {path: [] for path in failing}
+        for _ in range(MAX_REPAIR_PASSES):
+            # One candidate per repair and broken file, all validated in a single parallel batch
+            candidates = {}
+            for path, file_errors in errors.items():
+                if not file_errors:
+                    continue
+                for name, repair in REPAIRS:
+                    candidate = self._repair_regions(contents[path], file_errors, repair)
+                    if candidate != contents[path]:
+                        candidates[f"{name}:{path}"] = (path, name, candidate)
+            if not candidates:
+                break
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    original_content = content
-                    
-                # Fix patterns where console.log removal broke syntax
-                
-                # Pattern 1: Missing opening of console.log object
-                # console.log('message:', {
-                #   key: value,
-                #   key2: value2
-                # })
-                # Became:
-                #   key: value,
-                #   key2: value2
-                # })
-                pattern1 = r'(\s+)(\w+):\s*([^,\n}]+),?\s*\n(\s+)(\w+):\s*([^,\n}]+)\s*\n\s*}\)'
-                matches1 = re.findall(pattern1, content)
-                if matches1:
-                    # Comment out the orphaned object structure
-                    content = re.sub(pattern1, r'\1// \2: \3,\n\4// \5: \6\n\1// })', content)
-                    
-                # Pattern 2: Orphaned object closing
-                # })
-                pattern2 = r'\n\s*}\)\s*$'
-                content = re.sub(pattern2, '', content, flags=re.MULTILINE)
-                
-                # Pattern 3: Orphaned object properties
-                orphaned_props = r'^\s*(\w+):\s*[^,\n}]+,?\s*$'
-                lines = content.split('\n')
-                fixed_lines = []
-                
-                for i, line in enumerate(lines):
-                    # Check if this looks like an orphaned object property
-                    if re.match(orphaned_props, line) and ':' in line:
-                        # Look ahead and behind for context
-                        prev_line = lines[i-1] if i > 0 else ''
-                        next_line = lines[i+1] if i < len(lines)-1 else ''
-                        
-                        # If previous line doesn't end with opening brace or comma
-                        # and next line doesn't look like object content
-                        if (not prev_line.strip().endswith(('{', ',')) and 
-                            not next_line.strip().startswith(('}', ')')) and
-                            not re.match(r'^\s*\w+:', next_line)):
-                            # Comment out this orphaned property
-                            fixed_lines.append(f"      // {line.strip()}")
-                        else:
-                            fixed_lines.append(line)
-                    else:
-                        fixed_lines.append(line)
-                        
-                content = '\n'.join(fixed_lines)
-                
-                # Pattern 4: Fix missing try block openings
-                content = re.sub(r'(\s+)(} catch \(error\))', r'\1try {\n\1  // Code was here\n\1\2', content)
-                
-                # Pattern 5: Fix missing function bodies
-                content = re.sub(r'(async \w+\([^)]*\):\s*Promise<[^>]+>\s*{)\s*(})', r'\1\n    // Function body was here\n  \2', content)
-                
-                if content != original_content:
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(content)
-                    self.log_repair(str(file_path), "Fixed broken syntax")
-                    
-            except Exception as e:
-                print(f"❌ Error fixing {file_path}: {e}")
+                verdicts = self.validator.validate_contents({key: candidate for key, (_, _, candidate) in candidates.items()})
+            except SyntaxValidationUnavailable as e:
+                print(f"❌ Validation failed mid-repair, keeping verified repairs only: {e}")
+                break
+
+            progress = False
+            for path in list(errors):
+                options = [(len(verdicts[key]), name, candidate, verdicts[key])
+                           for key, (candidate_path, name, candidate) in candidates.items() if candidate_path == path]
+                if not options:
+                    continue
+                remaining, name, candidate, candidate_errors = min(options, key=lambda option: option[0])
+                if remaining < len(errors[path]):
+                    contents[path], errors[path] = candidate, candidate_errors
+                    applied[path].append(name)
+                    progress = True
+            if not progress:
+                break
+
+        for path, names in applied.items():
+            if not names:
+                print(f"⚠️ {path.relative_to(self.project_root)}: {len(errors[path])} syntax errors need a manual fix")
+                for error in errors[path][:3]:
+                    print(f"   line {error['line']}:{error['column'] + 1} {error['text']}")
+                continue
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(contents[path])
+            status = "now parses" if not errors[path] else f"{len(errors[path])} errors left"
+            self.log_repair(str(path), f"{', '.join(names)} ({len(failing[path])} errors -> {status})")
                 
     def fix_missing_imports(self):
         """Fix any missing imports for remaining components"""
@@ -132,12 +199,12 @@ class PostCleanupRepairTool:
                 except Exception as e:
                     print(f"❌ Error restoring errors in {file_path}: {e}")
                     
-    def run_repair(self):
+    def run_repair(self, paths: Optional[List[Path]] = None):
         """Execute all repair phases"""
         print("🔧 STARTING POST-CLEANUP REPAIR")
         print("=" * 40)
         
-        self.fix_broken_syntax()
+        self.fix_broken_syntax(paths)
         self.fix_missing_imports()
         self.restore_critical_console_errors()
         
@@ -155,9 +222,17 @@ class PostCleanupRepairTool:
         print(f"📄 Repair report: {report_file}")
 
 def main():
-    project_root = "/workspace/claimguru"
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    project_root = args[0] if args else "/workspace/claimguru"
+    # --changed limits validation to files that differ from HEAD
+    paths = None
+    if '--changed' in sys.argv:
+        paths = changed_files(Path(project_root))
+        if paths is None:
+            print(f"❌ --changed needs a git checkout, {project_root} is not one")
+            sys.exit(2)
     repair_tool = PostCleanupRepairTool(project_root)
-    repair_tool.run_repair()
+    repair_tool.run_repair(paths)
 
 if __name__ == "__main__":
     main()
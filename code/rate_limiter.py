@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Cross-Process API Rate Limiter
+SQLite-backed token buckets per API and key, shared by every extraction worker on the host,
+with adaptive backoff driven by 429s and rate-limit response headers
+"""
+
+import os
+import re
+import sys
+import time
+import sqlite3
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+
+DEFAULT_DB_PATH = os.environ.get("RATE_LIMIT_DB", "/workspace/.rate_limits.sqlite")
+
+# Per-minute budgets; keep a little under the provider quota so bursts never trip it
+DEFAULT_LIMITS = {
+    'openai': {'requests_per_minute': 450, 'tokens_per_minute': 180000},
+    'google_vision': {'requests_per_minute': 1600, 'tokens_per_minute': None},
+}
+
+# Adaptive rate factor: cut multiplicatively on 429, recover additively on success
+MIN_RATE_FACTOR = 0.1
+BACKOFF_FACTOR = 0.5
+RECOVERY_STEP = 0.02
+DEFAULT_BACKOFF_SECONDS = 2.0
+MAX_BACKOFF_SECONDS = 120.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    api TEXT NOT NULL,
+    key TEXT NOT NULL,
+    request_level REAL NOT NULL,
+    token_level REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    rate_factor REAL NOT NULL DEFAULT 1.0,
+    blocked_until REAL NOT NULL DEFAULT 0,
+    consecutive_429s INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (api, key)
+)
+"""
+
+
+def parse_reset_duration(value: str) -> Optional[float]:
+    """Parse OpenAI reset headers such as '1s', '250ms' or '6m0s' into seconds"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    total = 0.0
+    matched = False
+    for amount, unit in re.findall(r'(\d+(?:\.\d+)?)(ms|h|m|s)', value):
+        matched = True
+        total += float(amount) * {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}[unit]
+    return total if matched else None
+
+
+class RateLimiter:
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, limits: Optional[Dict[str, Dict]] = None):
+        self.db_path = Path(db_path)
+        self.limits = limits or DEFAULT_LIMITS
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute(SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _limits(self, api: str):
+        limits = self.limits[api]
+        return limits['requests_per_minute'], limits.get('tokens_per_minute')
+
+    def _load_bucket(self, conn: sqlite3.Connection, api: str, key: str, now: float):
+        requests_per_minute, tokens_per_minute = self._limits(api)
+        row = conn.execute(
+            "SELECT request_level, token_level, updated_at, rate_factor, blocked_until, consecutive_429s "
+            "FROM buckets WHERE api = ? AND key = ?", (api, key)).fetchone()
+        if row is None:
+            row = (float(requests_per_minute), float(tokens_per_minute or 0), now, 1.0, 0.0, 0)
+            conn.execute("INSERT INTO buckets VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (api, key) + row)
+
+        request_level, token_level, updated_at, rate_factor, blocked_until, consecutive_429s = row
+        elapsed = max(0.0, now - updated_at)
+        request_level = min(requests_per_minute, request_level + elapsed * requests_per_minute / 60 * rate_factor)
+        if tokens_per_minute:
+            token_level = min(tokens_per_minute, token_level + elapsed * tokens_per_minute / 60 * rate_factor)
+        return {
+            'request_level': request_level,
+            'token_level': token_level,
+            'rate_factor': rate_factor,
+            'blocked_until': blocked_until,
+            'consecutive_429s': consecutive_429s,
+        }
+
+    def _save_bucket(self, conn: sqlite3.Connection, api: str, key: str, bucket: Dict, now: float):
+        conn.execute(
+            "UPDATE buckets SET request_level = ?, token_level = ?, updated_at = ?, rate_factor = ?, "
+            "blocked_until = ?, consecutive_429s = ? WHERE api = ? AND key = ?",
+            (bucket['request_level'], bucket['token_level'], now, bucket['rate_factor'],
+             bucket['blocked_until'], bucket['consecutive_429s'], api, key))
+
+    def try_acquire(self, api: str, key: str = 'default', tokens: int = 0) -> float:
+        """Take one request (and `tokens` tokens) if available.
+
+        Returns 0 when granted, otherwise the number of seconds to wait before retrying.
+        """
+        requests_per_minute, tokens_per_minute = self._limits(api)
+        if tokens_per_minute:
+            tokens = min(tokens, tokens_per_minute)
+
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            bucket = self._load_bucket(conn, api, key, now)
+            rate_factor = bucket['rate_factor']
+
+            wait = max(0.0, bucket['blocked_until'] - now)
+            if bucket['request_level'] < 1:
+                wait = max(wait, (1 - bucket['request_level']) / (requests_per_minute / 60 * rate_factor))
+            if tokens_per_minute and bucket['token_level'] < tokens:
+                wait = max(wait, (tokens - bucket['token_level']) / (tokens_per_minute / 60 * rate_factor))
+
+            if wait == 0:
+                bucket['request_level'] -= 1
+                if tokens_per_minute:
+                    bucket['token_level'] -= tokens
+            self._save_bucket(conn, api, key, bucket, now)
+            conn.execute("COMMIT")
+            return wait
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def acquire(self, api: str, key: str = 'default', tokens: int = 0, timeout: Optional[float] = None) -> float:
+        """Block until the budget allows one more call; returns the seconds spent waiting"""
+        start = time.monotonic()
+        while True:
+            wait = self.try_acquire(api, key, tokens)
+            if wait == 0:
+                return time.monotonic() - start
+            if timeout is not None and time.monotonic() - start + wait > timeout:
+                raise TimeoutError(f"Rate limit for {api}/{key} not available within {timeout}s")
+            time.sleep(wait)
+
+    def observe_response(self, api: str, key: str, status_code: int, headers: Mapping[str, str]):
+        """Feed a response back into the bucket.
+
+        429s block the key until Retry-After (or an exponential backoff) and cut the
+        refill rate; x-ratelimit-remaining-* headers pull local levels down to what
+        the provider reports, so several hosts sharing one key still converge.
+        """
+        headers = {k.lower(): v for k, v in headers.items()}
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            bucket = self._load_bucket(conn, api, key, now)
+
+            if status_code == 429:
+                bucket['consecutive_429s'] += 1
+                bucket['rate_factor'] = max(MIN_RATE_FACTOR, bucket['rate_factor'] * BACKOFF_FACTOR)
+                retry_after = None
+                if headers.get('retry-after-ms'):
+                    retry_after = float(headers['retry-after-ms']) / 1000
+                elif headers.get('retry-after'):
+                    retry_after = parse_reset_duration(headers['retry-after'])
+                if retry_after is None:
+                    retry_after = min(MAX_BACKOFF_SECONDS,
+                                      DEFAULT_BACKOFF_SECONDS * 2 ** (bucket['consecutive_429s'] - 1))
+                bucket['blocked_until'] = max(bucket['blocked_until'], now + retry_after)
+                bucket['request_level'] = min(bucket['request_level'], 0.0)
+            else:
+                bucket['consecutive_429s'] = 0
+                bucket['rate_factor'] = min(1.0, bucket['rate_factor'] + RECOVERY_STEP)
+
+            for dimension in ('requests', 'tokens'):
+                remaining = headers.get(f'x-ratelimit-remaining-{dimension}')
+                if remaining is None:
+                    continue
+                level = 'request_level' if dimension == 'requests' else 'token_level'
+                bucket[level] = min(bucket[level], float(remaining))
+                reset = parse_reset_duration(headers.get(f'x-ratelimit-reset-{dimension}', ''))
+                if float(remaining) <= 0 and reset:
+                    bucket['blocked_until'] = max(bucket['blocked_until'], now + reset)
+
+            self._save_bucket(conn, api, key, bucket, now)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def status(self) -> Dict[str, Dict]:
+        """Current (refilled) state of every bucket"""
+        conn = self._connect()
+        try:
+            now = time.time()
+            rows = conn.execute("SELECT api, key FROM buckets").fetchall()
+            return {f"{api}/{key}": self._load_bucket(conn, api, key, now) for api, key in rows
+                    if api in self.limits}
+        finally:
+            conn.close()
+
+
+def main():
+    limiter = RateLimiter(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_DB_PATH)
+    print(f"📊 Rate limit buckets in {limiter.db_path}")
+    for name, bucket in limiter.status().items():
+        blocked = max(0.0, bucket['blocked_until'] - time.time())
+        print(f"  {name}: {bucket['request_level']:.1f} requests, {bucket['token_level']:.0f} tokens, "
+              f"rate x{bucket['rate_factor']:.2f}" + (f", blocked {blocked:.1f}s" if blocked else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Route Chunk Planner
+Reads the routes in App.tsx and the import graph, groups modules and packages by the
+set of routes that need them, and writes a generated Vite manualChunks config with
+projected per-route load sizes
+"""
+
+import re
+import sys
+import json
+import zlib
+from pathlib import Path
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from analysis_cache import open_cache
+from bundle_composition import APP_PACKAGE, BundleHistory
+from import_graph import ImportGraph, package_name
+from source_index import JSX_TAG_PATTERN
+
+GENERATED_CONFIG = "vite.chunks.generated.ts"
+DEFAULT_INITIAL_ROUTE = "/dashboard"
+# Groups smaller than this are merged into a neighbour rather than shipped as their own request
+MIN_CHUNK_BYTES = 20 * 1024
+ENTRY = frozenset(['(entry)'])
+
+DEFAULT_IMPORT_PATTERN = re.compile(r"""import\s+([A-Za-z_$][\w$]*)\s*(?:,\s*{([^}]*)})?\s*from\s*['"]([^'"]+)['"]""")
+NAMED_IMPORT_PATTERN = re.compile(r"""import\s*{([^}]*)}\s*from\s*['"]([^'"]+)['"]""")
+LAZY_IMPORT_PATTERN = re.compile(
+    r"""const\s+([A-Za-z_$][\w$]*)\s*=\s*(?:React\.)?lazy\(\s*\(\)\s*=>\s*import\(\s*['"]([^'"]+)['"]\s*\)""")
+ROUTE_OPEN_PATTERN = re.compile(r'<Route\b|</Route\s*>')
+PATH_ATTRIBUTE_PATTERN = re.compile(r'\bpath\s*=\s*["\']([^"\']*)["\']')
+FALLBACK_TAG_PATTERN = re.compile(r'fallback\s*=\s*{\s*<([A-Za-z_$][\w$]*)')
+
+
+def _import_bindings(content: str) -> Dict[str, Tuple[str, str]]:
+    """Local component name -> (specifier, 'static' or 'lazy') for App.tsx style imports"""
+    bindings = {}
+    for default, named, specifier in DEFAULT_IMPORT_PATTERN.findall(content):
+        bindings[default] = (specifier, 'static')
+        for name in (named or '').split(','):
+            local = name.split(' as ')[-1].strip()
+            if local:
+                bindings[local] = (specifier, 'static')
+    for named, specifier in NAMED_IMPORT_PATTERN.findall(content):
+        for name in named.split(','):
+            local = name.split(' as ')[-1].strip()
+            if local and not local.startswith('type '):
+                bindings[local] = (specifier, 'static')
+    for name, specifier in LAZY_IMPORT_PATTERN.findall(content):
+        bindings[name] = (specifier, 'lazy')
+    return bindings
+
+
+def _opening_tag_end(content: str, start: int) -> Tuple[int, bool]:
+    """End of the JSX opening tag starting at `start`, skipping braces and strings; (end, self_closing)"""
+    depth = 0
+    quote = None
+    position = start
+    while position < len(content):
+        character = content[position]
+        if quote:
+            if character == quote:
+                quote = None
+        elif character in '"\'`' and depth > 0 or character in '"\'' and depth == 0:
+            quote = character
+        elif character == '{':
+            depth += 1
+        elif character == '}':
+            depth -= 1
+        elif character == '>' and depth == 0:
+            return position + 1, content[position - 1] == '/'
+        position += 1
+    return len(content), True
+
+
+def parse_routes(content: str) -> List[Dict]:
+    """Every <Route> with its full path, the component names its element renders and its parent's index"""
+    routes = []
+    # Indexes into routes of the enclosing layout routes
+    parents: List[int] = []
+    position = 0
+    while True:
+        match = ROUTE_OPEN_PATTERN.search(content, position)
+        if not match:
+            return routes
+        if match.group().startswith('</'):
+            if parents:
+                parents.pop()
+            position = match.end()
+            continue
+        end, self_closing = _opening_tag_end(content, match.end())
+        tag = content[match.end():end]
+        path_match = PATH_ATTRIBUTE_PATTERN.search(tag)
+        parent = parents[-1] if parents else None
+        parent_path = routes[parent]['path'] if parent is not None else ''
+        if path_match:
+            path = path_match.group(1)
+            full_path = path if path.startswith('/') else f"{parent_path.rstrip('/')}/{path}"
+        else:
+            # index routes render at their parent's path
+            full_path = parent_path or '/'
+        fallbacks = set(FALLBACK_TAG_PATTERN.findall(tag))
+        components = [name for name in JSX_TAG_PATTERN.findall(tag)
+                      if name[0].isupper() and name not in fallbacks and name != 'Route']
+        routes.append({'path': full_path, 'components': components, 'parent': parent})
+        if not self_closing:
+            parents.append(len(routes) - 1)
+        position = end
+
+
+def _slug(path: str) -> str:
+    slug = re.sub(r'[^a-z0-9]+', '-', path.lower().replace(':', '')).strip('-')
+    return slug or 'root'
+
+
+class RouteChunkPlanner:
+    """Chunk plan that keeps each route's download to the modules it needs.
+
+    Every module and package reachable from a route gets a signature: the set
+    of routes whose static import closure contains it (everything the entry
+    loads belongs to all of them). Grouping by signature means no module is
+    shipped twice and no route downloads code it does not use. Groups under
+    MIN_CHUNK_BYTES are then merged into the neighbour that adds the fewest
+    unneeded bytes across routes, as long as no route gains more than
+    MIN_CHUNK_BYTES, the total stays below MIN_CHUNK_BYTES per request saved,
+    and the initial route gains nothing.
+
+    With `assume_lazy_routes`, the route pages App.tsx imports statically are
+    planned as if they were React.lazy, because a statically imported page is
+    part of the entry no matter how chunks are named; `convert_to_lazy` lists
+    the imports that have to change for the projection to hold.
+    """
+
+    def __init__(self, project_root: str, graph: Optional[ImportGraph] = None,
+                 initial_route: str = DEFAULT_INITIAL_ROUTE, assume_lazy_routes: bool = True,
+                 min_chunk_bytes: int = MIN_CHUNK_BYTES, app_file: str = "App.tsx"):
+        self.project_root = Path(project_root).resolve()
+        self.graph = graph or ImportGraph(str(self.project_root), cache=open_cache())
+        self.initial_route = initial_route
+        self.assume_lazy_routes = assume_lazy_routes
+        self.min_chunk_bytes = min_chunk_bytes
+        self.app = (self.graph.src_root / app_file).resolve()
+        self.sizes, self.size_source = self._load_sizes()
+
+    def _relative(self, module: Path) -> str:
+        return module.relative_to(self.project_root).as_posix()
+
+    def _load_sizes(self) -> Tuple[Dict[str, int], str]:
+        """Bytes per module and package: from the last sourcemapped build, else source file sizes"""
+        history = BundleHistory()
+        builds = history.builds(1)
+        report = history.get(builds[0]['commit']) if builds else None
+        if report and any(entry['package'] == APP_PACKAGE for entry in report['modules'].values()):
+            sizes = {name: entry['raw'] for name, entry in report['modules'].items() if entry['package'] == APP_PACKAGE}
+            sizes.update((f"pkg:{name}", entry['raw']) for name, entry in report['packages'].items())
+            return sizes, f"bundle {report['commit']}"
+        sizes = {}
+        for source_file in self.graph.index:
+            sizes[self._relative(source_file.path.resolve())] = source_file.size_bytes
+        return sizes, 'source files (package sizes unknown; run bundle_composition.py --build for real sizes)'
+
+    def _size(self, node: str) -> int:
+        if node in self.sizes:
+            return self.sizes[node]
+        if not node.startswith('pkg:'):
+            path = self.project_root / node
+            if path.exists():
+                return path.stat().st_size
+        return 0
+
+    def routes(self) -> List[Dict]:
+        """Routes with the modules their elements render, merged when they render the same pages"""
+        content = self.app.read_text(encoding='utf-8')
+        bindings = _import_bindings(content)
+        parsed = parse_routes(content)
+        for route in parsed:
+            modules = []
+            for name in route['components']:
+                if name not in bindings:
+                    continue
+                specifier, kind = bindings[name]
+                module = self.graph.resolve(specifier, self.app)
+                if module:
+                    modules.append((module, kind))
+            route['modules'] = modules
+
+        layouts = {route['parent'] for route in parsed if route['parent'] is not None}
+        merged: Dict[Tuple, Dict] = {}
+        names = set()
+        for number, route in enumerate(parsed):
+            # Layout routes only render through their children
+            if number in layouts:
+                continue
+            path = route['path']
+            # Child routes also render their layout route's element
+            modules = list(route['modules'])
+            parent = route['parent']
+            while parent is not None:
+                modules = parsed[parent]['modules'] + modules
+                parent = parsed[parent]['parent']
+            own = tuple(sorted({str(module) for module, _ in route['modules']}))
+            if not own:
+                continue
+            if own not in merged:
+                name = _slug(path)
+                while name in names:
+                    name += '-2'
+                names.add(name)
+                merged[own] = {'name': name, 'paths': [], 'modules': {}}
+            entry = merged[own]
+            entry['paths'].append(path)
+            entry['modules'].update((module, kind) for module, kind in modules)
+        return list(merged.values())
+
+    def _closure(self, roots: List[Path], blocked: Set[Path]) -> Set[Path]:
+        """Static closure, not following App.tsx into the route pages in `blocked`"""
+        seen = set(roots)
+        stack = list(roots)
+        while stack:
+            module = stack.pop()
+            for target, kind in self.graph.edges.get(module, ()):
+                if kind == 'dynamic' or target in seen or (module == self.app and target in blocked):
+                    continue
+                seen.add(target)
+                stack.append(target)
+        return seen
+
+    def _nodes(self, modules: Set[Path]) -> Set[str]:
+        nodes = {self._relative(module) for module in modules}
+        for module in modules:
+            for specifier in self.graph.external_imports.get(module, ()):
+                name = package_name(specifier)
+                if name and not specifier.startswith(('node:', 'http:', 'https:', 'virtual:')):
+                    nodes.add(f"pkg:{name}")
+        return nodes
+
+    def plan(self) -> Dict:
+        routes = self.routes()
+        route_pages = {module for route in routes for module, _ in route['modules'].items()
+                       if module != self.app}
+        static_pages = {module for route in routes for module, kind in route['modules'].items() if kind == 'static'}
+        blocked = route_pages if self.assume_lazy_routes else set()
+
+        entry_nodes = self._nodes(self._closure(self.graph.entry_points(), blocked))
+        route_nodes: Dict[str, Set[str]] = {}
+        for route in routes:
+            route_nodes[route['name']] = self._nodes(self._closure(list(route['modules']), blocked)) - entry_nodes
+
+        signatures: Dict[str, FrozenSet[str]] = {node: ENTRY for node in entry_nodes}
+        members = defaultdict(set)
+        for name, nodes in route_nodes.items():
+            for node in nodes:
+                members[node].add(name)
+        signatures.update((node, frozenset(names)) for node, names in members.items())
+
+        groups: Dict[Tuple[bool, FrozenSet[str]], Set[str]] = defaultdict(set)
+        for node, signature in signatures.items():
+            groups[(node.startswith('pkg:'), signature)].add(node)
+        groups = self._merge_small_groups(groups, [route['name'] for route in routes],
+                                          self._route_name(routes, self.initial_route))
+
+        chunks = self._name_chunks(groups, routes)
+        chunk_of = {node: name for name, chunk in chunks.items() for node in chunk['nodes']}
+        projections = {}
+        for route in routes:
+            needed = entry_nodes | route_nodes[route['name']]
+            loaded = {chunk_of[node] for node in needed}
+            loaded_bytes = sum(chunks[name]['bytes'] for name in loaded)
+            needed_bytes = sum(self._size(node) for node in needed)
+            projections[route['name']] = {
+                'paths': route['paths'],
+                'chunks': sorted(loaded),
+                'bytes': loaded_bytes,
+                'unneeded_bytes': loaded_bytes - needed_bytes,
+            }
+
+        return {
+            'size_source': self.size_source,
+            'initial_route': self.initial_route,
+            'assume_lazy_routes': self.assume_lazy_routes,
+            'convert_to_lazy': sorted(self._relative(module) for module in static_pages
+                                      if self.assume_lazy_routes and module in route_pages
+                                      and module not in self._closure(self.graph.entry_points(), route_pages)),
+            'chunks': {name: {'bytes': chunk['bytes'], 'routes': chunk['routes'],
+                              'modules': sorted(chunk['nodes'])} for name, chunk in chunks.items()},
+            'routes': projections,
+        }
+
+    def _route_name(self, routes: List[Dict], path: str) -> Optional[str]:
+        for route in routes:
+            if path in route['paths']:
+                return route['name']
+        return None
+
+    def _merge_small_groups(self, groups, route_names: List[str], initial: Optional[str]):
+        def expand(signature: FrozenSet[str]) -> FrozenSet[str]:
+            return frozenset(route_names) if signature == ENTRY else signature
+
+        def size(nodes: Set[str]) -> int:
+            return sum(self._size(node) for node in nodes)
+
+        groups = dict(groups)
+        while True:
+            small = sorted((key for key in groups if key[1] != ENTRY and size(groups[key]) < self.min_chunk_bytes),
+                           key=lambda key: size(groups[key]))
+            merged = False
+            for key in small:
+                vendor, signature = key
+                routes = expand(signature)
+                best = None
+                for other in groups:
+                    if other == key or other[0] != vendor or other[1] == ENTRY:
+                        continue
+                    other_routes = expand(other[1])
+                    # The initial route must not download anything extra
+                    if initial and (initial in routes) != (initial in other_routes):
+                        continue
+                    # No route may gain more than a chunk's worth of code it does not use, and
+                    # the unneeded bytes must cost less than the requests saved where both load
+                    gained = [size(groups[key])] * len(other_routes - routes) + [size(groups[other])] * len(routes - other_routes)
+                    if gained and max(gained) > self.min_chunk_bytes:
+                        continue
+                    cost = sum(gained)
+                    if cost > self.min_chunk_bytes * len(routes & other_routes):
+                        continue
+                    if best is None or cost < best[0]:
+                        best = (cost, other)
+                if best is None:
+                    continue
+                other = best[1]
+                combined = (vendor, frozenset(expand(signature) | expand(other[1])))
+                nodes = groups.pop(key) | groups.pop(other)
+                groups.setdefault(combined, set()).update(nodes)
+                merged = True
+                break
+            if not merged:
+                return groups
+
+    def _name_chunks(self, groups, routes: List[Dict]) -> Dict[str, Dict]:
+        order = [route['name'] for route in routes]
+        chunks = {}
+        for (vendor, signature), nodes in sorted(groups.items(), key=lambda item: (item[0][0], sorted(item[0][1]))):
+            if signature == ENTRY:
+                name = 'vendor' if vendor else 'app-shell'
+            else:
+                names = sorted(signature, key=order.index)
+                label = names[0] if len(names) == 1 else '-'.join(names[:2]) + (
+                    f"-and-{len(names) - 2}" if len(names) > 2 else '')
+                name = f"{'vendor' if vendor else 'route' if len(names) == 1 else 'shared'}-{label}"
+                if len(name) > 60:
+                    name = f"{'vendor' if vendor else 'shared'}-{len(names)}-routes-{zlib.crc32(label.encode()):08x}"
+            while name in chunks:
+                name += '-2'
+            chunks[name] = {'nodes': nodes, 'bytes': sum(self._size(node) for node in nodes),
+                            'routes': sorted(signature) if signature != ENTRY else ['*']}
+        return chunks
+
+
+def render_config(plan: Dict) -> str:
+    """TypeScript module exporting a manualChunks function for vite.config.ts"""
+    module_chunks = {}
+    package_chunks = {}
+    for name, chunk in plan['chunks'].items():
+        for node in chunk['modules']:
+            if node.startswith('pkg:'):
+                package_chunks[node[4:]] = name
+            else:
+                module_chunks[node] = name
+
+    lines = [
+        "// Generated by code/route_chunk_planner.py from the routes in src/App.tsx; do not edit.",
+        f"// Sizes from {plan['size_source']}",
+        "// Projected load per route:",
+    ]
+    for name, projection in sorted(plan['routes'].items(), key=lambda item: item[1]['bytes']):
+        lines.append(f"//   {', '.join(projection['paths'])}: {projection['bytes'] / 1024:.1f} KB "
+                     f"in {len(projection['chunks'])} chunks")
+    lines += [
+        "import path from 'path'",
+        "",
+        f"const MODULE_CHUNKS: Record<string, string> = {json.dumps(dict(sorted(module_chunks.items())), indent=2)}",
+        "",
+        f"const PACKAGE_CHUNKS: Record<string, string> = {json.dumps(dict(sorted(package_chunks.items())), indent=2)}",
+        "",
+        "export function manualChunks(id: string): string | undefined {",
+        "  const file = id.split('?')[0].replace(/\\\\/g, '/')",
+        "  const nodeModules = file.lastIndexOf('node_modules/')",
+        "  if (nodeModules !== -1) {",
+        "    const parts = file.slice(nodeModules + 'node_modules/'.length).split('/')",
+        "    return PACKAGE_CHUNKS[parts[0].startsWith('@') ? `${parts[0]}/${parts[1]}` : parts[0]]",
+        "  }",
+        "  return MODULE_CHUNKS[path.relative(process.cwd(), file).replace(/\\\\/g, '/')]",
+        "}",
+        "",
+    ]
+    return '\n'.join(lines)
+
+
+def write_config(project_root: str, plan: Dict) -> Path:
+    target = Path(project_root) / GENERATED_CONFIG
+    target.write_text(render_config(plan), encoding='utf-8')
+    return target
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    project_root = args[0] if args else "/workspace/claimguru"
+    planner = RouteChunkPlanner(project_root, assume_lazy_routes='--as-is' not in sys.argv)
+    plan = planner.plan()
+    if '--json' in sys.argv:
+        print(json.dumps(plan, indent=2))
+        return
+
+    print(f"🧭 {len(plan['routes'])} routes, {len(plan['chunks'])} chunks (sizes from {plan['size_source']})")
+    for name, projection in sorted(plan['routes'].items(), key=lambda item: item[1]['bytes']):
+        marker = '⭐' if plan['initial_route'] in projection['paths'] else '  '
+        print(f" {marker} {projection['bytes'] / 1024:8.1f} KB  {', '.join(projection['paths'])} "
+              f"({len(projection['chunks'])} chunks, {projection['unneeded_bytes'] / 1024:.1f} KB unneeded)")
+    if plan['convert_to_lazy']:
+        print("💤 Import these route pages with React.lazy in App.tsx for the projection to hold:")
+        for module in plan['convert_to_lazy']:
+            print(f"   - {module}")
+    if '--write' in sys.argv:
+        print(f"✅ Wrote {write_config(project_root, plan)}")
+
+
+if __name__ == "__main__":
+    main()
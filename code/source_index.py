@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Shared Source File Index
+Reads every source file under a root once and indexes contents, identifiers,
+JSX tags and import specifiers so analyzers can query usage without re-reading the tree
+"""
+
+import re
+import sys
+import time
+from pathlib import Path
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from analysis_cache import AnalysisCache, content_hash, open_cache
+from file_inventory import open_inventory
+
+# Bump whenever the patterns below change so cached parses are not reused
+SOURCE_INDEX_VERSION = '1'
+SOURCE_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx')
+SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', '.vite', 'coverage'}
+
+# Identifier tokens, with the optional group marking a call: one scan yields both sets
+TOKEN_PATTERN = re.compile(r'([A-Za-z_$][\w$]*)(\s*\()?')
+IDENTIFIER_PATTERN = re.compile(r'[A-Za-z_$][\w$]*')
+JSX_TAG_PATTERN = re.compile(r'<([A-Za-z_$][\w$]*)(?=[\s/>])')
+
+# Import forms, each tagged with how the module is pulled in. Keyword patterns lead
+# with the literal and check the word boundary afterwards, which lets the regex
+# engine skip ahead with a fast literal search
+IMPORT_FROM_PATTERN = re.compile(
+    r"""import(?<![\w$]import)\s+(?:type\s+)?([\w$*{}\s,]+?)\s*from\s*['"]([^'"]+)['"]""")
+SIDE_EFFECT_IMPORT_PATTERN = re.compile(r"""import(?<![\w$]import)\s*['"]([^'"]+)['"]""")
+DYNAMIC_IMPORT_PATTERN = re.compile(r"""import(?<![\w$]import)\s*\(\s*['"]([^'"]+)['"]\s*\)""")
+REQUIRE_PATTERN = re.compile(r"""require(?<![\w$]require)\s*\(\s*['"]([^'"]+)['"]\s*\)""")
+EXPORT_FROM_PATTERN = re.compile(
+    r"""export(?<![\w$]export)\s+(?:type\s+)?([\w$*{}\s,]+?)\s*from\s*['"]([^'"]+)['"]""")
+
+EXPORT_DECLARATION_PATTERN = re.compile(
+    r'export(?<![\w$]export)\s+(?:default\s+)?(?:declare\s+)?(?:abstract\s+)?(?:async\s+)?'
+    r'(?:function\s*\*?|class|const|let|var|interface|type|enum)\s+([\w$]+)')
+EXPORT_DEFAULT_PATTERN = re.compile(r'export(?<![\w$]export)\s+default\s+([A-Za-z_$][\w$]*)')
+EXPORT_LIST_PATTERN = re.compile(r'export(?<![\w$]export)\s+(?:type\s+)?{([^}]*)}')
+
+
+def _clause_names(clause: str) -> Set[str]:
+    """Local and exported names in an import/export clause such as `A, { B as C }`"""
+    return set(IDENTIFIER_PATTERN.findall(clause)) - {'as', 'type', 'default'}
+
+
+def _specifier_names(specifier: str) -> Set[str]:
+    """Path segments of a module specifier, without extensions (./ui/Button.tsx -> ui, Button)"""
+    names = set()
+    for segment in specifier.split('/'):
+        stem = segment.split('.')[0]
+        if stem and stem not in ('.', '..', '@'):
+            names.add(stem)
+    return names
+
+
+def parse_source(content: str) -> Dict[str, list]:
+    """Names and imports of one file as JSON-friendly lists (what the analysis cache stores)"""
+    identifiers = set()
+    called = set()
+    for name, call in TOKEN_PATTERN.findall(content):
+        identifiers.add(name)
+        if call:
+            called.add(name)
+
+    # (specifier, kind) with kind one of static, side-effect, dynamic, require, reexport
+    imports = []
+    imported_names = set()
+    exported_names = set()
+
+    for clause, specifier in IMPORT_FROM_PATTERN.findall(content):
+        imports.append((specifier, 'static'))
+        imported_names |= _clause_names(clause) | _specifier_names(specifier)
+    for specifier in SIDE_EFFECT_IMPORT_PATTERN.findall(content):
+        imports.append((specifier, 'side-effect'))
+        imported_names |= _specifier_names(specifier)
+    for specifier in DYNAMIC_IMPORT_PATTERN.findall(content):
+        imports.append((specifier, 'dynamic'))
+        imported_names |= _specifier_names(specifier)
+    for specifier in REQUIRE_PATTERN.findall(content):
+        imports.append((specifier, 'require'))
+        imported_names |= _specifier_names(specifier)
+    for clause, specifier in EXPORT_FROM_PATTERN.findall(content):
+        imports.append((specifier, 'reexport'))
+        exported_names |= _clause_names(clause) | _specifier_names(specifier)
+
+    exported_names |= set(EXPORT_DECLARATION_PATTERN.findall(content))
+    exported_names |= set(EXPORT_DEFAULT_PATTERN.findall(content)) - {'function', 'class', 'async'}
+    for clause in EXPORT_LIST_PATTERN.findall(content):
+        exported_names |= _clause_names(clause)
+
+    return {
+        'identifiers': sorted(identifiers),
+        'called': sorted(called),
+        'jsx_tags': sorted(set(JSX_TAG_PATTERN.findall(content))),
+        'imports': imports,
+        'imported_names': sorted(imported_names),
+        'exported_names': sorted(exported_names),
+    }
+
+
+class SourceFile:
+    """Everything the analyzers need from one file, extracted in a single read"""
+
+    def __init__(self, path: Path, relative_path: str, content: str,
+                 parsed: Optional[Dict[str, list]] = None, digest: Optional[str] = None):
+        self.path = path
+        self.relative_path = relative_path
+        self.content = content
+        self.content_hash = digest or content_hash(content.encode('utf-8'))
+        self.line_count = content.count('\n') + 1
+        self.size_bytes = len(content.encode('utf-8'))
+
+        parsed = parsed or parse_source(content)
+        self.identifiers: Set[str] = set(parsed['identifiers'])
+        self.called: Set[str] = set(parsed['called'])
+        self.jsx_tags: Set[str] = set(parsed['jsx_tags'])
+        self.imports: List[Tuple[str, str]] = [tuple(entry) for entry in parsed['imports']]
+        self.imported_names: Set[str] = set(parsed['imported_names'])
+        self.exported_names: Set[str] = set(parsed['exported_names'])
+
+    @property
+    def import_specifiers(self) -> List[str]:
+        return [specifier for specifier, _ in self.imports]
+
+
+class SourceIndex:
+    """One-pass index of a source tree, with inverted indexes for name lookups.
+
+    Name lookups are case-insensitive, matching the IGNORECASE reference
+    patterns the auditors have always used. With a cache, files whose content
+    hash was parsed before (by any analyzer) are not parsed again.
+    """
+
+    def __init__(self, root, extensions: Tuple[str, ...] = SOURCE_EXTENSIONS,
+                 cache: Optional[AnalysisCache] = None, snapshot=None):
+        self.root = Path(root)
+        self.extensions = extensions
+        self.cache = cache
+        # A source_snapshot.SourceSnapshot to index instead of the live tree
+        self.snapshot = snapshot
+        if snapshot is not None and not self.root.is_absolute():
+            self.root = snapshot.root / self.root
+        self.files: Dict[str, SourceFile] = {}
+        self._by_path: Dict[Path, SourceFile] = {}
+        self._jsx_tags = defaultdict(set)
+        self._called = defaultdict(set)
+        self._imported = defaultdict(set)
+        self._exported = defaultdict(set)
+        self._identifiers = defaultdict(set)
+        self.build_seconds = 0.0
+        self.build()
+
+    def _source_paths(self) -> List[Path]:
+        return open_inventory().files(self.root, self.extensions, SKIP_DIRS)
+
+    def _snapshot_files(self) -> List[Tuple[Path, str, str]]:
+        # Snapshot paths are project-relative; root is a directory inside the snapshot's project
+        loaded = []
+        for relative_path in self.snapshot.files(str(self.root), self.extensions):
+            path = self.snapshot.root / relative_path
+            if SKIP_DIRS.intersection(path.relative_to(self.root).parts[:-1]):
+                continue
+            try:
+                loaded.append((path, self.snapshot.content_hash(relative_path),
+                               self.snapshot.read_text(relative_path)))
+            except UnicodeDecodeError as e:
+                print(f"Error reading {relative_path} from {self.snapshot.path}: {e}")
+        return loaded
+
+    def _read_files(self) -> List[Tuple[Path, str, str]]:
+        loaded = []
+        for path in self._source_paths():
+            try:
+                data = path.read_bytes()
+                loaded.append((path, content_hash(data), data.decode('utf-8')))
+            except (UnicodeDecodeError, OSError) as e:
+                print(f"Error reading {path}: {e}")
+        return loaded
+
+    def build(self):
+        start = time.perf_counter()
+        loaded = self._snapshot_files() if self.snapshot else self._read_files()
+
+        if self.cache:
+            parsed = self.cache.map('source_index', SOURCE_INDEX_VERSION,
+                                    {digest: content for _, digest, content in loaded}, parse_source)
+        else:
+            parsed = {}
+        for path, digest, content in loaded:
+            self.add(SourceFile(path, str(path.relative_to(self.root)), content, parsed.get(digest), digest))
+        self.build_seconds = time.perf_counter() - start
+
+    def _postings(self, source_file: SourceFile):
+        return ((source_file.jsx_tags, self._jsx_tags), (source_file.called, self._called),
+                (source_file.imported_names, self._imported), (source_file.exported_names, self._exported),
+                (source_file.identifiers, self._identifiers))
+
+    def add(self, source_file: SourceFile):
+        relative_path = source_file.relative_path
+        if relative_path in self.files:
+            self.remove(relative_path)
+        self.files[relative_path] = source_file
+        self._by_path[source_file.path] = source_file
+        for names, index in self._postings(source_file):
+            for name in names:
+                index[name.lower()].add(relative_path)
+
+    def remove(self, relative_path: str) -> Optional[SourceFile]:
+        source_file = self.files.pop(relative_path, None)
+        if source_file is None:
+            return None
+        self._by_path.pop(source_file.path, None)
+        for names, index in self._postings(source_file):
+            for name in names:
+                postings = index.get(name.lower())
+                if postings is not None:
+                    postings.discard(relative_path)
+                    if not postings:
+                        del index[name.lower()]
+        return source_file
+
+    def update(self, path) -> Optional[SourceFile]:
+        """Re-read one file after it changed on disk; a file that is gone is dropped"""
+        path = Path(path)
+        relative_path = str(path.relative_to(self.root))
+        try:
+            data = path.read_bytes()
+            content = data.decode('utf-8')
+        except FileNotFoundError:
+            self.remove(relative_path)
+            return None
+        except (UnicodeDecodeError, OSError) as e:
+            print(f"Error reading {path}: {e}")
+            return self.files.get(relative_path)
+        digest = content_hash(data)
+        if self.cache:
+            parsed = self.cache.map('source_index', SOURCE_INDEX_VERSION, {digest: content}, parse_source)[digest]
+        else:
+            parsed = None
+        source_file = SourceFile(path, relative_path, content, parsed, digest)
+        self.add(source_file)
+        return source_file
+
+    def get(self, path) -> Optional[SourceFile]:
+        return self._by_path.get(Path(path))
+
+    def __iter__(self):
+        return iter(self.files.values())
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def files_with_identifier(self, name: str) -> Set[str]:
+        return set(self._identifiers.get(name.lower(), ()))
+
+    def files_referencing(self, name: str) -> Set[str]:
+        """Files that render, call, import or export `name` (component-style usage)"""
+        key = name.lower()
+        return (self._jsx_tags.get(key, set()) | self._called.get(key, set())
+                | self._imported.get(key, set()) | self._exported.get(key, set()))
+
+    def files_containing(self, text: str) -> Set[str]:
+        """Plain substring search over the cached contents"""
+        return {relative_path for relative_path, source_file in self.files.items() if text in source_file.content}
+
+
+def main():
+    root = sys.argv[1] if len(sys.argv) > 1 else "/workspace/claimguru/src"
+    index = SourceIndex(root, cache=open_cache())
+    imports = sum(len(source_file.imports) for source_file in index)
+    print(f"📚 Indexed {len(index)} files under {root} in {index.build_seconds:.2f}s "
+          f"({len(index._identifiers)} identifiers, {imports} imports)")
+
+
+if __name__ == "__main__":
+    main()
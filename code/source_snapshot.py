@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Memory-Mapped Source Snapshots
+Writes a project's sources into one file with a path offset index and an identifier
+index, read back through mmap so lookups, grep and "file X at commit Y" stay zero-copy
+"""
+
+import os
+import re
+import sys
+import json
+import mmap
+import time
+import struct
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from analysis_cache import content_hash
+from file_inventory import open_inventory
+from source_index import IDENTIFIER_PATTERN, SKIP_DIRS, SOURCE_EXTENSIONS
+
+DEFAULT_SNAPSHOT_DIR = os.environ.get("SOURCE_SNAPSHOT_DIR", "/workspace/.source_snapshots")
+SNAPSHOT_EXTENSIONS = SOURCE_EXTENSIONS + ('.css', '.html')
+SNAPSHOT_FORMAT_VERSION = 1
+# Magic, then the offset and length of the JSON index that follows the file contents
+SNAPSHOT_MAGIC = b'CGSNAP01'
+HEADER = struct.Struct('<8sQQ')
+
+
+def _git(project_root: Path, *args: str) -> str:
+    return subprocess.run(['git', *args], cwd=project_root, capture_output=True, text=True, check=True).stdout
+
+
+def resolve_commit(project_root: Path, ref: str = 'HEAD') -> str:
+    return _git(project_root, 'rev-parse', '--verify', f'{ref}^{{commit}}').strip()
+
+
+def _working_tree_files(project_root: Path) -> Iterator[Tuple[str, bytes]]:
+    for path in sorted(open_inventory().files(project_root, SNAPSHOT_EXTENSIONS, SKIP_DIRS)):
+        try:
+            yield path.relative_to(project_root).as_posix(), path.read_bytes()
+        except OSError as e:
+            print(f"Error reading {path}: {e}")
+
+
+def _commit_files(project_root: Path, commit: str) -> Iterator[Tuple[str, bytes]]:
+    """Blobs of the project directory at commit, streamed through one `git cat-file --batch`"""
+    listing = _git(project_root, 'ls-tree', '-r', '-z', commit, '--', '.')
+    blobs = []
+    for record in listing.split('\0'):
+        if not record:
+            continue
+        meta, path = record.split('\t', 1)
+        _, kind, sha = meta.split()
+        parts = path.split('/')
+        if kind == 'blob' and path.endswith(SNAPSHOT_EXTENSIONS) and not SKIP_DIRS.intersection(parts[:-1]):
+            blobs.append((path, sha))
+    blobs.sort()
+
+    process = subprocess.Popen(['git', 'cat-file', '--batch'], cwd=project_root,
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    def feed():
+        # Written from a thread so a full stdout pipe cannot deadlock the request stream
+        for _, sha in blobs:
+            process.stdin.write(f"{sha}\n".encode())
+        process.stdin.close()
+
+    writer = threading.Thread(target=feed, daemon=True)
+    writer.start()
+    try:
+        for path, _ in blobs:
+            header = process.stdout.readline().split()
+            size = int(header[2])
+            data = process.stdout.read(size)
+            process.stdout.read(1)
+            yield path, data
+    finally:
+        writer.join()
+        process.stdout.close()
+        process.wait()
+
+
+def build_snapshot(project_root, commit: Optional[str] = None, output: Optional[str] = None,
+                   snapshot_dir: str = DEFAULT_SNAPSHOT_DIR) -> Path:
+    """Snapshot the working tree, or the project as of `commit`; returns the snapshot path"""
+    project_root = Path(project_root).resolve()
+    start = time.perf_counter()
+    if commit:
+        commit = resolve_commit(project_root, commit)
+        label, files = commit, _commit_files(project_root, commit)
+    else:
+        try:
+            head = resolve_commit(project_root)
+            dirty = _git(project_root, 'status', '--porcelain', '--', '.').strip()
+            label = f"{head}-dirty" if dirty else head
+        except (subprocess.CalledProcessError, OSError):
+            label = 'worktree'
+        files = _working_tree_files(project_root)
+
+    target = Path(output) if output else Path(snapshot_dir) / f"{label[:12]}{label[40:]}.snap"
+    target.parent.mkdir(parents=True, exist_ok=True)
+    paths, offsets, lengths, hashes = [], [], [], []
+    identifiers: Dict[str, List[int]] = {}
+    descriptor, temporary = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            f.write(HEADER.pack(SNAPSHOT_MAGIC, 0, 0))
+            offset = HEADER.size
+            for file_id, (path, data) in enumerate(files):
+                f.write(data)
+                paths.append(path)
+                offsets.append(offset)
+                lengths.append(len(data))
+                hashes.append(content_hash(data))
+                offset += len(data)
+                for name in set(IDENTIFIER_PATTERN.findall(data.decode('utf-8', errors='ignore'))):
+                    identifiers.setdefault(name, []).append(file_id)
+            index = json.dumps({
+                'version': SNAPSHOT_FORMAT_VERSION,
+                'root': str(project_root),
+                'commit': label,
+                'created_at': time.time(),
+                'paths': paths,
+                'offsets': offsets,
+                'lengths': lengths,
+                'hashes': hashes,
+                'identifiers': identifiers,
+            }, separators=(',', ':')).encode('utf-8')
+            f.write(index)
+            f.seek(0)
+            f.write(HEADER.pack(SNAPSHOT_MAGIC, offset, len(index)))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, target)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+    print(f"📸 {len(paths)} files ({offset / (1024 * 1024):.1f} MB) from {label[:12]}{label[40:]} "
+          f"-> {target} in {time.perf_counter() - start:.2f}s")
+    return target
+
+
+class SourceSnapshot:
+    """Read-only view of a snapshot file.
+
+    Contents are slices of one mmap: view() hands out memoryviews without
+    copying, and grep() runs the regex over each file's slice of the mapping
+    without copying it out.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_offset, index_length = HEADER.unpack_from(self._map, 0)
+        if magic != SNAPSHOT_MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not a source snapshot")
+        index = json.loads(self._map[index_offset:index_offset + index_length])
+        self.root = Path(index['root'])
+        self.commit = index['commit']
+        self.created_at = index['created_at']
+        self.paths: List[str] = index['paths']
+        self._offsets: List[int] = index['offsets']
+        self._lengths: List[int] = index['lengths']
+        self._hashes: List[str] = index['hashes']
+        self._identifiers: Dict[str, List[int]] = index['identifiers']
+        self._ids = {path: file_id for file_id, path in enumerate(self.paths)}
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __contains__(self, path) -> bool:
+        return self._relative(path) in self._ids
+
+    def _relative(self, path) -> str:
+        path = Path(path)
+        if path.is_absolute():
+            try:
+                path = path.relative_to(self.root)
+            except ValueError:
+                return str(path)
+        return path.as_posix()
+
+    def view(self, path) -> memoryview:
+        file_id = self._ids[self._relative(path)]
+        start = self._offsets[file_id]
+        return memoryview(self._map)[start:start + self._lengths[file_id]]
+
+    def read_bytes(self, path) -> bytes:
+        return bytes(self.view(path))
+
+    def read_text(self, path) -> str:
+        return self.read_bytes(path).decode('utf-8')
+
+    def content_hash(self, path) -> str:
+        return self._hashes[self._ids[self._relative(path)]]
+
+    def files(self, directory: str = '', extensions: Optional[Tuple[str, ...]] = None) -> List[str]:
+        """Snapshot paths under a project-relative directory"""
+        prefix = self._relative(directory).strip('/') if directory else ''
+        prefix = f"{prefix}/" if prefix and prefix != '.' else ''
+        return [path for path in self.paths
+                if path.startswith(prefix) and (not extensions or path.endswith(extensions))]
+
+    def files_with_identifier(self, name: str) -> Set[str]:
+        return {self.paths[file_id] for file_id in self._identifiers.get(name, ())}
+
+    def grep(self, pattern: str, directory: str = '', flags: int = 0) -> Iterator[Tuple[str, int, str]]:
+        """(path, line number, line) for every match, scanning each file's slice of the mapping in place"""
+        regex = re.compile(pattern.encode('utf-8'), flags | re.MULTILINE)
+        for path in (self.files(directory) if directory else self.paths):
+            file_id = self._ids[path]
+            file_start = self._offsets[file_id]
+            file_end = file_start + self._lengths[file_id]
+            # Files are stored back to back, so each one is searched on its own
+            # memoryview for ^, $ and greedy matches to stop at its boundaries
+            line_number, counted_to = 1, file_start
+            for match in regex.finditer(memoryview(self._map)[file_start:file_end]):
+                match_start = file_start + match.start()
+                line_start = self._map.rfind(b'\n', file_start, match_start) + 1 or file_start
+                line_end = self._map.find(b'\n', match_start, file_end)
+                if line_end == -1:
+                    line_end = file_end
+                # Matches come in order, so only the stretch since the last one is counted
+                line_number += self._map[counted_to:line_start].count(b'\n')
+                counted_to = line_start
+                yield path, line_number, self._map[line_start:line_end].decode('utf-8', errors='replace')
+
+
+def snapshots(snapshot_dir: str = DEFAULT_SNAPSHOT_DIR) -> List[Path]:
+    directory = Path(snapshot_dir)
+    if not directory.exists():
+        return []
+    return sorted(directory.glob('*.snap'), key=lambda path: path.stat().st_mtime, reverse=True)
+
+
+def snapshot_for(project_root, ref: str, snapshot_dir: str = DEFAULT_SNAPSHOT_DIR) -> SourceSnapshot:
+    """Snapshot of the project at ref, building it from git objects the first time"""
+    commit = resolve_commit(Path(project_root).resolve(), ref)
+    existing = Path(snapshot_dir) / f"{commit[:12]}.snap"
+    if not existing.exists():
+        existing = build_snapshot(project_root, commit=commit, snapshot_dir=snapshot_dir)
+    return SourceSnapshot(existing)
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    options = dict(arg[2:].split('=', 1) for arg in sys.argv[1:] if arg.startswith('--') and '=' in arg)
+    command = args.pop(0) if args else 'build'
+    project_root = options.get('root', "/workspace/claimguru")
+
+    if command == 'build':
+        build_snapshot(args[0] if args else project_root, commit=options.get('commit'), output=options.get('output'))
+        return
+    if command == 'list':
+        for path in snapshots():
+            with SourceSnapshot(path) as snapshot:
+                print(f"   {snapshot.commit[:12]}{snapshot.commit[40:]:7} {len(snapshot):5d} files  "
+                      f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(snapshot.created_at))}  {path}")
+        return
+
+    if 'snapshot' in options:
+        snapshot = SourceSnapshot(options['snapshot'])
+    else:
+        snapshot = snapshot_for(project_root, options.get('commit', 'HEAD'))
+    with snapshot:
+        if command == 'show' and args:
+            sys.stdout.buffer.write(snapshot.view(args[0]))
+        elif command == 'grep' and args:
+            for path, line_number, line in snapshot.grep(args[0], options.get('dir', '')):
+                print(f"{path}:{line_number}:{line}")
+        elif command == 'where' and args:
+            for path in sorted(snapshot.files_with_identifier(args[0])):
+                print(path)
+        else:
+            print("Usage: source_snapshot.py [build|list|show PATH|grep PATTERN|where IDENTIFIER] "
+                  "[--root=DIR] [--commit=REF] [--snapshot=FILE] [--output=FILE] [--dir=SUBDIR]")
+            sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,21 @@
 #!/usr/bin/env python3
 """
 Surgical Codebase Cleanup Tool
-Carefully removes unused components one by one with build verification
+Carefully removes unused components with build verification, bisecting batches
+of candidates so only the groups that break the build are retried; --trials first
+screens every candidate in parallel sandboxes
 """
 
 import os
+import sys
 import subprocess
 import json
 import shutil
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
+
+from build_trials import Trial, TrialRunner
+from file_inventory import open_inventory
 
 class SurgicalCleanupTool:
     def __init__(self, project_root: str):
@@ -17,9 +23,13 @@ class SurgicalCleanupTool:
         self.src_root = self.project_root / "src"
         self.removed_components = []
         self.failed_removals = []
+        self.build_count = 0
+        # Source of each removed component, parallel to removed_components
+        self._removed_sources: List[str] = []
         
     def test_build(self) -> Tuple[bool, str]:
         """Test if the project builds successfully"""
+        self.build_count += 1
         try:
             result = subprocess.run(
                 ['pnpm', 'build'],
@@ -70,10 +80,10 @@ class SurgicalCleanupTool:
         component_name = component_path.stem
         
         # Search for imports of this component
-        search_extensions = ['.ts', '.tsx', '.js', '.jsx']
+        search_extensions = ('.ts', '.tsx', '.js', '.jsx')
         
-        for file_path in self.src_root.rglob('*'):
-            if file_path.suffix in search_extensions and file_path != component_path:
+        for file_path in open_inventory().files(self.src_root, search_extensions):
+            if file_path != component_path:
                 try:
                     with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                         content = f.read()
@@ -138,7 +148,122 @@ class SurgicalCleanupTool:
                 shutil.move(backup_path, component_path)
             return False
             
-    def surgical_cleanup(self):
+    def _stash(self, component_paths: List[Path]):
+        for component_path in component_paths:
+            shutil.move(component_path, component_path.with_suffix('.backup'))
+
+    def _restore(self, component_paths: List[Path]):
+        for component_path in component_paths:
+            backup_path = component_path.with_suffix('.backup')
+            if backup_path.exists():
+                shutil.move(backup_path, component_path)
+
+    def _remove_group(self, group: List[Path], failures: Dict[Path, Tuple[str, int]],
+                      known_to_fail: bool = False) -> bool:
+        """Remove a whole group with one build; on failure bisect it, keeping what passes.
+
+        Returns True when the whole group was removed. `known_to_fail` skips the
+        build for a half whose sibling just passed: the failure must be in it.
+        """
+        if not known_to_fail or len(group) == 1:
+            print(f"🗑️ Testing removal of {len(group)} component(s): "
+                  f"{', '.join(path.name for path in group[:3])}{' ...' if len(group) > 3 else ''}")
+            self._stash(group)
+            try:
+                build_success, build_output = self.test_build()
+            except BaseException:
+                self._restore(group)
+                raise
+
+            if build_success:
+                for component_path in group:
+                    backup_path = component_path.with_suffix('.backup')
+                    self._removed_sources.append(backup_path.read_text(encoding='utf-8', errors='ignore'))
+                    backup_path.unlink()
+                    self.removed_components.append(str(component_path))
+                    failures.pop(component_path, None)
+                print(f"✅ Removed {len(group)} component(s)")
+                return True
+
+            self._restore(group)
+            if len(group) == 1:
+                print(f"❌ Build failed without {group[0].name}, keeping it")
+                # Remember how many removals had happened: later ones may free it
+                failures[group[0]] = (build_output[:500], len(self.removed_components))
+                return False
+
+        middle = len(group) // 2
+        first_removed = self._remove_group(group[:middle], failures)
+        self._remove_group(group[middle:], failures, known_to_fail=first_removed)
+        return False
+
+    def remove_components_batch(self, component_paths: List[Path]) -> List[Path]:
+        """Remove as many components as the build allows, ddmin-style.
+
+        Each group is removed with a single build and only failing groups are
+        split, so verifying n candidates of which k are needed costs about
+        k * log2(n) builds instead of n. A component that is only imported by
+        another candidate fails while that one is still present, so a failed
+        component is retried in another round when a component removed after
+        its failure mentioned it.
+        """
+        candidates = []
+        for component_path in component_paths:
+            if self.check_component_usage(component_path):
+                print(f"⚠️ {component_path.name} appears to be used, skipping")
+            else:
+                candidates.append(component_path)
+
+        failures: Dict[Path, Tuple[str, int]] = {}
+        remaining = candidates
+        round_number = 1
+        while remaining:
+            print(f"🔁 Round {round_number}: {len(remaining)} candidate(s)")
+            self._remove_group(remaining, failures)
+            remaining = [path for path in remaining if path in failures and any(
+                path.stem in source for source in self._removed_sources[failures[path][1]:])]
+            round_number += 1
+
+        for component_path, (build_output, _) in failures.items():
+            self.failed_removals.append({
+                'file': str(component_path),
+                'reason': 'Build failure',
+                'error': build_output
+            })
+        return [path for path in candidates if str(path) in self.removed_components]
+
+    def screen_candidates(self, component_paths: List[Path], workers: Optional[int] = None) -> List[Path]:
+        """Try removing each candidate on its own in a parallel sandbox; keep the ones that still build.
+
+        Sandbox trials type-check and bundle without touching the real tree, so
+        the batch removal that follows only has to confirm the survivors
+        together. A candidate whose new errors all sit in other candidates is
+        only imported by them and is passed on to the batch, which retries it
+        once they are gone; other candidates that fail alone are recorded and
+        left in place.
+        """
+        root = self.project_root.resolve()
+        relative_paths = [path.resolve().relative_to(root) for path in component_paths]
+        candidate_files = {str(relative) for relative in relative_paths}
+        runner = TrialRunner(str(self.project_root), workers=workers)
+        trials = [Trial(str(path), remove=[relative]) for path, relative in zip(component_paths, relative_paths)]
+        survivors = []
+        for component_path, result in zip(component_paths, runner.run(trials)):
+            error_files = {os.path.normpath(error.split(': ', 1)[0]) for error in result['new_errors']}
+            if result['success']:
+                survivors.append(component_path)
+            elif result['stage'] == 'tsc' and error_files and error_files <= candidate_files:
+                print(f"🔗 {component_path.name} only breaks other candidates, deferring to the batch")
+                survivors.append(component_path)
+            else:
+                print(f"❌ {component_path.name} fails alone ({result['stage']}), keeping it")
+                self.failed_removals.append({'file': str(component_path),
+                    'reason': f"Trial failure ({result['stage']})",
+                    'error': '\n'.join(result['new_errors'])[:500] or result['output'][:500]})
+        print(f"🧪 {len(survivors)}/{len(component_paths)} candidates passed their sandbox trial")
+        return survivors
+
+    def surgical_cleanup(self, batch: bool = True, trials: bool = False):
         """Perform careful, tested cleanup"""
         print("🔬 STARTING SURGICAL CLEANUP")
         print("=" * 40)
@@ -176,13 +301,24 @@ class SurgicalCleanupTool:
             
         print(f"📊 Found {len(unused_components)} components to check")
         
-        # Process each component
+        existing = []
         for component_path_str in unused_components:
             component_path = Path(component_path_str)
             if component_path.exists():
-                self.remove_component_safely(component_path)
+                existing.append(component_path)
             else:
                 print(f"⚠️ {component_path.name} not found, skipping")
+
+        if trials:
+            existing = self.screen_candidates(existing)
+
+        if batch:
+            self.remove_components_batch(existing)
+        else:
+            # Process each component
+            for component_path in existing:
+                self.remove_component_safely(component_path)
+        print(f"🏗️ Verified with {self.build_count} builds")
                 
         # Generate report
         self.generate_surgical_report()
@@ -229,7 +365,8 @@ class SurgicalCleanupTool:
         with open(report_path, 'w') as f:
             f.write("# Surgical Codebase Cleanup Report\n\n")
             f.write(f"**Successfully Removed**: {len(self.removed_components)} components\n")
-            f.write(f"**Failed Removals**: {len(self.failed_removals)} components\n\n")
+            f.write(f"**Failed Removals**: {len(self.failed_removals)} components\n")
+            f.write(f"**Builds Run**: {self.build_count}\n\n")
             
             if self.removed_components:
                 f.write("## Successfully Removed Components\n\n")
@@ -249,7 +386,9 @@ class SurgicalCleanupTool:
 def main():
     project_root = "/workspace/claimguru"
     tool = SurgicalCleanupTool(project_root)
-    tool.surgical_cleanup()
+    # --sequential restores the one-build-per-component mode; --trials screens
+    # candidates in parallel sandboxes before touching the real tree
+    tool.surgical_cleanup(batch='--sequential' not in sys.argv, trials='--trials' in sys.argv)
 
 if __name__ == "__main__":
     main()
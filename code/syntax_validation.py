@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Parallel Syntax Validation
+Transpiles source files with esbuild in a pool of workers and reports the exact
+range of every syntax error, caching clean results by content hash
+"""
+
+import os
+import sys
+import json
+import shutil
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from analysis_cache import AnalysisCache, content_hash, open_cache
+
+# Bump when the esbuild options below change so cached verdicts are not reused
+SYNTAX_VALIDATION_VERSION = '1'
+VALIDATION_TIMEOUT_SECONDS = 120
+LOADERS = {'.ts': 'ts', '.tsx': 'tsx', '.js': 'js', '.jsx': 'jsx', '.mjs': 'js'}
+
+# Reads [{file, content, loader}] on stdin, writes [{file, errors}] on stdout.
+# esbuild.transform runs in esbuild's own thread pool, so one process per
+# worker keeps every core busy without a process per file.
+ESBUILD_WORKER = r"""
+const esbuild = require('esbuild');
+const fs = require('fs');
+const files = JSON.parse(fs.readFileSync(0, 'utf8'));
+Promise.all(files.map(async ({ file, content, loader }) => {
+  try {
+    await esbuild.transform(content, { loader, sourcefile: file, logLevel: 'silent' });
+    return { file, errors: [] };
+  } catch (error) {
+    const messages = error.errors || [{ text: String(error.message || error) }];
+    return { file, errors: messages.map(message => ({
+      text: message.text,
+      line: message.location ? message.location.line : 0,
+      column: message.location ? message.location.column : 0,
+      length: message.location ? message.location.length : 0,
+    })) };
+  }
+})).then(results => process.stdout.write(JSON.stringify(results)));
+"""
+
+
+class SyntaxValidationUnavailable(RuntimeError):
+    """node or the project's esbuild package is missing"""
+
+
+class SyntaxValidator:
+    """Checks whether files parse, without type checking or bundling.
+
+    Each error carries its 1-based line, 0-based column and length, so
+    callers can repair exactly the broken region. Contents are validated
+    from memory, which lets a repair be checked before it is written.
+    """
+
+    def __init__(self, project_root: str, workers: Optional[int] = None,
+                 cache: Optional[AnalysisCache] = None):
+        self.project_root = Path(project_root).resolve()
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = cache
+        self.node = shutil.which('node')
+
+    def _run_batch(self, batch: List[Dict]) -> List[Dict]:
+        if self.node is None:
+            raise SyntaxValidationUnavailable("node is not installed")
+        try:
+            result = subprocess.run([self.node, '-e', ESBUILD_WORKER], cwd=self.project_root, input=json.dumps(batch),
+                                    capture_output=True, text=True, timeout=VALIDATION_TIMEOUT_SECONDS)
+        except subprocess.TimeoutExpired:
+            raise SyntaxValidationUnavailable("esbuild validation timed out")
+        if result.returncode != 0:
+            if "Cannot find module 'esbuild'" in result.stderr:
+                raise SyntaxValidationUnavailable(f"esbuild is not installed in {self.project_root}/node_modules")
+            raise SyntaxValidationUnavailable(result.stderr.strip()[-500:])
+        return json.loads(result.stdout)
+
+    def validate_contents(self, contents: Dict[str, str]) -> Dict[str, List[Dict]]:
+        """Syntax errors for each name -> content; an empty list means the file parses"""
+        hashes = {name: content_hash(content.encode('utf-8')) for name, content in contents.items()}
+        known = self.cache.get_many('esbuild_syntax', SYNTAX_VALIDATION_VERSION, hashes.values()) if self.cache else {}
+
+        pending = [{'file': name, 'content': content, 'loader': LOADERS.get(Path(name).suffix, 'tsx')}
+                   for name, content in contents.items() if hashes[name] not in known]
+        results = {}
+        if pending:
+            # Largest files first so the batches come out roughly even
+            pending.sort(key=lambda entry: -len(entry['content']))
+            batches = [pending[i::self.workers] for i in range(min(self.workers, len(pending)))]
+            with ThreadPoolExecutor(max_workers=len(batches)) as pool:
+                for batch_results in pool.map(self._run_batch, batches):
+                    for entry in batch_results:
+                        results[entry['file']] = entry['errors']
+            if self.cache:
+                self.cache.put_many('esbuild_syntax', SYNTAX_VALIDATION_VERSION,
+                                    {hashes[name]: errors for name, errors in results.items()})
+
+        for name in contents:
+            if name not in results:
+                results[name] = known[hashes[name]]
+        return results
+
+    def validate_files(self, paths: List[Path]) -> Dict[Path, List[Dict]]:
+        contents = {}
+        for path in paths:
+            try:
+                contents[str(path)] = path.read_text(encoding='utf-8')
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"Error reading {path}: {e}")
+        return {Path(name): errors for name, errors in self.validate_contents(contents).items()}
+
+
+def changed_files(project_root: Path, directory: str = "src") -> Optional[List[Path]]:
+    """Source files that differ from HEAD (modified or untracked), or None outside a git checkout"""
+    try:
+        modified = subprocess.run(['git', 'diff', '--name-only', '--relative', 'HEAD', '--', directory],
+                                  cwd=project_root, capture_output=True, text=True, check=True).stdout.split()
+        untracked = subprocess.run(['git', 'ls-files', '--others', '--exclude-standard', '--', directory],
+                                   cwd=project_root, capture_output=True, text=True, check=True).stdout.split()
+    except (subprocess.CalledProcessError, OSError):
+        return None
+    return sorted({project_root / name for name in modified + untracked
+                   if Path(name).suffix in LOADERS and (project_root / name).exists()})
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    project_root = Path(args[0] if args else "/workspace/claimguru")
+    if '--changed' in sys.argv:
+        paths = changed_files(project_root)
+        if paths is None:
+            print(f"❌ --changed needs a git checkout, {project_root} is not one")
+            sys.exit(2)
+    else:
+        paths = sorted(path for path in (project_root / "src").rglob('*') if path.suffix in LOADERS)
+    validator = SyntaxValidator(str(project_root), cache=open_cache())
+    try:
+        results = validator.validate_files(paths)
+    except SyntaxValidationUnavailable as e:
+        print(f"❌ Cannot validate: {e}")
+        sys.exit(2)
+    failing = {path: errors for path, errors in results.items() if errors}
+    print(f"🔍 {len(results)} files checked, {len(failing)} with syntax errors")
+    for path, errors in sorted(failing.items()):
+        for error in errors:
+            print(f"   {path.relative_to(project_root)}:{error['line']}:{error['column'] + 1}: {error['text']}")
+    sys.exit(1 if failing else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Tailwind Class Usage Analyzer
+Tokenizes class strings (className, clsx/cn/cva calls, class lookup tables, template literals)
+and compares them with the built CSS to find dead safelist entries, purge-defeating dynamic
+classes and the bytes each unused utility group costs
+"""
+
+import os
+import re
+import sys
+import json
+import fnmatch
+from bisect import bisect_right
+from pathlib import Path
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from analysis_cache import AnalysisCache, content_hash, open_cache
+from file_inventory import open_inventory
+from source_index import SourceIndex
+
+# Bump when extract_class_usage changes what it records per file
+TAILWIND_USAGE_VERSION = '1'
+PARALLEL_MIN_FILES = 200
+CONFIG_NAMES = ('tailwind.config.js', 'tailwind.config.ts', 'tailwind.config.cjs', 'tailwind.config.mjs')
+
+CLASS_HELPERS = ('clsx', 'cn', 'cva', 'cx', 'twMerge', 'twJoin', 'classNames', 'classnames')
+CLASS_ATTRIBUTE_PATTERN = re.compile(r'\b(?:className|class)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|{)')
+CLASS_CALL_PATTERN = re.compile(r'\b(?:%s)\s*\(' % '|'.join(CLASS_HELPERS))
+STRING_PATTERN = re.compile(r"'(?:[^'\\\n]|\\.)*'|\"(?:[^\"\\\n]|\\.)*\"|`(?:[^`\\]|\\.)*`", re.DOTALL)
+INTERPOLATION_PATTERN = re.compile(r'\$\{(?:[^{}]|\{[^{}]*\})*\}')
+# A class candidate: optional variants (hover:, md:, [&>*]:), optional ! or -, then the utility
+CLASS_TOKEN_PATTERN = re.compile(r'^(?:[\w\[\]@&>*.=/-]+:)*!?-?[a-z@\[][\w./%\[\]#(),=:\'"-]*$')
+CSS_CLASS_PATTERN = re.compile(r'\.((?:\\.|[\w-])+)')
+SAFELIST_PATTERN = re.compile(r'\bsafelist\s*:\s*\[')
+SAFELIST_ENTRY_PATTERN = re.compile(r"pattern\s*:\s*/((?:[^/\\\n]|\\.)+)/[a-z]*|'([^']+)'|\"([^\"]+)\"|`([^`]+)`")
+
+# Utility groups, longest prefix first when grouping. Anything else falls back to its first segment
+COMPOUND_GROUPS = (
+    'grid-cols', 'grid-rows', 'grid-flow', 'col-span', 'col-start', 'col-end', 'row-span', 'row-start', 'row-end',
+    'auto-cols', 'auto-rows', 'space-x', 'space-y', 'gap-x', 'gap-y', 'inset-x', 'inset-y', 'min-w', 'max-w',
+    'min-h', 'max-h', 'translate-x', 'translate-y', 'scale-x', 'scale-y', 'skew-x', 'skew-y', 'ring-offset',
+    'divide-x', 'divide-y', 'line-clamp', 'border-t', 'border-b', 'border-l', 'border-r', 'border-x', 'border-y',
+    'rounded-t', 'rounded-b', 'rounded-l', 'rounded-r', 'rounded-tl', 'rounded-tr', 'rounded-bl', 'rounded-br',
+    'scroll-m', 'scroll-p', 'backdrop-blur', 'drop-shadow', 'list-style', 'fade-in', 'slide-in', 'zoom-in',
+    'fade-out', 'slide-out', 'zoom-out', 'animate-in', 'animate-out',
+)
+UTILITY_GROUPS = {
+    'bg', 'text', 'font', 'border', 'rounded', 'ring', 'shadow', 'outline', 'divide', 'p', 'px', 'py', 'pt', 'pb',
+    'pl', 'pr', 'm', 'mx', 'my', 'mt', 'mb', 'ml', 'mr', 'w', 'h', 'size', 'top', 'bottom', 'left', 'right', 'inset',
+    'z', 'gap', 'flex', 'grid', 'order', 'basis', 'grow', 'shrink', 'justify', 'items', 'content', 'self', 'place',
+    'opacity', 'scale', 'rotate', 'translate', 'skew', 'origin', 'transition', 'duration', 'ease', 'delay',
+    'animate', 'from', 'via', 'to', 'fill', 'stroke', 'leading', 'tracking', 'whitespace', 'break', 'overflow',
+    'object', 'cursor', 'select', 'pointer', 'resize', 'align', 'list', 'decoration', 'underline', 'accent',
+    'caret', 'blur', 'brightness', 'contrast', 'grayscale', 'invert', 'saturate', 'sepia', 'backdrop', 'aspect',
+    'columns', 'table', 'sr', 'not', 'line', 'indent', 'placeholder', 'col', 'row', 'space', 'min', 'max',
+    'scroll', 'snap', 'touch', 'will', 'mix', 'isolation', 'float', 'clear', 'box', 'container', 'prose', 'spin',
+    'ping', 'pulse', 'bounce', 'visible', 'invisible', 'hidden', 'block', 'inline', 'contents', 'static', 'fixed',
+    'absolute', 'relative', 'sticky', 'truncate', 'uppercase', 'lowercase', 'capitalize', 'italic', 'antialiased',
+    'group', 'peer', 'ordinal', 'tabular', 'filter', 'transform', 'appearance', 'outline', 'zoom', 'slide', 'fade',
+} | set(COMPOUND_GROUPS)
+
+
+def utility_name(class_name: str) -> str:
+    """The utility without variants or modifiers: md:hover:-translate-x-2 -> translate-x-2"""
+    depth, start = 0, 0
+    for position, char in enumerate(class_name):
+        if char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+        elif char == ':' and depth == 0:
+            start = position + 1
+    return class_name[start:].lstrip('!').lstrip('-')
+
+
+def utility_group(class_name: str) -> str:
+    utility = utility_name(class_name)
+    for compound in COMPOUND_GROUPS:
+        if utility == compound or utility.startswith(compound + '-'):
+            return compound
+    return utility.split('-', 1)[0] or utility
+
+
+def _is_utility(token: str) -> bool:
+    return bool(CLASS_TOKEN_PATTERN.match(token)) and utility_group(token) in UTILITY_GROUPS
+
+
+def _balanced_end(content: str, start: int, opening: str, closing: str) -> int:
+    """Index just past the bracket matching the one before `start`, skipping string literals"""
+    depth = 1
+    position = start
+    while position < len(content) and depth:
+        literal = STRING_PATTERN.match(content, position)
+        if literal:
+            position = literal.end()
+            continue
+        char = content[position]
+        if char == opening:
+            depth += 1
+        elif char == closing:
+            depth -= 1
+        position += 1
+    return position
+
+
+def _class_regions(content: str) -> List[Tuple[int, int]]:
+    """Spans of className attributes and class helper calls; every string inside them is a class string"""
+    regions = []
+    for match in CLASS_ATTRIBUTE_PATTERN.finditer(content):
+        if match.group(0).endswith('{'):
+            regions.append((match.end(), _balanced_end(content, match.end(), '{', '}')))
+        else:
+            regions.append((match.start(), match.end()))
+    for match in CLASS_CALL_PATTERN.finditer(content):
+        regions.append((match.end(), _balanced_end(content, match.end(), '(', ')')))
+    merged: List[Tuple[int, int]] = []
+    # cn() inside className={...} nests; merge so a bisect on the start finds the enclosing span
+    for start, end in sorted(regions):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _string_literals(content: str, offset: int = 0):
+    """(position, body, is_template) for every literal, including those nested in ${...}"""
+    for match in STRING_PATTERN.finditer(content):
+        literal = match.group(0)
+        yield offset + match.start(), literal[1:-1], literal[0] == '`'
+        if literal[0] == '`':
+            for interpolation in INTERPOLATION_PATTERN.finditer(literal):
+                yield from _string_literals(interpolation.group(0)[2:-1],
+                                            offset + match.start() + interpolation.start() + 2)
+
+
+def extract_class_usage(content: str) -> Dict[str, list]:
+    """Class tokens and dynamically built class patterns in one file (JSON-friendly for the cache)"""
+    regions = _class_regions(content)
+    starts = [start for start, _ in regions]
+
+    def in_region(position: int) -> bool:
+        index = bisect_right(starts, position) - 1
+        return index >= 0 and position < regions[index][1]
+
+    classes: Set[str] = set()
+    dynamic = []
+    literals = list(_string_literals(content))
+    # Plain attribute values (className="...") are matched by the attribute pattern, not as JS strings
+    for match in CLASS_ATTRIBUTE_PATTERN.finditer(content):
+        value = match.group(1) if match.group(1) is not None else match.group(2)
+        if value is not None:
+            classes.update(token for token in value.split() if CLASS_TOKEN_PATTERN.match(token))
+
+    for start, body, is_template in literals:
+        static = INTERPOLATION_PATTERN.sub(' ', body) if is_template else body
+        tokens = static.split()
+        if not tokens:
+            continue
+        in_class_context = in_region(start)
+        if not in_class_context:
+            # Outside className/clsx, only strings made entirely of utilities count (lookup tables, cva variants)
+            utilities = [token for token in tokens if _is_utility(token)]
+            if len(utilities) != len(tokens):
+                continue
+        classes.update(token for token in tokens if CLASS_TOKEN_PATTERN.match(token))
+
+        if is_template and '${' in body:
+            for word in INTERPOLATION_PATTERN.sub('\0', body).split():
+                if '\0' not in word:
+                    continue
+                pattern = word.replace('\0', '*')
+                fragment = pattern.replace('*', '')
+                if not fragment or pattern.startswith('*') and not fragment.startswith(('-', ':')):
+                    # ${className} passthrough, or a suffix on a value we cannot see
+                    continue
+                if utility_group(pattern.replace('*', 'x')) in UTILITY_GROUPS and (in_class_context or '-*' in pattern):
+                    dynamic.append({'pattern': pattern, 'line': content.count('\n', 0, start) + 1})
+
+    return {'classes': sorted(classes), 'dynamic': dynamic}
+
+
+def parse_css_rules(css: str) -> List[Tuple[str, int]]:
+    """(selector, bytes) for every style rule, descending into @media/@supports/@layer blocks"""
+    rules = []
+    position, length = 0, len(css)
+    start = 0
+    while position < length:
+        char = css[position]
+        if char == '/' and css.startswith('/*', position):
+            end = css.find('*/', position + 2)
+            position = length if end == -1 else end + 2
+            start = position
+            continue
+        if char in '"\'':
+            literal = STRING_PATTERN.match(css, position)
+            position = literal.end() if literal else position + 1
+            continue
+        if char == ';':
+            start = position + 1
+        elif char == '}':
+            start = position + 1
+        elif char == '{':
+            prelude = css[start:position].strip()
+            if prelude.startswith(('@media', '@supports', '@layer', '@container', '@document')):
+                start = position + 1
+            else:
+                end = _balanced_end(css, position + 1, '{', '}')
+                if not prelude.startswith('@'):
+                    rules.append((prelude, end - start))
+                position = start = end
+                continue
+        position += 1
+    return rules
+
+
+def css_class_bytes(css: str) -> Dict[str, int]:
+    """Bytes of built CSS attributable to each class, splitting shared rules evenly"""
+    sizes: Dict[str, int] = defaultdict(int)
+    for selector, size in parse_css_rules(css):
+        names = {re.sub(r'\\(.)', r'\1', name) for name in CSS_CLASS_PATTERN.findall(selector)}
+        for name in names:
+            sizes[name] += size // len(names)
+    return dict(sizes)
+
+
+def parse_safelist(config: str) -> List[Dict]:
+    match = SAFELIST_PATTERN.search(config)
+    if not match:
+        return []
+    body = config[match.end():_balanced_end(config, match.end(), '[', ']') - 1]
+    entries = []
+    for pattern, *strings in SAFELIST_ENTRY_PATTERN.findall(body):
+        if pattern:
+            entries.append({'pattern': pattern})
+        else:
+            entries.append({'class': next(value for value in strings if value)})
+    return entries
+
+
+class TailwindUsageAnalyzer:
+    """Class usage across the Tailwind content files versus what the CSS build emitted"""
+
+    def __init__(self, project_root: str, css_path: Optional[str] = None, index: Optional[SourceIndex] = None,
+                 cache: Optional[AnalysisCache] = None, workers: Optional[int] = None):
+        self.project_root = Path(project_root)
+        self.css_path = Path(css_path) if css_path else self.project_root / "dist"
+        self.cache = cache
+        self.index = index or SourceIndex(self.project_root / "src", cache=cache)
+        self.workers = workers or os.cpu_count() or 1
+
+    def _contents(self) -> Dict[str, Tuple[str, str]]:
+        """relative path -> (content hash, content) for src/ plus the HTML entry points"""
+        contents = {source_file.relative_path: (source_file.content_hash, source_file.content)
+                    for source_file in self.index}
+        for html in self.project_root.glob("*.html"):
+            data = html.read_bytes()
+            contents[html.name] = (content_hash(data), data.decode('utf-8', errors='ignore'))
+        return contents
+
+    def _extract(self, contents: Dict[str, Tuple[str, str]]) -> Dict[str, Dict[str, list]]:
+        by_hash = {digest: content for digest, content in contents.values()}
+        found = self.cache.get_many('tailwind_usage', TAILWIND_USAGE_VERSION, by_hash) if self.cache else {}
+        missing = [digest for digest in by_hash if digest not in found]
+        if self.workers > 1 and len(missing) >= PARALLEL_MIN_FILES:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                computed = dict(zip(missing, pool.map(extract_class_usage, [by_hash[digest] for digest in missing],
+                                                      chunksize=16)))
+        else:
+            computed = {digest: extract_class_usage(by_hash[digest]) for digest in missing}
+        if self.cache and computed:
+            self.cache.put_many('tailwind_usage', TAILWIND_USAGE_VERSION, computed)
+        return {**found, **computed}
+
+    def _built_css(self) -> Dict[str, str]:
+        if self.css_path.is_file():
+            return {self.css_path.name: self.css_path.read_text(encoding='utf-8', errors='ignore')}
+        inventory = open_inventory()
+        inventory.refresh(self.css_path)
+        return {str(path.relative_to(self.css_path)): path.read_text(encoding='utf-8', errors='ignore')
+                for path in inventory.files(self.css_path, ('.css',))}
+
+    def _safelist(self) -> List[Dict]:
+        for name in CONFIG_NAMES:
+            config = self.project_root / name
+            if config.exists():
+                return parse_safelist(config.read_text(encoding='utf-8'))
+        return []
+
+    def analyze(self) -> Dict:
+        contents = self._contents()
+        extracted = self._extract(contents)
+        used: Dict[str, Set[str]] = defaultdict(set)
+        dynamic = []
+        for relative_path, (digest, _) in sorted(contents.items()):
+            for class_name in extracted[digest]['classes']:
+                used[class_name].add(relative_path)
+            dynamic.extend({'file': relative_path, **entry} for entry in extracted[digest]['dynamic'])
+
+        stylesheets = self._built_css()
+        css_sizes: Dict[str, int] = defaultdict(int)
+        for css in stylesheets.values():
+            for class_name, size in css_class_bytes(css).items():
+                css_sizes[class_name] += size
+        total_css = sum(len(css.encode('utf-8')) for css in stylesheets.values())
+
+        dynamic_patterns = sorted({entry['pattern'] for entry in dynamic})
+        dynamic_regex = re.compile('|'.join(f'(?:{fnmatch.translate(pattern)})' for pattern in dynamic_patterns)) \
+            if dynamic_patterns else None
+        for entry in dynamic:
+            matcher = re.compile(fnmatch.translate(entry['pattern']))
+            entry['built_matches'] = sorted(name for name in css_sizes if matcher.match(name))[:20]
+
+        unused_groups: Dict[str, Dict] = {}
+        for class_name, size in css_sizes.items():
+            if class_name in used or (dynamic_regex and dynamic_regex.match(class_name)):
+                continue
+            group = unused_groups.setdefault(utility_group(class_name), {'bytes': 0, 'classes': []})
+            group['bytes'] += size
+            group['classes'].append(class_name)
+        for group in unused_groups.values():
+            group['classes'].sort()
+
+        dead_safelist = []
+        for entry in self._safelist():
+            if 'class' in entry:
+                if entry['class'] not in used and not (dynamic_regex and dynamic_regex.match(entry['class'])):
+                    dead_safelist.append({**entry, 'bytes': css_sizes.get(entry['class'], 0)})
+                continue
+            try:
+                regex = re.compile(entry['pattern'])
+            except re.error:
+                continue
+            matches = [name for name in css_sizes if regex.fullmatch(utility_name(name))]
+            if not any(name in used for name in matches) and not any(
+                    regex.fullmatch(utility_name(pattern.replace('*', 'x'))) for pattern in dynamic_patterns):
+                dead_safelist.append({**entry, 'bytes': sum(css_sizes[name] for name in matches)})
+
+        return {
+            'files_scanned': len(contents),
+            'class_tokens': len(used),
+            'stylesheets': sorted(stylesheets),
+            'css_bytes': total_css,
+            'css_classes': len(css_sizes),
+            'unused_css_bytes': sum(group['bytes'] for group in unused_groups.values()),
+            'unused_groups': dict(sorted(unused_groups.items(), key=lambda item: -item[1]['bytes'])),
+            'dynamic_classes': dynamic,
+            'dead_safelist': dead_safelist,
+        }
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    options = dict(arg[2:].split('=', 1) for arg in sys.argv[1:] if arg.startswith('--') and '=' in arg)
+    project_root = args[0] if args else "/workspace/claimguru"
+    report = TailwindUsageAnalyzer(project_root, css_path=options.get('css'), cache=open_cache()).analyze()
+    if '--json' in sys.argv:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"🎨 {report['class_tokens']} class tokens in {report['files_scanned']} files; "
+          f"{report['css_classes']} classes in {report['css_bytes'] / 1024:.1f} KB of built CSS")
+    if not report['stylesheets']:
+        print("⚠️ No built CSS found; run a build or pass --css=path/to/file.css")
+    print(f"🗑️ CSS for classes no class string uses: {report['unused_css_bytes'] / 1024:.1f} KB")
+    for group, entry in list(report['unused_groups'].items())[:15]:
+        examples = ', '.join(entry['classes'][:4])
+        print(f"   {group:16} {entry['bytes'] / 1024:6.1f} KB  {len(entry['classes']):4d} classes  ({examples})")
+    print(f"🧩 Dynamically built classes (Tailwind cannot see these): {len(report['dynamic_classes'])}")
+    for entry in report['dynamic_classes']:
+        built = f"{len(entry['built_matches'])} built" if entry['built_matches'] else "none built"
+        print(f"   {entry['file']}:{entry['line']}  {entry['pattern']}  ({built})")
+    if report['dead_safelist']:
+        print(f"💀 Dead safelist entries: {len(report['dead_safelist'])}")
+        for entry in report['dead_safelist']:
+            print(f"   {entry.get('class') or '/' + entry['pattern'] + '/'}  ({entry['bytes']} bytes)")
+
+
+if __name__ == "__main__":
+    main()
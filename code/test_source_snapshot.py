@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Boundary tests for SourceSnapshot.grep over files stored back to back
+"""
+import os
+import tempfile
+from pathlib import Path
+
+# Keep the tmp-dir walk out of the shared /workspace inventory
+os.environ['FILE_INVENTORY_DB'] = 'off'
+
+from source_snapshot import SourceSnapshot, build_snapshot
+
+
+def _snapshot(directory: Path, files: dict) -> SourceSnapshot:
+    for name, text in files.items():
+        (directory / 'src' / name).parent.mkdir(parents=True, exist_ok=True)
+        (directory / 'src' / name).write_text(text)
+    return SourceSnapshot(build_snapshot(directory, output=str(directory / 'test.snap')))
+
+
+def test_grep_stops_at_file_boundaries():
+    # a.ts has no trailing newline, so its last line runs straight into b.ts
+    with tempfile.TemporaryDirectory() as directory, _snapshot(Path(directory), {
+            'a.ts': 'export const a = 1',
+            'b.ts': 'import x from "y"\nexport const b = 2\n'}) as snapshot:
+        assert list(snapshot.grep(r'^import')) == [('src/b.ts', 1, 'import x from "y"')]
+        assert list(snapshot.grep(r'= \d.*')) == [('src/a.ts', 1, 'export const a = 1'),
+                                                 ('src/b.ts', 2, 'export const b = 2')]
+        assert list(snapshot.grep(r'1$')) == [('src/a.ts', 1, 'export const a = 1')]
+
+
+
+def test_grep_numbers_every_match_in_a_file():
+    with tempfile.TemporaryDirectory() as directory, _snapshot(Path(directory), {
+            'c.ts': 'const x = 1\r\n\nconst y = 2\nlet z = 3\nconst w = 4'}) as snapshot:
+        assert [(line_number, line.rstrip('\r')) for _, line_number, line in snapshot.grep(r'^const \w')] == [
+            (1, 'const x = 1'), (3, 'const y = 2'), (5, 'const w = 4')]
+
+
+if __name__ == "__main__":
+    test_grep_stops_at_file_boundaries()
+    test_grep_numbers_every_match_in_a_file()
+    print("✅ source snapshot tests passed")
@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+"""
+TypeScript Compile-Time Profiler
+Runs tsc with --generateTrace and --extendedDiagnostics, streams the trace to rank files,
+types and source hotspots by check time, and keeps a per-commit history of the results
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import heapq
+import shutil
+import sqlite3
+import subprocess
+from pathlib import Path
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_HISTORY_PATH = os.environ.get("TSC_PROFILE_DB", "/workspace/.tsc_profiles.sqlite")
+DEFAULT_TRACE_DIR = os.environ.get("TSC_TRACE_DIR", "/workspace/.tsc_traces")
+DEFAULT_TSCONFIG = "tsconfig.app.json"
+PROFILE_TIMEOUT_SECONDS = 900
+TOP_TYPES = 100
+TOP_HOTSPOTS = 50
+# Hotspot candidates kept while streaming; nested ones are folded into their parent afterwards
+HOTSPOT_CANDIDATES = 1000
+# Changes smaller than this are timing noise
+MIN_DIFF_MS = 50
+FILE_PHASES = {'createSourceFile': 'parse_ms', 'bindSourceFile': 'bind_ms', 'checkSourceFile': 'check_ms'}
+# Instant events tsc emits when it gives up on a type: the usual cause of pathological check times
+LIMIT_EVENT_PATTERN = re.compile(r'DepthLimit|TooLarge|_Overflow')
+# "Check time:   4.56s", "Instantiations:   1234567", "Memory used:  345678K"
+DIAGNOSTIC_PATTERN = re.compile(r'^([A-Z][\w ()/.-]*?):\s+([\d.]+)([a-zA-Z]*)\s*$', re.MULTILINE)
+
+HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tsc_profiles (
+    commit_id TEXT PRIMARY KEY,
+    recorded_at REAL NOT NULL,
+    data TEXT NOT NULL
+)
+"""
+
+
+def stream_json_array(path: Path) -> Iterator[Dict]:
+    """Elements of the one-element-per-line JSON arrays tsc writes, without loading the file"""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip().lstrip('[').rstrip(']').strip(',').strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # Not line-oriented (reformatted or minified); fall back to a full parse
+                f.seek(0)
+                yield from json.load(f)
+                return
+
+
+def parse_diagnostics(output: str) -> Dict[str, float]:
+    """--extendedDiagnostics as name -> number, times in seconds and memory in KB"""
+    return {name.strip(): float(value) for name, value, _ in DIAGNOSTIC_PATTERN.findall(output)}
+
+
+def _merged_length(intervals: List[Tuple[int, int]]) -> int:
+    """Length of the union of intervals, so recursive checks of one type are not counted twice"""
+    total, current_start, current_end = 0, None, None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+class TraceSummary:
+    """Aggregates of one trace.json, accumulated event by event.
+
+    Complete events are written when they end, so children arrive before
+    their parents; aggregation therefore works on [start, end) intervals
+    rather than on a stack.
+    """
+
+    def __init__(self):
+        self.files: Dict[str, Dict[str, float]] = defaultdict(lambda: {phase: 0.0 for phase in FILE_PHASES.values()})
+        self.type_intervals: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+        self.phase_totals: Dict[str, float] = defaultdict(float)
+        self.limits: List[Dict] = []
+        self.events = 0
+        self._hotspots: List[Tuple[int, int, Dict]] = []
+        self._open: Dict[Tuple, List[Dict]] = defaultdict(list)
+        self._sequence = 0
+
+    def add(self, event: Dict):
+        phase = event.get('ph')
+        if phase == 'B':
+            self._open[(event.get('pid'), event.get('tid'), event.get('name'))].append(event)
+            return
+        if phase == 'E':
+            stack = self._open.get((event.get('pid'), event.get('tid'), event.get('name')))
+            if not stack:
+                return
+            begin = stack.pop()
+            event = {**begin, 'dur': event['ts'] - begin['ts'], 'args': {**begin.get('args', {}), **event.get('args', {})}}
+        elif phase in ('i', 'I'):
+            if LIMIT_EVENT_PATTERN.search(event.get('name', '')):
+                self.limits.append({'name': event['name'], 'args': event.get('args', {})})
+            return
+        elif phase != 'X':
+            return
+        self.events += 1
+        name, args = event.get('name', ''), event.get('args') or {}
+        start, duration = event.get('ts', 0), event.get('dur', 0)
+        if name in FILE_PHASES and 'path' in args:
+            self.files[args['path']][FILE_PHASES[name]] += duration / 1000
+            self.phase_totals[FILE_PHASES[name]] += duration / 1000
+        elif event.get('cat') in ('program', 'emit') or name in ('createProgram', 'emit'):
+            self.phase_totals[name] += duration / 1000
+        for key, value in args.items():
+            if key.endswith('Id') and isinstance(value, int):
+                self.type_intervals[value].append((start, start + duration))
+        if 'path' in args and 'pos' in args and name not in FILE_PHASES:
+            self._sequence += 1
+            candidate = (duration, self._sequence, {'path': args['path'], 'pos': args['pos'],
+                                                    'end': args.get('end', args['pos']), 'kind': name})
+            if len(self._hotspots) < HOTSPOT_CANDIDATES:
+                heapq.heappush(self._hotspots, candidate)
+            elif candidate > self._hotspots[0]:
+                heapq.heapreplace(self._hotspots, candidate)
+
+    def type_times(self) -> Dict[int, float]:
+        """Milliseconds of type relation and variance work each type was part of"""
+        return {type_id: _merged_length(intervals) / 1000 for type_id, intervals in self.type_intervals.items()}
+
+    def hotspots(self, limit: int = TOP_HOTSPOTS) -> List[Dict]:
+        """Slowest source ranges, dropping ranges nested inside an already listed one"""
+        chosen: List[Dict] = []
+        for duration, _, spot in sorted(self._hotspots, reverse=True):
+            if any(other['path'] == spot['path'] and other['pos'] <= spot['pos'] and spot['end'] <= other['end']
+                   for other in chosen):
+                continue
+            chosen.append({**spot, 'ms': round(duration / 1000, 1)})
+            if len(chosen) == limit:
+                break
+        return chosen
+
+
+def describe_types(types_path: Optional[Path], wanted: Dict[int, float]) -> Dict[int, Dict]:
+    """Descriptions from types.json for the wanted ids and the generic types they instantiate"""
+    if not types_path or not types_path.exists():
+        return {}
+    described: Dict[int, Dict] = {}
+    origins: Dict[int, int] = {}
+    compact: Dict[int, Tuple[Optional[str], Optional[Dict]]] = {}
+    for entry in stream_json_array(types_path):
+        type_id = entry.get('id')
+        symbol = entry.get('symbolName') or entry.get('aliasSymbolName') or entry.get('intrinsicName')
+        declaration = entry.get('firstDeclaration')
+        # Generic targets are usually declared before their instantiations, but keep every name to be safe
+        compact[type_id] = (symbol, declaration)
+        if type_id not in wanted:
+            continue
+        origin = entry.get('instantiatedType') or entry.get('aliasSymbolId')
+        if isinstance(origin, int) and origin != type_id:
+            origins[type_id] = origin
+        union = entry.get('unionTypes') or entry.get('intersectionTypes')
+        described[type_id] = {
+            'symbol': symbol,
+            'flags': entry.get('flags', []),
+            'display': (entry.get('display') or '')[:200],
+            'members': len(union) if union else None,
+            'declaration': declaration,
+            'type_arguments': len(entry.get('typeArguments') or entry.get('aliasTypeArguments') or []),
+        }
+    for type_id, origin in origins.items():
+        symbol, declaration = compact.get(origin, (None, None))
+        described[type_id]['instantiates'] = {'id': origin, 'symbol': symbol, 'declaration': declaration}
+    return described
+
+
+def _declaration_label(declaration: Optional[Dict], project_root: Path) -> Optional[str]:
+    if not declaration or 'path' not in declaration:
+        return None
+    path = declaration['path']
+    try:
+        path = str(Path(path).relative_to(project_root))
+    except ValueError:
+        pass
+    line = (declaration.get('start') or {}).get('line')
+    return f"{path}:{line + 1}" if isinstance(line, int) else path
+
+
+class TscProfiler:
+    """Where tsc spends its time on one tsconfig, from the compiler's own trace.
+
+    File times are tsc's parse, bind and check phases per source file.
+    Type times are the union of intervals in which a type took part in a
+    relation or variance check, and are rolled up by the generic or alias
+    they instantiate, which is where a large union or deep conditional
+    type costs time on every use.
+    """
+
+    def __init__(self, project_root: str, tsconfig: str = DEFAULT_TSCONFIG, trace_root: str = DEFAULT_TRACE_DIR):
+        self.project_root = Path(project_root).resolve()
+        self.tsconfig = tsconfig
+        self.trace_root = Path(trace_root)
+
+    def _tool(self, name: str) -> Optional[str]:
+        local = self.project_root / "node_modules" / ".bin" / name
+        if local.exists():
+            return str(local)
+        return shutil.which(name)
+
+    def run(self, trace_dir: Path) -> Tuple[bool, str]:
+        """Type-check with tracing into trace_dir; the check itself may fail with type errors"""
+        tsc = self._tool('tsc')
+        if tsc is None:
+            return False, "tsc not found (install typescript in the project)"
+        if trace_dir.exists():
+            shutil.rmtree(trace_dir)
+        trace_dir.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            result = subprocess.run([tsc, '-p', self.tsconfig, '--noEmit', '--generateTrace', str(trace_dir),
+                                     '--extendedDiagnostics', '--pretty', 'false'], cwd=self.project_root,
+                                    capture_output=True, text=True, timeout=PROFILE_TIMEOUT_SECONDS)
+        except subprocess.TimeoutExpired:
+            return False, "tsc timeout"
+        except OSError as e:
+            return False, str(e)
+        return (trace_dir / "trace.json").exists(), result.stdout + result.stderr
+
+    def _relative(self, path: str) -> str:
+        try:
+            return str(Path(path).relative_to(self.project_root))
+        except ValueError:
+            return path
+
+    def _line(self, path: str, position: int, contents: Dict[str, Optional[str]]) -> Optional[int]:
+        if path not in contents:
+            try:
+                contents[path] = Path(path).read_text(encoding='utf-8')
+            except (OSError, UnicodeDecodeError):
+                contents[path] = None
+        content = contents[path]
+        if content is None:
+            return None
+        # tsc positions include leading trivia, so skip to the first real character
+        while position < len(content) and content[position].isspace():
+            position += 1
+        return content.count('\n', 0, position) + 1
+
+    def analyze(self, trace_dir: Path, diagnostics_output: str = '', commit: Optional[str] = None) -> Dict:
+        """Profile from a trace directory; a `tsc -b` legend.json with several projects is merged
+
+        `commit` names the commit an imported trace was taken at; local runs use HEAD.
+        """
+        legend = trace_dir / "legend.json"
+        if legend.exists():
+            pairs = [(Path(entry['tracePath']), Path(entry['typesPath']) if entry.get('typesPath') else None)
+                     for entry in json.loads(legend.read_text(encoding='utf-8'))]
+        else:
+            pairs = [(trace_dir / "trace.json", trace_dir / "types.json")]
+
+        files: Dict[str, Dict[str, float]] = defaultdict(lambda: {phase: 0.0 for phase in FILE_PHASES.values()})
+        phase_totals: Dict[str, float] = defaultdict(float)
+        types, hotspots, limits, events = [], [], [], 0
+        contents: Dict[str, Optional[str]] = {}
+        for trace_path, types_path in pairs:
+            summary = TraceSummary()
+            for event in stream_json_array(trace_path):
+                summary.add(event)
+            events += summary.events
+            for path, phases in summary.files.items():
+                for phase, ms in phases.items():
+                    files[self._relative(path)][phase] += ms
+            for phase, ms in summary.phase_totals.items():
+                phase_totals[phase] += ms
+
+            times = summary.type_times()
+            top = dict(heapq.nlargest(TOP_TYPES * 5, times.items(), key=lambda item: item[1]))
+            described = describe_types(types_path, top)
+            for type_id, ms in top.items():
+                description = described.get(type_id, {})
+                types.append({'id': type_id, 'ms': round(ms, 1), **description,
+                              'declaration': _declaration_label(description.get('declaration'), self.project_root),
+                              'instantiates': {**description['instantiates'], 'declaration': _declaration_label(
+                                  description['instantiates']['declaration'], self.project_root)}
+                              if description.get('instantiates') else None})
+            for spot in summary.hotspots():
+                hotspots.append({'path': self._relative(spot['path']), 'line': self._line(spot['path'], spot['pos'], contents),
+                                 'kind': spot['kind'], 'ms': spot['ms']})
+            limits.extend(summary.limits)
+
+        # Roll instantiations up to the generic or alias they come from
+        declarations: Dict[str, Dict] = {}
+        for entry in types:
+            origin = entry.get('instantiates') or entry
+            label = origin.get('declaration') or origin.get('symbol') or f"type {entry['id']}"
+            symbol = origin.get('symbol') or entry.get('symbol')
+            rolled = declarations.setdefault(label, {'symbol': symbol, 'ms': 0.0, 'types': 0})
+            # Types of one declaration overlap in time, so the largest is the floor and the sum the ceiling
+            rolled['ms'] = round(max(rolled['ms'], entry['ms']), 1)
+            rolled['types'] += 1
+
+        types.sort(key=lambda entry: -entry['ms'])
+        hotspots.sort(key=lambda spot: -spot['ms'])
+        diagnostics = parse_diagnostics(diagnostics_output)
+        return {
+            'commit': commit or self.commit_id(),
+            'recorded_at': time.time(),
+            'tsconfig': self.tsconfig,
+            'diagnostics': diagnostics,
+            'totals': {**{phase: round(ms, 1) for phase, ms in phase_totals.items()}, 'events': events,
+                       'check_seconds': diagnostics.get('Check time')},
+            'files': {path: {phase: round(ms, 1) for phase, ms in phases.items()}
+                      for path, phases in sorted(files.items(), key=lambda item: -item[1]['check_ms'])},
+            'types': types[:TOP_TYPES],
+            'declarations': dict(sorted(declarations.items(), key=lambda item: -item[1]['ms'])[:TOP_TYPES]),
+            'hotspots': hotspots[:TOP_HOTSPOTS],
+            'limits': limits[:TOP_HOTSPOTS],
+        }
+
+    def commit_id(self) -> str:
+        """HEAD of the project, marked -dirty when the working tree has changes"""
+        try:
+            head = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=self.project_root,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+            dirty = subprocess.run(['git', 'status', '--porcelain', '--', '.'], cwd=self.project_root,
+                                   capture_output=True, text=True).stdout.strip()
+        except (subprocess.CalledProcessError, OSError):
+            return 'unknown'
+        return f"{head}-dirty" if dirty else head
+
+
+class ProfileHistory:
+    """tsc profiles by commit, so check time can be compared across builds"""
+
+    def __init__(self, db_path: str = DEFAULT_HISTORY_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute(HISTORY_SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def record(self, report: Dict):
+        conn = self._connect()
+        try:
+            conn.execute("INSERT OR REPLACE INTO tsc_profiles VALUES (?, ?, ?)",
+                         (report['commit'], report['recorded_at'], json.dumps(report)))
+        finally:
+            conn.close()
+
+    def get(self, commit_id: str) -> Optional[Dict]:
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT data FROM tsc_profiles WHERE commit_id = ? OR commit_id LIKE ? "
+                               "ORDER BY recorded_at DESC LIMIT 1", (commit_id, commit_id + '%')).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row[0]) if row else None
+
+    def previous(self, commit_id: str) -> Optional[Dict]:
+        """The most recent profile recorded before `commit_id` was"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT data FROM tsc_profiles WHERE commit_id != ? AND recorded_at < "
+                               "COALESCE((SELECT recorded_at FROM tsc_profiles WHERE commit_id = ?), 1e18) "
+                               "ORDER BY recorded_at DESC LIMIT 1", (commit_id, commit_id)).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row[0]) if row else None
+
+    def profiles(self, limit: int = 20) -> List[Dict]:
+        """Commit, time and totals of the latest profiles, newest first"""
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT data FROM tsc_profiles ORDER BY recorded_at DESC LIMIT ?", (limit,)).fetchall()
+        finally:
+            conn.close()
+        profiles = []
+        for (data,) in rows:
+            report = json.loads(data)
+            profiles.append({'commit': report['commit'], 'recorded_at': report['recorded_at'],
+                             'totals': report['totals'], 'instantiations': report['diagnostics'].get('Instantiations')})
+        return profiles
+
+
+def diff_profiles(old: Dict, new: Dict, min_ms: float = MIN_DIFF_MS) -> Dict:
+    """Check time changes per file and per type declaration between two profiles"""
+    def changes(before: Dict[str, Dict], after: Dict[str, Dict], metric: str) -> List[Dict]:
+        found = []
+        for name in set(before) | set(after):
+            delta = after.get(name, {}).get(metric, 0) - before.get(name, {}).get(metric, 0)
+            if abs(delta) >= min_ms:
+                found.append({'name': name, 'ms': [before.get(name, {}).get(metric, 0), after.get(name, {}).get(metric, 0)],
+                              'delta_ms': round(delta, 1)})
+        return sorted(found, key=lambda change: -abs(change['delta_ms']))
+
+    return {
+        'from': old['commit'],
+        'to': new['commit'],
+        'check_ms': round(new['totals'].get('check_ms', 0) - old['totals'].get('check_ms', 0), 1),
+        'instantiations': int((new['diagnostics'].get('Instantiations') or 0) - (old['diagnostics'].get('Instantiations') or 0)),
+        'files': changes(old['files'], new['files'], 'check_ms'),
+        'declarations': changes(old['declarations'], new['declarations'], 'ms'),
+    }
+
+
+def print_diff(diff: Dict, limit: int = 15):
+    print(f"📊 Check time {diff['from']} → {diff['to']}: {diff['check_ms'] / 1000:+.2f}s, "
+          f"{diff['instantiations']:+,} instantiations")
+    for section in ('files', 'declarations'):
+        if diff[section]:
+            print(f"   {section.capitalize()}:")
+        for change in diff[section][:limit]:
+            print(f"   {change['delta_ms']:+9.0f} ms  {change['name']}")
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    options = dict(arg[2:].split('=', 1) for arg in sys.argv[1:] if arg.startswith('--') and '=' in arg)
+    project_root = args[0] if args else "/workspace/claimguru"
+    profiler = TscProfiler(project_root, tsconfig=options.get('tsconfig', DEFAULT_TSCONFIG))
+    history = ProfileHistory()
+
+    if '--history' in sys.argv:
+        for profile in history.profiles():
+            check = profile['totals'].get('check_ms', 0) / 1000
+            print(f"   {profile['commit']:<16} {time.strftime('%Y-%m-%d %H:%M', time.localtime(profile['recorded_at']))}  "
+                  f"check {check:.2f}s, {int(profile['instantiations'] or 0):,} instantiations")
+        return
+    if '--diff' in sys.argv and len(args) >= 3:
+        old, new = history.get(args[1]), history.get(args[2])
+        if not old or not new:
+            print(f"❌ No recorded profile for {args[1] if not old else args[2]}")
+            return
+        print_diff(diff_profiles(old, new))
+        return
+
+    output = ''
+    if 'trace' in options:
+        # Analyze a trace produced elsewhere (CI); pair it with saved --extendedDiagnostics output if given.
+        # It is only recorded under the --commit it was taken at, never under the local HEAD
+        trace_dir = Path(options['trace'])
+        if 'diagnostics' in options:
+            output = Path(options['diagnostics']).read_text(encoding='utf-8')
+    else:
+        trace_dir = profiler.trace_root / profiler.commit_id()
+        print(f"⏱️ Type-checking {profiler.tsconfig} with tracing...")
+        success, output = profiler.run(trace_dir)
+        if not success:
+            print(f"❌ No trace produced\n{output[-1000:]}")
+            return
+    imported = 'imported' if 'trace' in options else None
+    report = profiler.analyze(trace_dir, output, commit=options.get('commit', imported))
+    if 'trace' not in options or 'commit' in options:
+        history.record(report)
+    elif '--json' not in sys.argv:
+        print("ℹ️ Imported trace not saved to history; pass --commit=<sha> to record it")
+    if '--json' in sys.argv:
+        print(json.dumps(report, indent=2))
+        return
+
+    totals, diagnostics = report['totals'], report['diagnostics']
+    check_seconds = totals['check_seconds'] if totals['check_seconds'] is not None else totals.get('check_ms', 0) / 1000
+    print(f"🧮 {report['commit']}: check {check_seconds:.2f}s, bind {totals.get('bind_ms', 0) / 1000:.2f}s, "
+          f"parse {totals.get('parse_ms', 0) / 1000:.2f}s; {int(diagnostics.get('Instantiations', 0)):,} instantiations, "
+          f"{int(diagnostics.get('Types', 0)):,} types")
+    print("📄 Slowest files to check:")
+    for path, phases in list(report['files'].items())[:15]:
+        print(f"   {phases['check_ms']:9.0f} ms  {path}")
+    print("🧬 Costliest type declarations (relation and variance checks):")
+    for label, entry in list(report['declarations'].items())[:15]:
+        location = f"  {label}" if label != entry['symbol'] else ''
+        print(f"   {entry['ms']:9.0f} ms  {entry['symbol'] or '(anonymous)'}{location}  ({entry['types']} types)")
+    print("🔥 Hotspots:")
+    for spot in report['hotspots'][:15]:
+        print(f"   {spot['ms']:9.0f} ms  {spot['path']}:{spot['line']}  {spot['kind']}")
+    if report['limits']:
+        print(f"⚠️ tsc hit {len(report['limits'])} depth/size limits (e.g. {report['limits'][0]['name']})")
+
+    previous = history.previous(report['commit'])
+    if previous:
+        print_diff(diff_profiles(previous, report))
+
+
+if __name__ == "__main__":
+    main()
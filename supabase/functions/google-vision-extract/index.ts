@@ -60,6 +60,25 @@ Deno.serve(async (req) => {
     if (!visionResponse.ok) {
       const errorText = await visionResponse.text();
       console.error('Google Vision API error:', errorText);
+
+      // Pass quota exhaustion through as a 429 so client-side rate limiters can back off
+      if (visionResponse.status === 429) {
+        const retryAfter = visionResponse.headers.get('retry-after');
+        return new Response(JSON.stringify({
+          error: {
+            code: 'VISION_RATE_LIMITED',
+            message: `Google Vision API error: ${visionResponse.status}`
+          }
+        }), {
+          status: 429,
+          headers: {
+            ...corsHeaders,
+            ...(retryAfter ? { 'Retry-After': retryAfter } : {}),
+            'Content-Type': 'application/json'
+          }
+        });
+      }
+
       throw new Error(`Google Vision API error: ${visionResponse.status}`);
     }
 
@@ -1,36 +1,5 @@
-Deno.serve(async (req) => {
-  const corsHeaders = {
-    'Access-Control-Allow-Origin': '*',
-    'Access-Control-Allow-Headers': 'authorization, x-client-info, apikey, content-type',
-    'Access-Control-Allow-Methods': 'POST, GET, OPTIONS, PUT, DELETE, PATCH',
-    'Access-Control-Max-Age': '86400',
-    'Access-Control-Allow-Credentials': 'false'
-  };
-
-  if (req.method === 'OPTIONS') {
-    return new Response(null, { status: 200, headers: corsHeaders });
-  }
-
-  try {
-    console.log('🤖 OpenAI Enhanced Identifier + Deductibles Extract Fields function called');
-    
-    const { text } = await req.json();
-    
-    if (!text) {
-      throw new Error('No text provided for extraction');
-    }
-
-    const apiKey = Deno.env.get('OPENAI_API_KEY');
-    if (!apiKey) {
-      throw new Error('OpenAI API key not configured');
-    }
-
-    console.log('📝 Processing enhanced identifier + deductibles text of length:', text.length);
-
-    const prompt = `
-Extract the following comprehensive insurance document information from the provided text. This could be a policy document OR a claim-related document. Return a JSON object with these exact keys:
-
-{
+// Field schema and extraction rules shared by the single-document and batch prompts
+const FIELD_SCHEMA = `{
   // CRITICAL IDENTIFIERS - Extract ALL that are present
   "policyNumber": "string or null",
   "claimNumber": "string or null",
@@ -133,9 +102,9 @@ Extract the following comprehensive insurance document information from the prov
   // Legacy compatibility
   "coverageAmount": "string or null",
   "premium": "string or null"
-}
+}`;
 
-Specific Extraction Rules:
+const EXTRACTION_RULES = `Specific Extraction Rules:
 
 **CRITICAL IDENTIFIER EXTRACTION (HIGHEST PRIORITY):**
 - **Policy Number**: Look for "Policy Number", "Policy #", "Policy No", or similar patterns
@@ -211,63 +180,458 @@ General Rules:
 - If a field is not found, set it to null
 - Look for variations of field names and terminology
 - Separate mailing address from property address if different
-- **Always extract both policy and claim numbers when present**
+- **Always extract both policy and claim numbers when present**`;
+
+const SYSTEM_PROMPT = 'You are a comprehensive insurance document parser specializing in identifier and deductible extraction. Extract all available information exactly as it appears in documents. ALWAYS extract both policy numbers and claim numbers when present. Always return valid JSON with all requested fields, using null for missing data. Pay special attention to different deductible types and whether they are stated amounts or percentages of coverage.';
+
+// Batch requests pack several small documents (letters, RFIs, RORs) into one call
+const MAX_BATCH_DOCUMENTS = 8;
+const MAX_BATCH_TEXT_LENGTH = 48000;
+const MAX_BATCH_OUTPUT_TOKENS = 16000;
+
+function buildSinglePrompt(text: string): string {
+  return `
+Extract the following comprehensive insurance document information from the provided text. This could be a policy document OR a claim-related document. Return a JSON object with these exact keys:
+
+${FIELD_SCHEMA}
+
+${EXTRACTION_RULES}
 
 Text to analyze:
 ${text}
 
 Return only the JSON object, no additional text.`;
+}
 
-    const response = await fetch('https://api.openai.com/v1/chat/completions', {
-      method: 'POST',
-      headers: {
-        'Authorization': `Bearer ${apiKey}`,
-        'Content-Type': 'application/json',
-      },
-      body: JSON.stringify({
-        model: 'gpt-4o-mini',
-        messages: [
-          {
-            role: 'system',
-            content: 'You are a comprehensive insurance document parser specializing in identifier and deductible extraction. Extract all available information exactly as it appears in documents. ALWAYS extract both policy numbers and claim numbers when present. Always return valid JSON with all requested fields, using null for missing data. Pay special attention to different deductible types and whether they are stated amounts or percentages of coverage.'
-          },
-          {
-            role: 'user',
-            content: prompt
-          }
-        ],
-        max_tokens: 3000,
-        temperature: 0.1
-      })
-    });
+function buildBatchPrompt(documents: { id: string; text: string }[]): string {
+  const documentBlocks = documents
+    .map((doc) => `=== DOCUMENT ${doc.id} ===\n${doc.text}\n=== END DOCUMENT ${doc.id} ===`)
+    .join('\n\n');
+
+  return `
+Extract the following comprehensive insurance document information from EACH of the documents below. Each document may be a policy document OR a claim-related document and must be analyzed independently. Documents are delimited by "=== DOCUMENT <id> ===" and "=== END DOCUMENT <id> ===" lines.
+
+Return a single JSON object whose keys are the document ids and whose values are objects with these exact keys:
+
+${FIELD_SCHEMA}
+
+${EXTRACTION_RULES}
+- Never copy a value from one document into another document's result
 
-    if (!response.ok) {
-      throw new Error(`OpenAI API error: ${response.status}`);
+Documents to analyze:
+${documentBlocks}
+
+Return only the JSON object keyed by document id, no additional text.`;
+}
+
+// OpenAI rate-limit headers forwarded to callers so client-side limiters can pace themselves
+const RATE_LIMIT_HEADERS = [
+  'retry-after',
+  'retry-after-ms',
+  'x-ratelimit-limit-requests',
+  'x-ratelimit-limit-tokens',
+  'x-ratelimit-remaining-requests',
+  'x-ratelimit-remaining-tokens',
+  'x-ratelimit-reset-requests',
+  'x-ratelimit-reset-tokens'
+];
+
+class UpstreamError extends Error {
+  constructor(message: string, public status: number, public headers: Record<string, string>) {
+    super(message);
+  }
+}
+
+function rateLimitHeaders(response: Response): Record<string, string> {
+  const headers: Record<string, string> = {};
+  for (const name of RATE_LIMIT_HEADERS) {
+    const value = response.headers.get(name);
+    if (value !== null) headers[name] = value;
+  }
+  return headers;
+}
+
+function requestOpenAI(apiKey: string, prompt: string, maxTokens: number, stream = false): Promise<Response> {
+  return fetch('https://api.openai.com/v1/chat/completions', {
+    method: 'POST',
+    headers: {
+      'Authorization': `Bearer ${apiKey}`,
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify({
+      model: 'gpt-4o-mini',
+      messages: [
+        {
+          role: 'system',
+          content: SYSTEM_PROMPT
+        },
+        {
+          role: 'user',
+          content: prompt
+        }
+      ],
+      max_tokens: maxTokens,
+      temperature: 0.1,
+      stream
+    })
+  });
+}
+
+async function callOpenAI(
+  apiKey: string,
+  prompt: string,
+  maxTokens: number
+): Promise<{ content: string; headers: Record<string, string> }> {
+  const response = await requestOpenAI(apiKey, prompt, maxTokens);
+
+  if (!response.ok) {
+    throw new UpstreamError(`OpenAI API error: ${response.status}`, response.status, rateLimitHeaders(response));
+  }
+
+  const result = await response.json();
+  const extractedText = result.choices[0]?.message?.content;
+
+  if (!extractedText) {
+    throw new Error('No content returned from OpenAI');
+  }
+
+  return { content: extractedText, headers: rateLimitHeaders(response) };
+}
+
+function parseJsonObject(extractedText: string): Record<string, any> {
+  try {
+    // Clean the response to extract JSON
+    const jsonMatch = extractedText.match(/\{[\s\S]*\}/);
+    if (jsonMatch) {
+      return JSON.parse(jsonMatch[0]);
+    }
+    throw new Error('No JSON found in response');
+  } catch (parseError) {
+    console.error('❌ JSON parsing failed:', parseError);
+    throw new Error('Failed to parse OpenAI response as JSON');
+  }
+}
+
+function summarizePolicyData(policyData: Record<string, any>) {
+  return {
+    fieldsExtracted: Object.keys(policyData).filter(k => policyData[k]).length,
+    identifiersExtracted: {
+      policyNumber: !!policyData.policyNumber,
+      claimNumber: !!policyData.claimNumber,
+      fileNumber: !!policyData.fileNumber,
+      carrierClaimNumber: !!policyData.carrierClaimNumber
     }
+  };
+}
 
-    const result = await response.json();
-    const extractedText = result.choices[0]?.message?.content;
+async function extractBatch(apiKey: string, documents: any[]) {
+  if (documents.length === 0) {
+    throw new Error('No documents provided for batch extraction');
+  }
+  if (documents.length > MAX_BATCH_DOCUMENTS) {
+    throw new Error(`Batch exceeds ${MAX_BATCH_DOCUMENTS} documents`);
+  }
 
-    if (!extractedText) {
-      throw new Error('No content returned from OpenAI');
+  const seenIds = new Set<string>();
+  for (const doc of documents) {
+    if (!doc || typeof doc.id !== 'string' || !doc.id) {
+      throw new Error('Every batch document needs a string id');
+    }
+    if (!doc.text) {
+      throw new Error(`No text provided for document ${doc.id}`);
+    }
+    if (seenIds.has(doc.id)) {
+      throw new Error(`Duplicate document id in batch: ${doc.id}`);
     }
+    seenIds.add(doc.id);
+  }
 
-    console.log('🤖 OpenAI enhanced identifier + deductibles response length:', extractedText.length);
+  const totalLength = documents.reduce((sum, doc) => sum + doc.text.length, 0);
+  if (totalLength > MAX_BATCH_TEXT_LENGTH) {
+    throw new Error(`Batch text exceeds ${MAX_BATCH_TEXT_LENGTH} characters`);
+  }
+
+  console.log('📦 Processing batch of', documents.length, 'documents, total text length:', totalLength);
+
+  const maxTokens = Math.min(MAX_BATCH_OUTPUT_TOKENS, 3000 * documents.length);
+  const completion = await callOpenAI(apiKey, buildBatchPrompt(documents), maxTokens);
+  const batchData = parseJsonObject(completion.content);
+
+  // Unpack per-document results; a missing id is reported, not fatal for the batch
+  const results = documents.map((doc) => {
+    const policyData = batchData[doc.id];
+    if (!policyData || typeof policyData !== 'object') {
+      return {
+        id: doc.id,
+        success: false,
+        error: {
+          code: 'DOCUMENT_MISSING_FROM_BATCH_RESPONSE',
+          message: `No result returned for document ${doc.id}`
+        }
+      };
+    }
+    return {
+      id: doc.id,
+      success: true,
+      policyData,
+      ...summarizePolicyData(policyData)
+    };
+  });
+
+  return { results, headers: completion.headers };
+}
+
+/**
+ * Incrementally scans the top-level members of a streamed JSON object so each
+ * field can be emitted as soon as its value is complete.
+ */
+class JsonFieldScanner {
+  private buffer = '';
+  private pos = -1;
+
+  push(chunk: string): [string, any][] {
+    this.buffer += chunk;
+    const fields: [string, any][] = [];
+
+    if (this.pos < 0) {
+      const start = this.buffer.indexOf('{');
+      if (start < 0) return fields;
+      this.pos = start + 1;
+    }
+
+    while (true) {
+      const member = this.readMember(this.pos);
+      if (!member) break;
+      fields.push([member.key, member.value]);
+      this.pos = member.end;
+    }
+    return fields;
+  }
+
+  private skipWhitespace(i: number): number {
+    while (i < this.buffer.length && /\s/.test(this.buffer[i])) i++;
+    return i;
+  }
+
+  // Index of the closing quote of the string starting at i, or -1 if incomplete
+  private stringEnd(i: number): number {
+    for (let j = i + 1; j < this.buffer.length; j++) {
+      if (this.buffer[j] === '\\') j++;
+      else if (this.buffer[j] === '"') return j;
+    }
+    return -1;
+  }
+
+  // Exclusive end of the value starting at i, or -1 if it is not complete yet
+  private valueEnd(i: number): number {
+    const first = this.buffer[i];
+    if (first === '"') {
+      const end = this.stringEnd(i);
+      return end < 0 ? -1 : end + 1;
+    }
+    if (first === '{' || first === '[') {
+      let depth = 0;
+      for (let j = i; j < this.buffer.length; j++) {
+        const ch = this.buffer[j];
+        if (ch === '"') {
+          j = this.stringEnd(j);
+          if (j < 0) return -1;
+        } else if (ch === '{' || ch === '[') {
+          depth++;
+        } else if (ch === '}' || ch === ']') {
+          depth--;
+          if (depth === 0) return j + 1;
+        }
+      }
+      return -1;
+    }
+    // Literals and numbers end at the next delimiter, which must already be buffered
+    for (let j = i; j < this.buffer.length; j++) {
+      if (/[\s,}]/.test(this.buffer[j])) return j;
+    }
+    return -1;
+  }
+
+  private readMember(pos: number): { key: string; value: any; end: number } | null {
+    let i = this.skipWhitespace(pos);
+    if (this.buffer[i] === ',') i = this.skipWhitespace(i + 1);
+    if (this.buffer[i] !== '"') return null;
+
+    const keyEnd = this.stringEnd(i);
+    if (keyEnd < 0) return null;
+
+    let j = this.skipWhitespace(keyEnd + 1);
+    if (this.buffer[j] !== ':') return null;
+    j = this.skipWhitespace(j + 1);
+    if (j >= this.buffer.length) return null;
+
+    const end = this.valueEnd(j);
+    if (end < 0) return null;
 
-    // Parse the JSON response
-    let policyData;
     try {
-      // Clean the response to extract JSON
-      const jsonMatch = extractedText.match(/\{[\s\S]*\}/);
-      if (jsonMatch) {
-        policyData = JSON.parse(jsonMatch[0]);
-      } else {
-        throw new Error('No JSON found in response');
+      return {
+        key: JSON.parse(this.buffer.slice(i, keyEnd + 1)),
+        value: JSON.parse(this.buffer.slice(j, end)),
+        end
+      };
+    } catch {
+      // Not strict JSON; the final parse of the full response picks it up
+      return null;
+    }
+  }
+}
+
+async function streamExtraction(
+  apiKey: string,
+  text: string,
+  corsHeaders: Record<string, string>
+): Promise<Response> {
+  // Start the completion before committing to a 200 so upstream 429s reach the caller
+  const response = await requestOpenAI(apiKey, buildSinglePrompt(text), 3000, true);
+  if (!response.ok || !response.body) {
+    throw new UpstreamError(`OpenAI API error: ${response.status}`, response.status, rateLimitHeaders(response));
+  }
+
+  const encoder = new TextEncoder();
+
+  const stream = new ReadableStream({
+    async start(controller) {
+      const send = (event: Record<string, any>) => {
+        controller.enqueue(encoder.encode(JSON.stringify(event) + '\n'));
+      };
+
+      try {
+        const scanner = new JsonFieldScanner();
+        const emitted = new Set<string>();
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let sseBuffer = '';
+        let content = '';
+
+        while (true) {
+          const { done, value } = await reader.read();
+          if (done) break;
+
+          sseBuffer += decoder.decode(value, { stream: true });
+          const lines = sseBuffer.split('\n');
+          sseBuffer = lines.pop() ?? '';
+
+          for (const line of lines) {
+            const data = line.trim();
+            if (!data.startsWith('data:')) continue;
+            const payload = data.slice(5).trim();
+            if (payload === '[DONE]') continue;
+
+            const delta = JSON.parse(payload).choices?.[0]?.delta?.content;
+            if (!delta) continue;
+
+            content += delta;
+            for (const [field, fieldValue] of scanner.push(delta)) {
+              emitted.add(field);
+              send({ type: 'field', field, value: fieldValue });
+            }
+          }
+        }
+
+        // Emit anything the incremental scanner could not parse, then the full result
+        const policyData = parseJsonObject(content);
+        for (const [field, fieldValue] of Object.entries(policyData)) {
+          if (!emitted.has(field)) {
+            send({ type: 'field', field, value: fieldValue });
+          }
+        }
+
+        console.log('✅ Streamed', Object.keys(policyData).length, 'fields');
+
+        send({
+          type: 'complete',
+          success: true,
+          policyData,
+          confidence: 0.9,
+          method: 'openai-gpt4o-mini-enhanced-identifiers-deductibles-stream',
+          ...summarizePolicyData(policyData)
+        });
+      } catch (error) {
+        console.error('❌ OpenAI streaming extraction error:', error);
+        send({
+          type: 'error',
+          error: {
+            code: 'OPENAI_ENHANCED_IDENTIFIERS_DEDUCTIBLES_EXTRACTION_ERROR',
+            message: error.message
+          }
+        });
+      } finally {
+        controller.close();
       }
-    } catch (parseError) {
-      console.error('❌ JSON parsing failed:', parseError);
-      throw new Error('Failed to parse OpenAI response as JSON');
     }
+  });
+
+  return new Response(stream, {
+    headers: {
+      ...corsHeaders,
+      ...rateLimitHeaders(response),
+      'Content-Type': 'application/x-ndjson',
+      'Cache-Control': 'no-cache'
+    }
+  });
+}
+
+Deno.serve(async (req) => {
+  const corsHeaders = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'authorization, x-client-info, apikey, content-type',
+    'Access-Control-Allow-Methods': 'POST, GET, OPTIONS, PUT, DELETE, PATCH',
+    'Access-Control-Max-Age': '86400',
+    'Access-Control-Allow-Credentials': 'false'
+  };
+
+  if (req.method === 'OPTIONS') {
+    return new Response(null, { status: 200, headers: corsHeaders });
+  }
+
+  try {
+    console.log('🤖 OpenAI Enhanced Identifier + Deductibles Extract Fields function called');
+    
+    const { text, documents, stream } = await req.json();
+    
+    if (!text && !Array.isArray(documents)) {
+      throw new Error('No text provided for extraction');
+    }
+
+    const apiKey = Deno.env.get('OPENAI_API_KEY');
+    if (!apiKey) {
+      throw new Error('OpenAI API key not configured');
+    }
+
+    if (Array.isArray(documents)) {
+      const { results, headers } = await extractBatch(apiKey, documents);
+
+      console.log('✅ Batch extraction complete:', results.filter(r => r.success).length, 'of', results.length, 'documents');
+
+      return new Response(JSON.stringify({
+        success: true,
+        batch: true,
+        results,
+        confidence: 0.9,
+        method: 'openai-gpt4o-mini-enhanced-identifiers-deductibles-batch'
+      }), {
+        headers: { ...corsHeaders, ...headers, 'Content-Type': 'application/json' }
+      });
+    }
+
+    if (stream) {
+      console.log('📡 Streaming enhanced identifier + deductibles extraction, text length:', text.length);
+      return await streamExtraction(apiKey, text, corsHeaders);
+    }
+
+    console.log('📝 Processing enhanced identifier + deductibles text of length:', text.length);
+
+    const { content: extractedText, headers } = await callOpenAI(apiKey, buildSinglePrompt(text), 3000);
+
+    console.log('🤖 OpenAI enhanced identifier + deductibles response length:', extractedText.length);
+
+    // Parse the JSON response
+    const policyData = parseJsonObject(extractedText);
 
     console.log('✅ Successfully extracted enhanced identifier + deductibles policy data:', Object.keys(policyData).filter(k => policyData[k]).length, 'fields');
     console.log('🆔 Identifiers found:', {
@@ -281,28 +645,29 @@ Return only the JSON object, no additional text.`;
       policyData,
       confidence: 0.9,
       method: 'openai-gpt4o-mini-enhanced-identifiers-deductibles',
-      fieldsExtracted: Object.keys(policyData).filter(k => policyData[k]).length,
-      identifiersExtracted: {
-        policyNumber: !!policyData.policyNumber,
-        claimNumber: !!policyData.claimNumber,
-        fileNumber: !!policyData.fileNumber,
-        carrierClaimNumber: !!policyData.carrierClaimNumber
-      }
+      ...summarizePolicyData(policyData)
     }), {
-      headers: { ...corsHeaders, 'Content-Type': 'application/json' }
+      headers: { ...corsHeaders, ...headers, 'Content-Type': 'application/json' }
     });
 
   } catch (error) {
     console.error('❌ OpenAI enhanced identifier + deductibles extraction error:', error);
-    
+
+    // Surface upstream rate limiting as a 429 so callers back off instead of retrying blindly
+    const rateLimited = error instanceof UpstreamError && error.status === 429;
+
     return new Response(JSON.stringify({
       error: {
-        code: 'OPENAI_ENHANCED_IDENTIFIERS_DEDUCTIBLES_EXTRACTION_ERROR',
+        code: rateLimited ? 'OPENAI_RATE_LIMITED' : 'OPENAI_ENHANCED_IDENTIFIERS_DEDUCTIBLES_EXTRACTION_ERROR',
         message: error.message
       }
     }), {
-      status: 500,
-      headers: { ...corsHeaders, 'Content-Type': 'application/json' }
+      status: rateLimited ? 429 : 500,
+      headers: {
+        ...corsHeaders,
+        ...(error instanceof UpstreamError ? error.headers : {}),
+        'Content-Type': 'application/json'
+      }
     });
   }
 });
\ No newline at end of file